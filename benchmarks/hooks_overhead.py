@@ -0,0 +1,103 @@
+"""Measure what lifecycle hooks cost on the Notify.send path.
+
+    python benchmarks/hooks_overhead.py [max_overhead_percent] [events]
+
+Sends through a channel that does no I/O, so the pipeline itself is all
+that is timed, with no hooks and with a no-op hook on every stage. With
+nothing registered a send pays only one check per hook point, far below
+run-to-run noise end to end, so that cost is timed directly and reported
+as a share of a send. Exits non-zero when it exceeds max_overhead_percent.
+"""
+import gc
+import sys
+import time
+import timeit
+
+from notify import Notify
+from notify.channels.base import BaseNotifier
+from notify.core.hooks import STAGES, Hooks
+from notify.core.models import ChannelResult
+from notify.core.policies import CooldownPolicy, RateLimitPolicy
+
+# Checks one send makes with no hooks registered: event_built, policy_decision,
+# and "hooks is not None and hooks.sends" in the channel (aggregate_flush is
+# only checked when a digest is due).
+HOOK_CHECKS = 4
+
+
+class NullNotifier(BaseNotifier):
+    type_name = "null"
+
+    def send(self, event):
+        return ChannelResult(True, "ok")
+
+
+def noop(context) -> None:
+    pass
+
+
+def build(hooked: bool) -> Notify:
+    notify = Notify(
+        channels=[NullNotifier(retry=False)],
+        # Always allows, and keeps the store the same size from send to send.
+        policies=[RateLimitPolicy(per_minute=1_000_000), CooldownPolicy(ttl=600, levels=["fatal"])],
+    )
+    if hooked:
+        for stage in STAGES:
+            notify.add_hook(stage, noop)
+    return notify
+
+
+def run(notify: Notify, total: int) -> float:
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(total):
+            notify.send("disk almost full", notify_level="error")
+        return time.perf_counter() - start
+    finally:
+        gc.enable()
+
+
+def check_cost() -> float:
+    """Seconds one empty hook point costs: an attribute read compared with None."""
+    number = 1_000_000
+    namespace = {"hooks": Hooks()}
+    check = min(timeit.repeat("hooks.event_built is not None", globals=namespace, number=number))
+    empty = min(timeit.repeat("pass", number=number))
+    return max(check - empty, 0.0) / number
+
+
+def main() -> int:
+    max_overhead = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    total = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    notifies = {"none": build(False), "noop": build(True)}
+    best = {mode: float("inf") for mode in notifies}
+    for notify in notifies.values():
+        run(notify, total // 10)
+    # Interleaved rounds, best of each, so drift hits both alike.
+    for _ in range(7):
+        for mode, notify in notifies.items():
+            best[mode] = min(best[mode], run(notify, total))
+    for notify in notifies.values():
+        notify.close()
+
+    per_send = best["none"] / total
+    print(f"{'no hooks':<28} {per_send * 1e6:7.2f} us/send")
+    hooked = best["noop"] / total
+    print(
+        f"{f'no-op hook on {len(STAGES)} stages':<28} {hooked * 1e6:7.2f} us/send"
+        f"  {(hooked / per_send - 1) * 100:+6.1f}%"
+    )
+    cost = check_cost() * HOOK_CHECKS
+    overhead = cost / per_send * 100
+    ok = overhead <= max_overhead
+    print(
+        f"empty hooks: {HOOK_CHECKS} checks = {cost * 1e9:.0f} ns/send, {overhead:.2f}% "
+        f"(max {max_overhead:g}%): {'PASS' if ok else 'FAIL'}"
+    )
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""Measure how long `import notify` adds to interpreter startup.
+
+    python benchmarks/import_time.py [budget_ms] [runs]
+
+Each run is a fresh interpreter; the best run is compared against a bare
+interpreter. Exits non-zero when the import exceeds the budget or pulls in
+modules that should only load on first use.
+"""
+import os
+import subprocess
+import sys
+import time
+
+# Loaded lazily by the channels, config loader and stores that need them.
+DEFERRED = ("requests", "aiohttp", "yaml", "smtplib", "email.mime", "redis", "sqlite3", "asyncio")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def best_of(code: str, runs: int) -> float:
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True, env=env)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def loaded_deferred() -> list:
+    code = (
+        "import sys, notify\n"
+        f"print(' '.join(m for m in {DEFERRED!r} if m in sys.modules))"
+    )
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, env=env, capture_output=True, text=True
+    ).stdout
+    return output.split()
+
+
+def main() -> int:
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else 60
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 15
+    baseline = best_of("pass", runs)
+    with_notify = best_of("import notify", runs)
+    cost_ms = (with_notify - baseline) * 1000
+    print(f"interpreter  {baseline * 1000:7.1f} ms")
+    print(f"import notify {cost_ms:+6.1f} ms")
+    eager = loaded_deferred()
+    if eager:
+        print(f"imported eagerly: {', '.join(eager)}")
+    ok = cost_ms <= budget and not eager
+    print(f"budget {budget:.0f} ms: {'PASS' if ok else 'FAIL'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
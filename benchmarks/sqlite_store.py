@@ -0,0 +1,64 @@
+"""Measure SqliteStore policy decisions per second on local disk.
+
+    python benchmarks/sqlite_store.py [target_events_per_sec] [events]
+
+Exits non-zero when the measured rate is below the target.
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from notify.core.policies import CooldownPolicy, DedupePolicy, RateLimitPolicy
+from notify.core.event import build_event
+from notify.core.store import SqliteStore
+
+
+def run(store, events, threads: int) -> float:
+    policies = [
+        DedupePolicy(ttl=3600, levels=["error"], upgrade_after=10),
+        CooldownPolicy(ttl=600, levels=["fatal"]),
+        RateLimitPolicy(per_minute=1_000_000),
+    ]
+    chunks = [events[index::threads] for index in range(threads)]
+
+    def worker(chunk):
+        for event in chunk:
+            for policy in policies:
+                if policy.apply(event, store).action == "suppress":
+                    break
+
+    pool = [threading.Thread(target=worker, args=(chunk,)) for chunk in chunks]
+    start = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    target = float(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    total = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    levels = ("fatal", "error", "error", "warn")
+    events = [
+        build_event(f"alert {index % 500}", level=levels[index % len(levels)])
+        for index in range(total)
+    ]
+    slowest = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for threads in (1, 4):
+            store = SqliteStore(path=os.path.join(tmp, f"bench-{threads}.db"))
+            elapsed = run(store, events, threads)
+            store.close()
+            rate = total / elapsed
+            slowest = rate if slowest is None else min(slowest, rate)
+            print(f"threads={threads}  {elapsed:7.3f}s  {rate:10,.0f} events/s")
+    ok = slowest >= target
+    print(f"target {target:,.0f} events/s: {'PASS' if ok else 'FAIL'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""Compare MemoryStore and ShardedMemoryStore under many producer threads.
+
+    python benchmarks/store_contention.py [threads] [ops_per_thread]
+"""
+import random
+import sys
+import threading
+import time
+
+from notify.core.store import MemoryStore, ShardedMemoryStore
+
+
+def worker(store, ops: int, seed: int, barrier: threading.Barrier) -> None:
+    rng = random.Random(seed)
+    keys = [f"error:{rng.getrandbits(48):012x}" for _ in range(1024)]
+    barrier.wait()
+    for index in range(ops):
+        key = keys[index & 1023]
+        # Same call pattern as DedupePolicy.apply for a repeated event.
+        if store.is_active(f"dedupe:{key}"):
+            store.increment(f"suppress:{key}", ttl=3600)
+        else:
+            store.set_expiry(f"dedupe:{key}", 3600)
+            store.reset(f"suppress:{key}")
+
+
+def run(store, threads: int, ops: int) -> float:
+    barrier = threading.Barrier(threads + 1)
+    pool = [
+        threading.Thread(target=worker, args=(store, ops, seed, barrier))
+        for seed in range(threads)
+    ]
+    for thread in pool:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    ops = int(sys.argv[2]) if len(sys.argv) > 2 else 50_000
+    total = threads * ops
+    print(f"{threads} threads x {ops} events")
+    for name, store in (
+        ("MemoryStore", MemoryStore()),
+        ("ShardedMemoryStore(16)", ShardedMemoryStore(shards=16)),
+    ):
+        elapsed = run(store, threads, ops)
+        print(f"{name:<24} {elapsed:7.3f}s  {total / elapsed:12,.0f} events/s")
+
+
+if __name__ == "__main__":
+    main()
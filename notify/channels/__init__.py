@@ -1,8 +1,14 @@
-from notify.channels.telegram import TelegramNotifier
-from notify.channels.wecom import WeComNotifier
-from notify.channels.feishu import FeishuNotifier
-from notify.channels.bark import BarkNotifier
-from notify.channels.email import EmailNotifier
+from importlib import import_module
+from typing import Any
+
+# Channel modules (and requests/smtplib behind them) load on first access.
+_LAZY = {
+    "TelegramNotifier": "notify.channels.telegram",
+    "WeComNotifier": "notify.channels.wecom",
+    "FeishuNotifier": "notify.channels.feishu",
+    "BarkNotifier": "notify.channels.bark",
+    "EmailNotifier": "notify.channels.email",
+}
 
 __all__ = [
     "TelegramNotifier",
@@ -11,3 +17,12 @@ __all__ = [
     "BarkNotifier",
     "EmailNotifier",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
@@ -1,9 +1,7 @@
 from typing import Any
 from urllib.parse import quote
 
-import requests
-
-from notify.channels.base import BaseNotifier, REQUIRED
+from notify.channels.base import BaseNotifier, HttpRequest, REQUIRED
 from notify.core.models import ChannelResult
 
 DEFAULT_BARK_SERVER = "https://api.day.app"
@@ -18,6 +16,9 @@ BARK_QUERY_PARAMS = (
 class BarkNotifier(BaseNotifier):
     type_name = "bark"
     supported_types = {"text", "markdown"}
+    retry_profile = {}
+    # APNs payloads are capped at 4 KB, title and options included.
+    coalesce_limit = 3000
 
     @classmethod
     def config(cls) -> dict:
@@ -51,13 +52,24 @@ class BarkNotifier(BaseNotifier):
         return cfg
 
     def send(self, event: dict) -> ChannelResult:
+        request = self._build_request(event)
+        if isinstance(request, ChannelResult):
+            return request
+        return self._http_send(request, self._result_from_response)
+
+    async def asend(self, event: dict) -> ChannelResult:
+        request = self._build_request(event)
+        if isinstance(request, ChannelResult):
+            return request
+        return await self._ahttp_send(request, self._result_from_response)
+
+    def _build_request(self, event: dict) -> HttpRequest | ChannelResult:
         content_type, content = self._select_content(event)
         key = self.cfg.get("key")
         if not key:
             return ChannelResult(False, "missing key")
         server = self.cfg.get("server") or DEFAULT_BARK_SERVER
         server = server.rstrip("/")
-        timeout = self._get_timeout()
         title = self.cfg.get("title")
         subtitle = self.cfg.get("subtitle")
         body = self.cfg.get("body")
@@ -82,19 +94,13 @@ class BarkNotifier(BaseNotifier):
             path_parts = [key, body]
 
         url = self._build_url(server, path_parts)
-        try:
-            response = requests.post(
-                url,
-                params=channel_args or None,
-                timeout=timeout,
-            )
-            return self._result_from_response(response)
-        except requests.exceptions.Timeout:
-            return ChannelResult(False, "send timeout")
-        except requests.exceptions.ConnectionError:
-            return ChannelResult(False, "send connection failed")
-        except Exception as exc:
-            return ChannelResult(False, f"send failed: {type(exc).__name__}")
+        return HttpRequest("POST", url, params=channel_args or None)
+
+    def _mergeable(self, event: dict) -> bool:
+        return self.cfg.get("body") is None and super()._mergeable(event)
+
+    def _content_size(self, content: str) -> int:
+        return len(content.encode("utf-8"))
 
     def _build_url(self, server: str, parts: list[str]) -> str:
         encoded_parts = [quote(str(part), safe="") for part in parts]
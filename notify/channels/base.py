@@ -1,15 +1,73 @@
-from copy import deepcopy
-from typing import Any, Dict, Optional, Tuple, Union
+import json
+import time
+from copy import copy, deepcopy
+from threading import Lock
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
+from notify.core.breaker import OPEN, build_adaptive_timeout, build_breaker
+from notify.core.coalesce import build_coalescer
+from notify.core.event import build_event
+from notify.core.hooks import Hooks
+from notify.core.metrics import Histogram, MetricsRegistry
 from notify.core.models import ChannelResult
+from notify.core.pacer import PacedOut, build_pacer
+from notify.core.retry import build_retry_policy
 
 
 REQUIRED = object()
+# Transport settings shared by every channel; never forwarded to provider APIs.
+BASE_CONFIG_KEYS = {
+    "timeout",
+    "pool_size",
+    "keep_alive",
+    "breaker",
+    "adaptive_timeout",
+    "retry",
+    "pace",
+    "coalesce",
+}
+# HTTP statuses worth another attempt; other 5xx are added in _failure().
+RETRYABLE_STATUS = {408, 425, 429}
+
+# requests, aiohttp and asyncio are imported where first needed, so a
+# short-lived process that sends one alert does not pay for all of them.
+_UNLOADED = object()
+_aiohttp: Any = _UNLOADED
+
+
+@dataclass
+class HttpRequest:
+    method: str
+    url: str
+    json: Optional[Dict[str, Any]] = None
+    params: Optional[Dict[str, Any]] = None
+
+
+class _AsyncResponse:
+    def __init__(self, status_code: int, text: str, headers: Any = None) -> None:
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    def json(self) -> Any:
+        return json.loads(self.text)
 
 
 class BaseNotifier:
     type_name = "base"
     supported_types = {"text"}
+    # Provider limits paced by default: per_second / per_minute / per_hour,
+    # plus "shared" ones counted across channels on the same account.
+    pace_profile: Optional[Dict[str, Any]] = None
+    # Retry defaults for the type; None means retries are off unless the
+    # channel's retry config is set.
+    retry_profile: Optional[Dict[str, Any]] = None
+    # Coalescing: content types that can be merged, the merged size limit
+    # (as measured by _content_size) and what goes between merged events.
+    coalesce_types = {"text", "markdown"}
+    coalesce_limit = 4000
+    coalesce_separator = "\n\n"
 
     def __init__(self, name: Optional[str] = None, **overrides) -> None:
         self.name = name or self.type_name
@@ -18,14 +76,321 @@ class BaseNotifier:
             raise TypeError("config() must return a dict")
         self.cfg = self._merge_config(defaults, overrides)
         self._validate_config(defaults)
+        self._session = None
+        self._session_lock = Lock()
+        self._aiohttp_session = None
+        self._aiohttp_loop = None
+        self.breaker = build_breaker(self.cfg.get("breaker"))
+        self.adaptive_timeout = build_adaptive_timeout(self.cfg.get("adaptive_timeout"))
+        self.retry_policy = build_retry_policy(self.cfg.get("retry"), self.retry_profile)
+        self.pacer = build_pacer(self.cfg.get("pace"), self.pace_profile, self._pace_account())
+        self.coalescer = build_coalescer(self.cfg.get("coalesce"))
+        self._send_seconds: Optional[Histogram] = None
+        # Set by Notify; before/after_channel_send run around every send().
+        self.hooks: Optional[Hooks] = None
 
     @classmethod
     def config(cls) -> Dict[str, Any]:
-        return {"timeout": 10}
+        # breaker / adaptive_timeout / retry / pace: {} uses the defaults, false disables
+        # (retry and pace only have defaults for types with a retry/pace_profile).
+        # coalesce is off unless set to true or a dict.
+        return {
+            "timeout": 10,
+            "pool_size": 10,
+            "keep_alive": True,
+            "breaker": {},
+            "adaptive_timeout": {},
+            "retry": {},
+            "pace": {},
+            "coalesce": False,
+        }
 
     def send(self, event: Dict[str, Any]) -> ChannelResult:
         raise NotImplementedError
 
+    def send_batch(self, events: List[Dict[str, Any]]) -> List[ChannelResult]:
+        return [self.send(event) for event in events]
+
+    async def asend(self, event: Dict[str, Any]) -> ChannelResult:
+        import asyncio
+
+        return await asyncio.to_thread(self.send, event)
+
+    def deliver(self, event: Dict[str, Any]) -> ChannelResult:
+        """send() behind the coalescer, breaker and pacer; what Notify dispatches through."""
+        if self.coalescer is not None:
+            return self.coalescer.deliver(event, self._deliver_merged)
+        return self._deliver_one(event)
+
+    def deliver_batch(self, events: List[Dict[str, Any]]) -> List[ChannelResult]:
+        if self.coalescer is not None:
+            return self._deliver_merged(events)
+        if self.pacer is not None:
+            return [self._deliver_one(event) for event in events]
+        if self.breaker is not None and not self.breaker.allow():
+            return [self._rejected() for _ in events]
+        hooks = self.hooks
+        contexts = None
+        if hooks is not None and hooks.sends:
+            contexts = [hooks.before_send(self.name, event) for event in events]
+        start = time.monotonic()
+        try:
+            results = self.send_batch(events)
+        except BaseException as exc:
+            self._raised(exc)
+            if contexts is not None:
+                for context in contexts:
+                    hooks.after_send(context, None, exc)
+            raise
+        latency = (time.monotonic() - start) / max(len(events), 1)
+        results = [self._record(result, latency) for result in results]
+        if contexts is not None:
+            for context, result in zip(contexts, results):
+                hooks.after_send(context, result)
+        return results
+
+    async def adeliver(self, event: Dict[str, Any]) -> ChannelResult:
+        if self.coalescer is not None:
+            return await self.coalescer.adeliver(event, self._adeliver_merged)
+        return await self._adeliver_one(event)
+
+    def merge_events(self, events: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], List[int]]]:
+        """Pack events into as few messages as the provider allows.
+
+        Returns (message, indexes of the events it carries) pairs. Events only
+        share a message with others of the same level and type, in order, up
+        to coalesce_limit; one that cannot be merged is sent on its own.
+        """
+        groups: Dict[Any, List[int]] = {}
+        for index, event in enumerate(events):
+            key = (event.get("level"), event.get("type")) if self._mergeable(event) else index
+            groups.setdefault(key, []).append(index)
+        separator = self._content_size(self.coalesce_separator)
+        messages = []
+        for indexes in groups.values():
+            chunk: List[int] = []
+            size = 0
+            for index in indexes:
+                part = self._content_size(self._select_content(events[index])[1])
+                if chunk and size + separator + part > self.coalesce_limit:
+                    messages.append((self._merge(events, chunk), chunk))
+                    chunk, size = [], 0
+                size += part + (separator if chunk else 0)
+                chunk.append(index)
+            messages.append((self._merge(events, chunk), chunk))
+        return messages
+
+    def _deliver_merged(self, events: List[Dict[str, Any]]) -> List[ChannelResult]:
+        results: List[Any] = [None] * len(events)
+        for message, indexes in self.merge_events(events):
+            result = self._deliver_one(message)
+            # One per event: callers annotate theirs, e.g. with a retry note.
+            for index in indexes:
+                results[index] = copy(result)
+        return results
+
+    async def _adeliver_merged(self, events: List[Dict[str, Any]]) -> List[ChannelResult]:
+        import asyncio
+
+        messages = self.merge_events(events)
+        sent = await asyncio.gather(*(self._adeliver_one(message) for message, _ in messages))
+        results: List[Any] = [None] * len(events)
+        for (_, indexes), result in zip(messages, sent):
+            for index in indexes:
+                results[index] = copy(result)
+        return results
+
+    def _deliver_one(self, event: Dict[str, Any]) -> ChannelResult:
+        if self.breaker is not None and not self.breaker.allow():
+            return self._rejected()
+        slot = None
+        if self.pacer is not None:
+            slot = self.pacer.reserve()
+            if slot is None:
+                return self._paced_out()
+            delay = self.pacer.delay(slot)
+            while delay > 0:
+                time.sleep(delay)
+                delay = self.pacer.delay(slot)
+        hooks = self.hooks
+        context = hooks.before_send(self.name, event) if hooks is not None and hooks.sends else None
+        start = time.monotonic()
+        try:
+            result = self.send(event)
+        except BaseException as exc:
+            self._raised(exc)
+            if context is not None:
+                hooks.after_send(context, None, exc)
+            raise
+        finally:
+            if slot is not None:
+                self.pacer.settle(slot)
+        result = self._record(result, time.monotonic() - start)
+        if context is not None:
+            hooks.after_send(context, result)
+        return result
+
+    async def _adeliver_one(self, event: Dict[str, Any]) -> ChannelResult:
+        if self.breaker is not None and not self.breaker.allow():
+            return self._rejected()
+        slot = None
+        if self.pacer is not None:
+            slot = self.pacer.reserve()
+            if slot is None:
+                return self._paced_out()
+            delay = self.pacer.delay(slot)
+            if delay > 0:
+                import asyncio
+
+                while delay > 0:
+                    await asyncio.sleep(delay)
+                    delay = self.pacer.delay(slot)
+        hooks = self.hooks
+        context = hooks.before_send(self.name, event) if hooks is not None and hooks.sends else None
+        start = time.monotonic()
+        try:
+            result = await self.asend(event)
+        except BaseException as exc:
+            self._raised(exc)
+            if context is not None:
+                hooks.after_send(context, None, exc)
+            raise
+        finally:
+            if slot is not None:
+                self.pacer.settle(slot)
+        result = self._record(result, time.monotonic() - start)
+        if context is not None:
+            hooks.after_send(context, result)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {}
+        if self.breaker is not None:
+            stats["breaker"] = self.breaker.stats()
+        if self.adaptive_timeout is not None:
+            stats["timeout"] = self._get_timeout()
+        if self.pacer is not None:
+            stats["pace"] = self.pacer.stats()
+        if self.coalescer is not None:
+            stats["coalesce"] = self.coalescer.stats()
+        return stats
+
+    def instrument(self, metrics: Optional[MetricsRegistry]) -> None:
+        """Record send latencies into metrics (None stops recording)."""
+        self._send_seconds = None
+        if metrics is not None:
+            self._send_seconds = metrics.histogram(
+                "channel_send_seconds",
+                "Time spent in a channel's send(), by outcome.",
+                ("channel", "outcome"),
+            )
+
+    def close(self) -> None:
+        with self._session_lock:
+            session, self._session = self._session, None
+        if session is not None:
+            session.close()
+
+    async def aclose(self) -> None:
+        session, self._aiohttp_session = self._aiohttp_session, None
+        self._aiohttp_loop = None
+        if session is not None and not session.closed:
+            await session.close()
+
+    def _http_send(self, request: HttpRequest, parse: Callable, action: str = "send"):
+        import requests
+
+        try:
+            response = self._get_session().request(
+                request.method,
+                request.url,
+                json=request.json,
+                params=request.params,
+                timeout=self._get_timeout(),
+            )
+            return parse(response)
+        except requests.exceptions.Timeout:
+            return ChannelResult(False, f"{action} timeout", retryable=True)
+        except requests.exceptions.ConnectionError:
+            return ChannelResult(False, f"{action} connection failed", retryable=True)
+        except Exception as exc:
+            return ChannelResult(False, f"{action} failed: {type(exc).__name__}")
+
+    async def _ahttp_send(self, request: HttpRequest, parse: Callable, action: str = "send"):
+        import asyncio
+
+        aiohttp = _load_aiohttp()
+        if aiohttp is None:
+            return await asyncio.to_thread(self._http_send, request, parse, action)
+        params = None
+        if request.params:
+            params = {key: str(value) for key, value in request.params.items()}
+        try:
+            session = self._get_aiohttp_session()
+            async with session.request(
+                request.method,
+                request.url,
+                json=request.json,
+                params=params,
+                timeout=self._get_aiohttp_timeout(),
+            ) as response:
+                text = await response.text()
+            return parse(_AsyncResponse(response.status, text, response.headers))
+        except asyncio.TimeoutError:
+            return ChannelResult(False, f"{action} timeout", retryable=True)
+        except aiohttp.ClientConnectionError:
+            return ChannelResult(False, f"{action} connection failed", retryable=True)
+        except Exception as exc:
+            return ChannelResult(False, f"{action} failed: {type(exc).__name__}")
+
+    def _get_session(self):
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            with self._session_lock:
+                if self._session is None:
+                    pool_size = self._get_pool_size()
+                    adapter = HTTPAdapter(
+                        pool_connections=pool_size,
+                        pool_maxsize=pool_size,
+                        max_retries=0,
+                    )
+                    session = requests.Session()
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    if not self.cfg.get("keep_alive", True):
+                        session.headers["Connection"] = "close"
+                    self._session = session
+        return self._session
+
+    def _get_aiohttp_session(self):
+        import asyncio
+
+        aiohttp = _load_aiohttp()
+        loop = asyncio.get_running_loop()
+        if self._aiohttp_session is None or self._aiohttp_loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self._get_pool_size(),
+                force_close=not self.cfg.get("keep_alive", True),
+            )
+            self._aiohttp_session = aiohttp.ClientSession(connector=connector)
+            self._aiohttp_loop = loop
+        return self._aiohttp_session
+
+    def _get_pool_size(self) -> int:
+        try:
+            return max(int(self.cfg.get("pool_size") or 10), 1)
+        except (TypeError, ValueError):
+            return 10
+
+    def _get_aiohttp_timeout(self):
+        aiohttp = _load_aiohttp()
+        timeout = self._get_timeout()
+        if isinstance(timeout, tuple):
+            return aiohttp.ClientTimeout(sock_connect=timeout[0], sock_read=timeout[1])
+        return aiohttp.ClientTimeout(total=timeout)
+
     def _select_content(self, event: Dict[str, Any]) -> Tuple[str, str]:
         content_type = (event.get("type") or "text").lower()
         if content_type not in self.supported_types:
@@ -35,7 +400,73 @@ class BaseNotifier:
             content = ""
         return content_type, str(content)
 
+    def _record(self, result: ChannelResult, latency: float) -> ChannelResult:
+        if self._send_seconds is not None:
+            self._send_seconds.observe(latency, self.name, "ok" if result.success else "failed")
+        if self.adaptive_timeout is not None:
+            self.adaptive_timeout.observe(latency)
+        if self.breaker is not None:
+            if self.breaker.record(result.success) == OPEN and not result.success:
+                result.message = f"{result.message} (circuit open)"
+        if self.pacer is not None and result.retry_after:
+            self.pacer.defer(result.retry_after)
+        return result
+
+    def _raised(self, exc: BaseException) -> None:
+        # send() raised instead of returning a result: a half-open probe must
+        # still be settled, or the breaker would reject every later call.
+        if self.breaker is not None:
+            if isinstance(exc, Exception):
+                self.breaker.record(False)
+            else:
+                self.breaker.cancel()
+
+    def _rejected(self) -> ChannelResult:
+        # Not retryable: queueing retries against an open breaker would only
+        # pile them up to be rejected again.
+        retry_in = self.breaker.retry_in()
+        return ChannelResult(False, f"circuit open, retry in {retry_in:.1f}s", retry_after=retry_in)
+
+    def _mergeable(self, event: Dict[str, Any]) -> bool:
+        return self._select_content(event)[0] in self.coalesce_types
+
+    def _content_size(self, content: str) -> int:
+        return len(content)
+
+    def _merge(self, events: List[Dict[str, Any]], indexes: List[int]) -> Dict[str, Any]:
+        first = events[indexes[0]]
+        if len(indexes) == 1:
+            return first
+        parts = [self._select_content(events[index])[1] for index in indexes]
+        meta = dict(first.get("meta") or {})
+        meta["coalesced"] = len(indexes)
+        return build_event(
+            raw_content=self.coalesce_separator.join(parts),
+            type=first.get("type") or "text",
+            level=first.get("level") or "info",
+            event_key=first.get("event_key"),
+            source=first.get("source"),
+            context=first.get("context"),
+            meta=meta,
+        )
+
+    def _paced_out(self) -> ChannelResult:
+        if self.breaker is not None:
+            self.breaker.cancel()
+        wait = max(self.pacer.next_in(), self.pacer.max_wait)
+        return PacedOut(False, f"paced: next slot in {wait:.1f}s", retryable=True, retry_after=wait)
+
+    def _pace_account(self) -> Optional[str]:
+        """Key of the account whose "shared" pace limits this channel counts against."""
+        return None
+
     def _get_timeout(self, default: Union[int, float] = 10) -> Union[float, Tuple[float, float]]:
+        timeout = self._get_static_timeout(default)
+        if self.adaptive_timeout is None:
+            return timeout
+        return self.adaptive_timeout.apply(timeout)
+
+    def _get_static_timeout(self, default: Union[int, float] = 10) -> Union[float, Tuple[float, float]]:
         value = self.cfg.get("timeout", default)
         if value is None or value is REQUIRED:
             return float(default)
@@ -79,15 +510,59 @@ class BaseNotifier:
             message = (text or "").strip()
             if message and len(message) > 200:
                 message = message[:200]
-            return ChannelResult(False, message or f"http {status}")
+            return self._failure(response, message or f"http {status}")
         return ChannelResult(True, "ok")
 
+    def _failure(
+        self,
+        response,
+        message: str,
+        retryable: bool = False,
+        retry_after: Optional[float] = None,
+    ) -> ChannelResult:
+        """A failed result for response, retryable if the provider or HTTP status says so."""
+        status = getattr(response, "status_code", None) or 0
+        if retry_after is None:
+            retry_after = _parse_retry_after(getattr(response, "headers", None))
+        retryable = retryable or status in RETRYABLE_STATUS or (status >= 500 and status != 501)
+        return ChannelResult(False, message, retryable=retryable, retry_after=retry_after)
+
     def _extra_config(self, exclude: set) -> Dict[str, Any]:
         extras: Dict[str, Any] = {}
         for key, value in self.cfg.items():
-            if key in exclude:
+            if key in exclude or key in BASE_CONFIG_KEYS:
                 continue
             if value is REQUIRED or value is None:
                 continue
             extras[key] = value
         return extras
+
+
+def _load_aiohttp():
+    global _aiohttp
+    if _aiohttp is _UNLOADED:
+        try:
+            import aiohttp
+        except ImportError:  # optional: asend falls back to a worker thread
+            aiohttp = None
+        _aiohttp = aiohttp
+    return _aiohttp
+
+
+def _parse_retry_after(headers: Any) -> Optional[float]:
+    # Retry-After is either delay-seconds or an HTTP date.
+    if not headers:
+        return None
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
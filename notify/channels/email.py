@@ -1,15 +1,34 @@
 import smtplib
+import time
+from concurrent.futures import Future
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Any, Dict
+from threading import Lock, Timer
+from typing import Any, Dict, List, Optional
 
 from notify.channels.base import BaseNotifier, REQUIRED
 from notify.core.models import ChannelResult
 
 
+_UNLOADED = object()
+_aiosmtplib: Any = _UNLOADED
+
+
 class EmailNotifier(BaseNotifier):
     type_name = "email"
     supported_types = {"text", "html"}
+    retry_profile = {}
+    coalesce_types = {"text"}
+    coalesce_limit = 100000
+
+    def __init__(self, name: Optional[str] = None, **overrides) -> None:
+        super().__init__(name=name, **overrides)
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._smtp_lock = Lock()
+        self._last_used = 0.0
+        self._idle_timer: Optional[Timer] = None
+        self._pending: List[tuple] = []
+        self._pending_lock = Lock()
 
     @classmethod
     def config(cls) -> Dict[str, Any]:
@@ -25,23 +44,209 @@ class EmailNotifier(BaseNotifier):
                 "subject": None,
                 "use_ssl": True,
                 "timeout": 10,
+                "idle_timeout": 60,
+                "batch_window": 0,
             }
         )
         return cfg
 
     def send(self, event: Dict[str, Any]) -> ChannelResult:
-        content_type, content = self._select_content(event)
+        window = float(self.cfg.get("batch_window") or 0)
+        if window <= 0:
+            return self.send_batch([event])[0]
 
-        # 获取配置
+        # Events arriving within batch_window share one session: the first
+        # caller lingers, then sends everything queued meanwhile.
+        future: Future = Future()
+        with self._pending_lock:
+            self._pending.append((event, future))
+            leader = len(self._pending) == 1
+        if leader:
+            time.sleep(window)
+            with self._pending_lock:
+                pending, self._pending = self._pending, []
+            try:
+                results = self.send_batch([item for item, _ in pending])
+            except BaseException as exc:
+                # Followers are blocked on their futures: fail them too.
+                for _, waiter in pending:
+                    waiter.set_exception(exc)
+                raise
+            for (_, waiter), result in zip(pending, results):
+                waiter.set_result(result)
+        return future.result()
+
+    def send_batch(self, events: List[Dict[str, Any]]) -> List[ChannelResult]:
+        messages = [self._build_message(event) for event in events]
+        results: List[Optional[ChannelResult]] = [
+            msg if isinstance(msg, ChannelResult) else None for msg in messages
+        ]
+        if all(result is not None for result in results):
+            return results
+
+        with self._smtp_lock:
+            self._check_connection()
+            for index, msg in enumerate(messages):
+                if results[index] is None:
+                    results[index] = self._send_message(msg)
+            self._last_used = time.monotonic()
+            self._schedule_idle_close()
+        return results
+
+    def close(self) -> None:
+        with self._smtp_lock:
+            if self._idle_timer is not None:
+                self._idle_timer.cancel()
+                self._idle_timer = None
+            self._disconnect()
+        super().close()
+
+    def _send_message(self, msg: MIMEMultipart) -> ChannelResult:
+        # 复用已认证的连接,连接失效时重连一次
+        for attempt in range(2):
+            try:
+                if self._smtp is None:
+                    self._smtp = self._connect()
+                self._smtp.send_message(msg)
+                return ChannelResult(True, "email sent successfully")
+            except smtplib.SMTPAuthenticationError as exc:
+                self._disconnect()
+                return ChannelResult(False, f"authentication failed: {type(exc).__name__}")
+            except (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError) as exc:
+                self._disconnect()
+                if attempt:
+                    return ChannelResult(
+                        False, f"connection error: {type(exc).__name__}", retryable=True
+                    )
+            # SMTPException subclasses OSError, so server replies are handled
+            # first: the session is still good and the message is not re-sent.
+            except smtplib.SMTPException as exc:
+                return ChannelResult(
+                    False, f"smtp error: {type(exc).__name__}", retryable=_transient(exc)
+                )
+            except OSError as exc:
+                self._disconnect()
+                if attempt:
+                    return ChannelResult(
+                        False, f"connection error: {type(exc).__name__}", retryable=True
+                    )
+            except Exception as exc:
+                self._disconnect()
+                return ChannelResult(False, f"connection error: {type(exc).__name__}", retryable=True)
+        return ChannelResult(False, "connection error", retryable=True)
+
+    def _check_connection(self) -> None:
+        if self._smtp is None:
+            return
+        idle_timeout = float(self.cfg.get("idle_timeout") or 0)
+        if idle_timeout and time.monotonic() - self._last_used > idle_timeout:
+            self._disconnect()
+        elif not self._is_alive():
+            self._disconnect()
+
+    def _connect(self) -> smtplib.SMTP:
         host = self.cfg.get("host")
         port = self.cfg.get("port", 465)
-        username = self.cfg.get("username")
-        password = self.cfg.get("password")
-        from_addr = self.cfg.get("from_addr") or username
-        to_addrs = self.cfg.get("to_addrs")
-        subject = self.cfg.get("subject") or event.get("event_key", "Notification")
+        timeout = self._get_timeout()
+        if isinstance(timeout, tuple):
+            timeout = max(timeout)
+        if self.cfg.get("use_ssl", True):
+            # 使用 SSL (端口 465)
+            server = smtplib.SMTP_SSL(host, port, timeout=timeout)
+        else:
+            # 使用 STARTTLS (端口 587)
+            server = smtplib.SMTP(host, port, timeout=timeout)
+        try:
+            if not self.cfg.get("use_ssl", True):
+                server.starttls()
+            server.login(self.cfg.get("username"), self.cfg.get("password"))
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    def _is_alive(self) -> bool:
+        try:
+            code, _ = self._smtp.noop()
+        except (smtplib.SMTPException, OSError):
+            return False
+        return code == 250
+
+    def _disconnect(self) -> None:
+        server, self._smtp = self._smtp, None
+        if server is None:
+            return
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+
+    def _schedule_idle_close(self) -> None:
+        idle_timeout = float(self.cfg.get("idle_timeout") or 0)
+        if not idle_timeout or self._idle_timer is not None:
+            return
+        self._idle_timer = Timer(idle_timeout, self._close_if_idle)
+        self._idle_timer.daemon = True
+        self._idle_timer.start()
+
+    def _close_if_idle(self) -> None:
+        with self._smtp_lock:
+            self._idle_timer = None
+            if self._smtp is None:
+                return
+            idle_timeout = float(self.cfg.get("idle_timeout") or 0)
+            if time.monotonic() - self._last_used >= idle_timeout:
+                self._disconnect()
+            else:
+                self._schedule_idle_close()
+
+    async def asend(self, event: Dict[str, Any]) -> ChannelResult:
+        import asyncio
+
+        aiosmtplib = _load_aiosmtplib()
+        if aiosmtplib is None:
+            return await asyncio.to_thread(self.send, event)
+        msg = self._build_message(event)
+        if isinstance(msg, ChannelResult):
+            return msg
+
         use_ssl = self.cfg.get("use_ssl", True)
         timeout = self._get_timeout()
+        if isinstance(timeout, tuple):
+            timeout = max(timeout)
+        try:
+            await aiosmtplib.send(
+                msg,
+                hostname=self.cfg.get("host"),
+                port=self.cfg.get("port", 465),
+                username=self.cfg.get("username"),
+                password=self.cfg.get("password"),
+                use_tls=use_ssl,
+                start_tls=not use_ssl,
+                timeout=timeout,
+            )
+            return ChannelResult(True, "email sent successfully")
+        except aiosmtplib.SMTPAuthenticationError as exc:
+            return ChannelResult(False, f"authentication failed: {type(exc).__name__}")
+        except (
+            aiosmtplib.SMTPConnectError,
+            aiosmtplib.SMTPServerDisconnected,
+            aiosmtplib.SMTPTimeoutError,
+        ) as exc:
+            return ChannelResult(False, f"connection error: {type(exc).__name__}", retryable=True)
+        except aiosmtplib.SMTPException as exc:
+            transient = 400 <= (getattr(exc, "code", None) or 0) < 500
+            return ChannelResult(False, f"smtp error: {type(exc).__name__}", retryable=transient)
+        except Exception as exc:
+            return ChannelResult(False, f"connection error: {type(exc).__name__}", retryable=True)
+
+    def _build_message(self, event: Dict[str, Any]) -> MIMEMultipart | ChannelResult:
+        content_type, content = self._select_content(event)
+
+        # 获取配置
+        from_addr = self.cfg.get("from_addr") or self.cfg.get("username")
+        to_addrs = self.cfg.get("to_addrs")
+        subject = self.cfg.get("subject") or event.get("event_key", "Notification")
 
         # 处理收件人地址 (支持字符串或列表)
         if isinstance(to_addrs, str):
@@ -61,24 +266,23 @@ class EmailNotifier(BaseNotifier):
         else:
             msg.attach(MIMEText(content, "plain", "utf-8"))
 
-        # 发送邮件
-        try:
-            if use_ssl:
-                # 使用 SSL (端口 465)
-                with smtplib.SMTP_SSL(host, port, timeout=timeout) as server:
-                    server.login(username, password)
-                    server.send_message(msg)
-            else:
-                # 使用 STARTTLS (端口 587)
-                with smtplib.SMTP(host, port, timeout=timeout) as server:
-                    server.starttls()
-                    server.login(username, password)
-                    server.send_message(msg)
+        return msg
 
-            return ChannelResult(True, "email sent successfully")
-        except smtplib.SMTPAuthenticationError as exc:
-            return ChannelResult(False, f"authentication failed: {type(exc).__name__}")
-        except smtplib.SMTPException as exc:
-            return ChannelResult(False, f"smtp error: {type(exc).__name__}")
-        except Exception as exc:
-            return ChannelResult(False, f"connection error: {type(exc).__name__}")
+
+def _transient(exc: smtplib.SMTPException) -> bool:
+    # 4xx replies are transient by definition (RFC 5321); refused recipients
+    # carry one reply each, and are only worth retrying if all were 4xx.
+    recipients = getattr(exc, "recipients", None)
+    codes = [code for code, _ in recipients.values()] if recipients else [getattr(exc, "smtp_code", 0)]
+    return all(400 <= code < 500 for code in codes)
+
+
+def _load_aiosmtplib():
+    global _aiosmtplib
+    if _aiosmtplib is _UNLOADED:
+        try:
+            import aiosmtplib
+        except ImportError:  # optional: asend falls back to a worker thread
+            aiosmtplib = None
+        _aiosmtplib = aiosmtplib
+    return _aiosmtplib
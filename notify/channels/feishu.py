@@ -1,12 +1,21 @@
-import requests
+import json
 
-from notify.channels.base import BaseNotifier, REQUIRED
+from notify.channels.base import BaseNotifier, HttpRequest, REQUIRED
 from notify.core.models import ChannelResult
 
 
+# Rate limits: too many requests, bot send frequency, app request frequency.
+RETRYABLE_CODES = {9499, 11232, 99991400}
+
+
 class FeishuNotifier(BaseNotifier):
     type_name = "feishu"
     supported_types = {"text", "markdown"}
+    # Custom bot webhooks: 100 msg/min and 5 msg/s.
+    pace_profile = {"per_second": 5, "per_minute": 100}
+    retry_profile = {}
+    # Request bodies are capped at 20 KB; leave room for the card around the parts.
+    coalesce_limit = 18000
 
     @classmethod
     def config(cls) -> dict:
@@ -20,15 +29,35 @@ class FeishuNotifier(BaseNotifier):
         return cfg
 
     def send(self, event: dict) -> ChannelResult:
+        request = self._build_request(event)
+        if isinstance(request, ChannelResult):
+            return request
+        return self._http_send(request, self._result_from_feishu)
+
+    async def asend(self, event: dict) -> ChannelResult:
+        request = self._build_request(event)
+        if isinstance(request, ChannelResult):
+            return request
+        return await self._ahttp_send(request, self._result_from_feishu)
+
+    def _build_request(self, event: dict) -> HttpRequest | ChannelResult:
         webhook = self.cfg.get("webhook")
         if not webhook:
             return ChannelResult(False, "missing webhook")
-        timeout = self._get_timeout()
         content_type, content = self._select_content(event)
         extra = self.cfg.get("extra")
         if not isinstance(extra, dict):
             extra = {}
-        if content_type == "markdown":
+        parts = (event.get("meta") or {}).get("coalesced_parts")
+        if parts:
+            payload = {
+                "msg_type": "interactive",
+                "card": {
+                    "config": {"wide_screen_mode": True},
+                    "elements": self._card_elements(content_type, parts),
+                },
+            }
+        elif content_type == "markdown":
             payload = {
                 "msg_type": "interactive",
                 "card": {
@@ -45,15 +74,30 @@ class FeishuNotifier(BaseNotifier):
             }
 
         payload.update(extra)
-        try:
-            response = requests.post(webhook, json=payload, timeout=timeout)
-            return self._result_from_feishu(response)
-        except requests.exceptions.Timeout:
-            return ChannelResult(False, "send timeout")
-        except requests.exceptions.ConnectionError:
-            return ChannelResult(False, "send connection failed")
-        except Exception as exc:
-            return ChannelResult(False, f"send failed: {type(exc).__name__}")
+        return HttpRequest("POST", webhook, json=payload)
+
+    def _merge(self, events: list, indexes: list) -> dict:
+        message = super()._merge(events, indexes)
+        if len(indexes) > 1:
+            message.meta["coalesced_parts"] = [
+                self._select_content(events[index])[1] for index in indexes
+            ]
+        return message
+
+    def _content_size(self, content: str) -> int:
+        # As sent: JSON-escaped inside the request body.
+        return len(json.dumps(content))
+
+    def _card_elements(self, content_type: str, parts: list) -> list:
+        elements = []
+        for part in parts:
+            if elements:
+                elements.append({"tag": "hr"})
+            if content_type == "markdown":
+                elements.append({"tag": "markdown", "content": part})
+            else:
+                elements.append({"tag": "div", "text": {"tag": "plain_text", "content": part}})
+        return elements
 
     def _result_from_feishu(self, response) -> ChannelResult:
         try:
@@ -85,6 +129,6 @@ class FeishuNotifier(BaseNotifier):
                     or data.get("StatusMessage")
                     or f"code {code_value}"
                 )
-                return ChannelResult(False, message)
+                return self._failure(response, message, retryable=code_int in RETRYABLE_CODES)
 
         return self._result_from_response(response)
@@ -1,12 +1,15 @@
-import requests
-
-from notify.channels.base import BaseNotifier, REQUIRED
+from notify.channels.base import BaseNotifier, HttpRequest, REQUIRED
 from notify.core.models import ChannelResult
 
 
 class TelegramNotifier(BaseNotifier):
     type_name = "telegram"
     supported_types = {"text", "markdown", "html"}
+    # 1 msg/s and 20/min per chat (groups), 30 msg/s per bot.
+    pace_profile = {"per_second": 1, "per_minute": 20, "shared": {"per_second": 30}}
+    retry_profile = {}
+    coalesce_types = {"text", "markdown", "html"}
+    coalesce_limit = 4096
 
     @classmethod
     def config(cls) -> dict:
@@ -20,12 +23,27 @@ class TelegramNotifier(BaseNotifier):
         )
         return cfg
 
+    def _pace_account(self) -> str | None:
+        token = self.cfg.get("token")
+        return f"telegram:{token}" if token else None
+
     def send(self, event: dict) -> ChannelResult:
+        request = self._build_request(event)
+        if isinstance(request, ChannelResult):
+            return request
+        return self._http_send(request, self._result_from_telegram)
+
+    async def asend(self, event: dict) -> ChannelResult:
+        request = self._build_request(event)
+        if isinstance(request, ChannelResult):
+            return request
+        return await self._ahttp_send(request, self._result_from_telegram)
+
+    def _build_request(self, event: dict) -> HttpRequest | ChannelResult:
         token = self.cfg.get("token")
         chat_id = self.cfg.get("chat_id")
         if not token or not chat_id:
             return ChannelResult(False, "missing token/chat_id")
-        timeout = self._get_timeout()
         url = f"https://api.telegram.org/bot{token}/sendMessage"
         content_type, content = self._select_content(event)
         payload = {"chat_id": chat_id, "text": content}
@@ -39,15 +57,7 @@ class TelegramNotifier(BaseNotifier):
             payload["parse_mode"] = parse_mode
 
         payload.update(self._extra_config({"token", "chat_id", "timeout", "parse_mode", "text"}))
-        try:
-            response = requests.post(url, json=payload, timeout=timeout)
-            return self._result_from_telegram(response)
-        except requests.exceptions.Timeout:
-            return ChannelResult(False, "send timeout")
-        except requests.exceptions.ConnectionError:
-            return ChannelResult(False, "send connection failed")
-        except Exception as exc:
-            return ChannelResult(False, f"send failed: {type(exc).__name__}")
+        return HttpRequest("POST", url, json=payload)
 
     def _result_from_telegram(self, response) -> ChannelResult:
         try:
@@ -63,6 +73,19 @@ class TelegramNotifier(BaseNotifier):
                 message = data.get("description")
                 if not message and "error_code" in data:
                     message = f"error_code {data.get('error_code')}"
-                return ChannelResult(False, message or "telegram error")
+                # Flood control: {"error_code": 429, "parameters": {"retry_after": 35}}
+                parameters = data.get("parameters")
+                retry_after = None
+                if isinstance(parameters, dict) and parameters.get("retry_after") is not None:
+                    try:
+                        retry_after = float(parameters["retry_after"])
+                    except (TypeError, ValueError):
+                        pass
+                return self._failure(
+                    response,
+                    message or "telegram error",
+                    retryable=retry_after is not None,
+                    retry_after=retry_after,
+                )
 
         return self._result_from_response(response)
@@ -1,16 +1,23 @@
+import hashlib
 import json
 import re
-import time
 
-import requests
-
-from notify.channels.base import BaseNotifier, REQUIRED
+from notify.channels.base import BaseNotifier, HttpRequest, REQUIRED
 from notify.core.models import ChannelResult
+from notify.core.tokens import build_token_cache
 
 
 TOKEN_URL = "https://qyapi.weixin.qq.com/cgi-bin/gettoken"
 SEND_URL = "https://qyapi.weixin.qq.com/cgi-bin/message/send"
 ACCESS_TOKEN_RE = re.compile(r"(access_token=)([^&]*)")
+# System busy, API frequency limit, too many concurrent calls.
+RETRYABLE_ERRCODES = {-1, 45009, 45033}
+# The access_token was rejected: invalid credential, invalid token, expired token.
+TOKEN_ERRCODES = {40001, 40014, 42001}
+
+
+class _TokenRejected(ChannelResult):
+    __slots__ = ()
 
 
 class WeComNotifier(BaseNotifier):
@@ -28,11 +35,19 @@ class WeComNotifier(BaseNotifier):
         "textcard",
         "template_card",
     }
+    # A member receives at most 30 msg/min and 1000 msg/hour from one app.
+    pace_profile = {"per_minute": 30, "per_hour": 1000}
+    retry_profile = {}
+    # text and markdown content are capped at 2048 bytes.
+    coalesce_types = {"text", "markdown", "markdown_v2"}
+    coalesce_limit = 2048
 
     def __init__(self, name: str | None = None, **overrides) -> None:
         super().__init__(name=name, **overrides)
-        self._access_token = None
-        self._token_expiry = 0.0
+        secret = f"{self.cfg.get('corpid')}\0{self.cfg.get('corpsecret')}".encode("utf-8")
+        self._tokens = build_token_cache(
+            self.cfg.get("token_cache"), "wecom:" + hashlib.sha256(secret).hexdigest()
+        )
 
     @classmethod
     def config(cls) -> dict:
@@ -54,11 +69,48 @@ class WeComNotifier(BaseNotifier):
                 "enable_duplicate_check": 0,
                 "duplicate_check_interval": 1800,
                 "extra": {},
+                # path: share tokens across processes; refresh_ahead: seconds before expiry.
+                "token_cache": {},
             }
         )
         return cfg
 
     def send(self, event: dict) -> ChannelResult:
+        message = self._build_message(event)
+        if isinstance(message, ChannelResult):
+            return message
+        for _ in range(2):
+            token = self._get_access_token()
+            if isinstance(token, ChannelResult):
+                return token
+            request = HttpRequest("POST", self._build_send_url(token), json=message)
+            result = self._http_send(request, self._result_from_wecom)
+            if not isinstance(result, _TokenRejected):
+                return result
+            self._tokens.invalidate(token)
+        return result
+
+    async def asend(self, event: dict) -> ChannelResult:
+        message = self._build_message(event)
+        if isinstance(message, ChannelResult):
+            return message
+        for _ in range(2):
+            token = await self._aget_access_token()
+            if isinstance(token, ChannelResult):
+                return token
+            request = HttpRequest("POST", self._build_send_url(token), json=message)
+            result = await self._ahttp_send(request, self._result_from_wecom)
+            if not isinstance(result, _TokenRejected):
+                return result
+            self._tokens.invalidate(token)
+        return result
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        stats["token"] = self._tokens.stats()
+        return stats
+
+    def _build_message(self, event: dict) -> dict | ChannelResult:
         corpid = self.cfg.get("corpid")
         corpsecret = self.cfg.get("corpsecret")
         agentid = self.cfg.get("agentid")
@@ -67,11 +119,6 @@ class WeComNotifier(BaseNotifier):
         if agentid in (None, REQUIRED):
             return ChannelResult(False, "missing agentid")
 
-        timeout = self._get_timeout()
-        token = self._get_access_token(corpid, corpsecret, timeout)
-        if isinstance(token, ChannelResult):
-            return token
-
         content_type, content = self._select_content(event)
         msgtype = self.cfg.get("msgtype") or content_type
         if not isinstance(msgtype, str):
@@ -100,17 +147,16 @@ class WeComNotifier(BaseNotifier):
                 if key in {"msgtype", msgtype}:
                     continue
                 message[key] = value
+        return message
 
-        send_url = self._build_send_url(token)
-        try:
-            response = requests.post(send_url, json=message, timeout=timeout)
-            return self._result_from_wecom(response)
-        except requests.exceptions.Timeout:
-            return ChannelResult(False, "send timeout")
-        except requests.exceptions.ConnectionError:
-            return ChannelResult(False, "send connection failed")
-        except Exception as exc:
-            return ChannelResult(False, f"send failed: {type(exc).__name__}")
+    def _mergeable(self, event: dict) -> bool:
+        msgtype = self.cfg.get("msgtype")
+        if self.cfg.get("payload") is not None or (msgtype and msgtype not in self.coalesce_types):
+            return False
+        return super()._mergeable(event)
+
+    def _content_size(self, content: str) -> int:
+        return len(content.encode("utf-8"))
 
     def _build_message_body(self, msgtype: str, content: str):
         if msgtype in {"text", "markdown", "markdown_v2"}:
@@ -178,28 +224,30 @@ class WeComNotifier(BaseNotifier):
         sep = "&" if "?" in req_url else "?"
         return req_url.rstrip("?") + f"{sep}access_token=" + token
 
-    def _get_access_token(self, corpid: str, corpsecret: str, timeout):
-        now = time.time()
-        if self._access_token and now < self._token_expiry:
-            return self._access_token
+    def _get_access_token(self):
+        return self._tokens.get(self._fetch_token)
 
+    async def _aget_access_token(self):
+        token = self._tokens.cached(self._fetch_token)
+        if token is not None:
+            return token
+        import asyncio
+
+        # Rare (once per token lifetime), and single flight must span threads and loops.
+        return await asyncio.to_thread(self._tokens.get, self._fetch_token)
+
+    def _fetch_token(self):
+        return self._http_send(self._build_token_request(), self._parse_token_response, "get token")
+
+    def _build_token_request(self) -> HttpRequest:
         token_url = self.cfg.get("base_url") or TOKEN_URL
         if not isinstance(token_url, str):
             token_url = TOKEN_URL
         token_url = token_url.strip().rstrip("?")
-        try:
-            response = requests.get(
-                token_url,
-                params={"corpid": corpid, "corpsecret": corpsecret},
-                timeout=timeout,
-            )
-        except requests.exceptions.Timeout:
-            return ChannelResult(False, "get token timeout")
-        except requests.exceptions.ConnectionError:
-            return ChannelResult(False, "get token connection failed")
-        except Exception as exc:
-            return ChannelResult(False, f"get token failed: {type(exc).__name__}")
+        params = {"corpid": self.cfg.get("corpid"), "corpsecret": self.cfg.get("corpsecret")}
+        return HttpRequest("GET", token_url, params=params)
 
+    def _parse_token_response(self, response):
         if response.status_code >= 400:
             return self._result_from_response(response)
 
@@ -215,7 +263,7 @@ class WeComNotifier(BaseNotifier):
             errcode = None
         if errcode != 0:
             message = data.get("errmsg") or f"errcode {errcode_value}"
-            return ChannelResult(False, message)
+            return self._failure(response, message, retryable=errcode in RETRYABLE_ERRCODES)
 
         token = data.get("access_token")
         if not token:
@@ -225,9 +273,7 @@ class WeComNotifier(BaseNotifier):
             expires_in = int(expires_in)
         except (TypeError, ValueError):
             expires_in = 7200
-        self._access_token = token
-        self._token_expiry = now + max(expires_in - 60, 0)
-        return token
+        return token, expires_in
 
     def _parse_structured_payload(self, msgtype: str, content: str):
         raw = (content or "").strip()
@@ -285,6 +331,9 @@ class WeComNotifier(BaseNotifier):
             if errcode == 0:
                 return ChannelResult(True, "ok")
             message = data.get("errmsg") or f"errcode {errcode_value}"
-            return ChannelResult(False, message)
+            if errcode in TOKEN_ERRCODES:
+                result = self._failure(response, message, retryable=True)
+                return _TokenRejected(result.success, result.message, True, result.retry_after)
+            return self._failure(response, message, retryable=errcode in RETRYABLE_ERRCODES)
 
         return self._result_from_response(response)
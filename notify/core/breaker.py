@@ -0,0 +1,191 @@
+import time
+from collections import deque
+from threading import Lock
+from typing import Any, Deque, Dict, Optional, Tuple, Union
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Fails fast for a channel that keeps failing.
+
+    Opens after failure_threshold consecutive failures, or when the failure
+    rate over the last window calls reaches failure_rate. After reset_timeout
+    seconds one probe is let through (half open); its outcome closes the
+    breaker or opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        failure_rate: float = 0.5,
+        window: int = 20,
+        reset_timeout: float = 30.0,
+    ) -> None:
+        if failure_threshold < 1:
+            raise ValueError("breaker failure_threshold must be >= 1")
+        if not 0 < failure_rate <= 1:
+            raise ValueError("breaker failure_rate must be in (0, 1]")
+        self.failure_threshold = failure_threshold
+        self.failure_rate = failure_rate
+        self.window = max(int(window), 1)
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened = 0
+        self.rejected = 0
+        self._outcomes: Deque[bool] = deque(maxlen=self.window)
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._probing = False
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def cancel(self) -> None:
+        """Undo allow() for a call that was not made after all."""
+        with self._lock:
+            self._probing = False
+
+    def record(self, success: bool) -> str:
+        """Record a call's outcome and return the resulting state."""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probing = False
+                if success:
+                    self._reset()
+                else:
+                    self._open()
+                return self.state
+            if len(self._outcomes) == self._outcomes.maxlen and not self._outcomes[0]:
+                self._failures -= 1
+            self._outcomes.append(success)
+            if success:
+                self.consecutive_failures = 0
+                return self.state
+            self._failures += 1
+            self.consecutive_failures += 1
+            if self.state == CLOSED and (
+                self.consecutive_failures >= self.failure_threshold
+                or (
+                    len(self._outcomes) == self.window
+                    and self._failures / self.window >= self.failure_rate
+                )
+            ):
+                self._open()
+            return self.state
+
+    def retry_in(self) -> float:
+        return max(self._opened_at + self.reset_timeout - time.monotonic(), 0.0)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "failure_rate": self._failures / len(self._outcomes) if self._outcomes else 0.0,
+                "opened": self.opened,
+                "rejected": self.rejected,
+            }
+
+    def _open(self) -> None:
+        self.state = OPEN
+        self.opened += 1
+        self._opened_at = time.monotonic()
+
+    def _reset(self) -> None:
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self._outcomes.clear()
+        self._failures = 0
+
+
+class AdaptiveTimeout:
+    """Derives a channel's timeout from the latencies it actually sees.
+
+    The timeout is multiplier times the observed percentile, kept between
+    min_timeout and the configured (static) timeout. Slow failures are
+    sampled too, so a timeout that was cut too short grows back quickly.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.99,
+        multiplier: float = 3.0,
+        min_timeout: float = 1.0,
+        min_samples: int = 20,
+        samples: int = 200,
+    ) -> None:
+        if not 0 < percentile <= 1:
+            raise ValueError("adaptive_timeout percentile must be in (0, 1]")
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.min_timeout = min_timeout
+        self.min_samples = max(int(min_samples), 1)
+        self._samples: Deque[float] = deque(maxlen=max(int(samples), self.min_samples))
+        self._pending = 0
+        self._estimate: Optional[float] = None
+        self._lock = Lock()
+
+    def observe(self, latency: float) -> None:
+        with self._lock:
+            self._samples.append(latency)
+            self._pending += 1
+            # Re-sorting every sample would cost more than the sends it tunes.
+            if len(self._samples) >= self.min_samples and self._pending >= self.min_samples // 4 + 1:
+                self._pending = 0
+                ordered = sorted(self._samples)
+                index = min(int(len(ordered) * self.percentile), len(ordered) - 1)
+                self._estimate = max(ordered[index] * self.multiplier, self.min_timeout)
+
+    def apply(
+        self, timeout: Union[float, Tuple[float, float]]
+    ) -> Union[float, Tuple[float, float]]:
+        estimate = self._estimate
+        if estimate is None:
+            return timeout
+        if isinstance(timeout, tuple):
+            return (min(timeout[0], estimate), min(timeout[1], estimate))
+        return min(timeout, estimate)
+
+    @property
+    def estimate(self) -> Optional[float]:
+        return self._estimate
+
+
+def build_breaker(cfg: Any) -> Optional[CircuitBreaker]:
+    if cfg is False or cfg is None:
+        return None
+    cfg = cfg if isinstance(cfg, dict) else {}
+    return CircuitBreaker(
+        failure_threshold=int(cfg.get("failure_threshold", 5)),
+        failure_rate=float(cfg.get("failure_rate", 0.5)),
+        window=int(cfg.get("window", 20)),
+        reset_timeout=float(cfg.get("reset_timeout", 30.0)),
+    )
+
+
+def build_adaptive_timeout(cfg: Any) -> Optional[AdaptiveTimeout]:
+    if cfg is False or cfg is None:
+        return None
+    cfg = cfg if isinstance(cfg, dict) else {}
+    return AdaptiveTimeout(
+        percentile=float(cfg.get("percentile", 0.99)),
+        multiplier=float(cfg.get("multiplier", 3.0)),
+        min_timeout=float(cfg.get("min_timeout", 1.0)),
+        min_samples=int(cfg.get("min_samples", 20)),
+    )
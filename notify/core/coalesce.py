@@ -0,0 +1,100 @@
+from concurrent.futures import Future, wait
+from threading import Lock
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from notify.core.models import ChannelResult
+
+
+_Send = Callable[[List[Dict[str, Any]]], List[ChannelResult]]
+_ASend = Callable[[List[Dict[str, Any]]], Awaitable[List[ChannelResult]]]
+
+
+class _Batch:
+    __slots__ = ("events", "full", "done")
+
+    def __init__(self) -> None:
+        self.events: List[Dict[str, Any]] = []
+        self.full: Future = Future()
+        self.done: Future = Future()
+
+
+class Coalescer:
+    """Collects one channel's concurrent sends so they go out merged.
+
+    The first event to arrive opens a batch and waits up to linger seconds,
+    or until max_events have joined, then sends the whole batch; every event
+    gets the result of the message that carried it.
+    """
+
+    def __init__(self, linger: float = 0.2, max_events: int = 20) -> None:
+        if linger < 0:
+            raise ValueError("coalesce linger must be >= 0")
+        self.linger = linger
+        self.max_events = max(int(max_events), 1)
+        self.batches = 0
+        self.events = 0
+        self._open: Optional[_Batch] = None
+        self._lock = Lock()
+
+    def deliver(self, event: Dict[str, Any], send: _Send) -> ChannelResult:
+        batch, index = self._join(event)
+        if index == 0:
+            wait([batch.full], timeout=self.linger)
+            self._run(batch, send)
+        return batch.done.result()[index]
+
+    async def adeliver(self, event: Dict[str, Any], send: _ASend) -> ChannelResult:
+        import asyncio
+
+        batch, index = self._join(event)
+        if index == 0:
+            await asyncio.wait([asyncio.wrap_future(batch.full)], timeout=self.linger)
+            self._close(batch)
+            try:
+                batch.done.set_result(await send(batch.events))
+            except BaseException as exc:
+                batch.done.set_exception(exc)
+                raise
+        results = await asyncio.wrap_future(batch.done)
+        return results[index]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"batches": self.batches, "events": self.events}
+
+    def _join(self, event: Dict[str, Any]):
+        with self._lock:
+            batch = self._open
+            if batch is None:
+                batch = self._open = _Batch()
+                self.batches += 1
+            index = len(batch.events)
+            batch.events.append(event)
+            self.events += 1
+            if len(batch.events) >= self.max_events:
+                self._open = None
+                batch.full.set_result(None)
+        return batch, index
+
+    def _close(self, batch: _Batch) -> None:
+        with self._lock:
+            if self._open is batch:
+                self._open = None
+
+    def _run(self, batch: _Batch, send: _Send) -> None:
+        self._close(batch)
+        try:
+            batch.done.set_result(send(batch.events))
+        except BaseException as exc:
+            batch.done.set_exception(exc)
+            raise
+
+
+def build_coalescer(cfg: Any) -> Optional[Coalescer]:
+    if not cfg:
+        return None
+    cfg = cfg if isinstance(cfg, dict) else {}
+    return Coalescer(
+        linger=float(cfg.get("linger", 0.2)),
+        max_events=int(cfg.get("max_events", 20)),
+    )
@@ -2,8 +2,6 @@ import os
 import re
 from typing import Any, Dict
 
-import yaml
-
 
 _env_pattern = re.compile(r"\$\{([A-Za-z0-9_]+)\}")
 
@@ -29,6 +27,8 @@ def _substitute_env(value: Any) -> Any:
 
 
 def load_config(path: str) -> Dict[str, Any]:
+    import yaml
+
     with open(path, "r", encoding="utf-8") as handle:
         data = yaml.safe_load(handle) or {}
 
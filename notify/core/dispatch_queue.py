@@ -0,0 +1,167 @@
+import queue
+from collections import deque
+from concurrent.futures import Future
+from itertools import count
+from threading import Condition, Thread
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from notify.core.models import DispatchResult, SendResult
+
+
+FULL_MODES = {"block", "drop_oldest", "drop_level", "raise"}
+# Lowest priority first: drop_level sheds from the front of this list.
+LEVEL_PRIORITY = ("info", "warn", "error", "fatal")
+
+
+class _QueueItem:
+    __slots__ = ("seq", "level", "event_key", "func", "future")
+
+    def __init__(self, seq: int, level: str, event_key: str, func: Callable[[], SendResult]) -> None:
+        self.seq = seq
+        self.level = level
+        self.event_key = event_key
+        self.func = func
+        self.future: Future = Future()
+
+
+class DispatchQueue:
+    def __init__(
+        self,
+        maxsize: int = 1000,
+        workers: int = 2,
+        full_mode: str = "block",
+        block_timeout: Optional[float] = None,
+    ) -> None:
+        full_mode = (full_mode or "block").lower()
+        if full_mode not in FULL_MODES:
+            raise ValueError(f"invalid queue full_mode: {full_mode}")
+        if maxsize < 1:
+            raise ValueError("queue maxsize must be >= 1")
+        self.maxsize = maxsize
+        self.workers = max(int(workers), 1)
+        self.full_mode = full_mode
+        self.block_timeout = block_timeout
+        self._levels: Dict[str, Deque[_QueueItem]] = {level: deque() for level in LEVEL_PRIORITY}
+        self._size = 0
+        self._running = 0
+        self._seq = count()
+        self._cond = Condition()
+        self._threads: List[Thread] = []
+        self._closed = False
+        self.dropped: Dict[str, int] = {level: 0 for level in LEVEL_PRIORITY}
+
+    @property
+    def depth(self) -> int:
+        return self._size
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "depth": self._size,
+                "maxsize": self.maxsize,
+                "in_flight": self._running,
+                "full_mode": self.full_mode,
+                "dropped": dict(self.dropped),
+            }
+
+    def submit(self, level: str, event_key: str, func: Callable[[], SendResult]) -> Future:
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("dispatch queue closed")
+            if not self._threads:
+                self._start_workers()
+            item = _QueueItem(next(self._seq), level if level in self._levels else "info", event_key, func)
+            if self._size >= self.maxsize:
+                victim = self._make_room(item)
+                if victim is item:
+                    self._resolve_dropped(item)
+                    return item.future
+            self._levels[item.level].append(item)
+            self._size += 1
+            self._cond.notify()
+        return item.future
+
+    def join(self) -> None:
+        with self._cond:
+            while self._size or self._running:
+                self._cond.wait()
+
+    def close(self) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join()
+
+    def _make_room(self, item: _QueueItem) -> Optional[_QueueItem]:
+        if self.full_mode == "raise":
+            raise queue.Full("dispatch queue full")
+        if self.full_mode == "block":
+            if not self._cond.wait_for(lambda: self._size < self.maxsize or self._closed, self.block_timeout):
+                raise queue.Full("dispatch queue full")
+            if self._closed:
+                raise RuntimeError("dispatch queue closed")
+            return None
+        if self.full_mode == "drop_oldest":
+            victim = self._pop_next()
+        else:
+            victim = self._pop_lowest(LEVEL_PRIORITY.index(item.level))
+            if victim is None:
+                return item
+        self._resolve_dropped(victim)
+        return victim
+
+    def _pop_next(self) -> Optional[_QueueItem]:
+        heads = [items for items in self._levels.values() if items]
+        if not heads:
+            return None
+        items = min(heads, key=lambda q: q[0].seq)
+        self._size -= 1
+        return items.popleft()
+
+    def _pop_lowest(self, max_priority: int) -> Optional[_QueueItem]:
+        for level in LEVEL_PRIORITY[: max_priority + 1]:
+            items = self._levels[level]
+            if items:
+                self._size -= 1
+                return items.popleft()
+        return None
+
+    def _resolve_dropped(self, item: _QueueItem) -> None:
+        self.dropped[item.level] += 1
+        result = DispatchResult(
+            event_key=item.event_key,
+            status="dropped",
+            channel_results={},
+            reason="queue_full",
+        )
+        item.future.set_result(SendResult(status="dropped", results=[result]))
+
+    def _start_workers(self) -> None:
+        for index in range(self.workers):
+            thread = Thread(target=self._worker, name=f"notify-queue-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                while not self._size and not self._closed:
+                    self._cond.wait()
+                if not self._size:
+                    return
+                item = self._pop_next()
+                self._running += 1
+                self._cond.notify_all()
+            try:
+                if item.future.set_running_or_notify_cancel():
+                    try:
+                        item.future.set_result(item.func())
+                    except BaseException as exc:
+                        item.future.set_exception(exc)
+            finally:
+                with self._cond:
+                    self._running -= 1
+                    self._cond.notify_all()
@@ -1,12 +1,25 @@
 from datetime import datetime, timezone
 import hashlib
-from typing import Any, Dict, Optional
+import time
+from typing import Any, Dict, Iterator, Optional, Tuple
 
 
 VALID_LEVELS = {"fatal", "error", "warn", "info"}
+EVENT_FIELDS = (
+    "event_key",
+    "level",
+    "raw_content",
+    "type",
+    "source",
+    "context",
+    "meta",
+    "timestamp",
+)
 
 
 def normalize_level(level: str) -> str:
+    if level in VALID_LEVELS:
+        return level
     normalized = (level or "").lower()
     if normalized not in VALID_LEVELS:
         raise ValueError(f"invalid level: {level}")
@@ -15,8 +28,138 @@ def normalize_level(level: str) -> str:
 
 def default_event_key(level: str, raw_content: str) -> str:
     content = "" if raw_content is None else str(raw_content)
-    digest = hashlib.sha1(content.encode("utf-8")).hexdigest()
-    return f"{level}:{digest[:12]}"
+    digest = hashlib.blake2b(content.encode("utf-8"), digest_size=6).hexdigest()
+    return f"{level}:{digest}"
+
+
+class Event:
+    """A notification event with dict-style access.
+
+    The default event_key and the ISO timestamp are only computed when first
+    read, so events suppressed by an explicit key never pay for them.
+    """
+
+    __slots__ = (
+        "level",
+        "raw_content",
+        "type",
+        "source",
+        "created_at",
+        "_event_key",
+        "_timestamp",
+        "_context",
+        "_meta",
+    )
+
+    def __init__(
+        self,
+        level: str,
+        raw_content: str,
+        type: str = "text",
+        source: Optional[str] = None,
+        event_key: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None,
+        meta: Optional[Dict[str, Any]] = None,
+        created_at: Optional[float] = None,
+        timestamp: Optional[str] = None,
+    ) -> None:
+        self.level = level
+        self.raw_content = raw_content
+        self.type = type
+        self.source = source
+        self.created_at = time.time() if created_at is None else created_at
+        self._event_key = event_key
+        self._timestamp = timestamp
+        self._context = context
+        self._meta = meta
+
+    @property
+    def event_key(self) -> str:
+        if self._event_key is None:
+            self._event_key = default_event_key(self.level, self.raw_content)
+        return self._event_key
+
+    @event_key.setter
+    def event_key(self, value: str) -> None:
+        self._event_key = value
+
+    @property
+    def timestamp(self) -> str:
+        if self._timestamp is None:
+            self._timestamp = datetime.fromtimestamp(self.created_at, timezone.utc).isoformat()
+        return self._timestamp
+
+    @timestamp.setter
+    def timestamp(self, value: str) -> None:
+        self._timestamp = value
+
+    @property
+    def context(self) -> Dict[str, Any]:
+        if self._context is None:
+            self._context = {}
+        return self._context
+
+    @context.setter
+    def context(self, value: Dict[str, Any]) -> None:
+        self._context = value
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        if self._meta is None:
+            self._meta = {}
+        return self._meta
+
+    @meta.setter
+    def meta(self, value: Dict[str, Any]) -> None:
+        self._meta = value
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in EVENT_FIELDS:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def __setitem__(self, name: str, value: Any) -> None:
+        if name not in EVENT_FIELDS:
+            raise KeyError(name)
+        setattr(self, name, value)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        if name not in EVENT_FIELDS:
+            return default
+        return getattr(self, name)
+
+    def __contains__(self, name: object) -> bool:
+        return name in EVENT_FIELDS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(EVENT_FIELDS)
+
+    def __len__(self) -> int:
+        return len(EVENT_FIELDS)
+
+    def keys(self) -> Tuple[str, ...]:
+        return EVENT_FIELDS
+
+    def items(self):
+        return [(name, getattr(self, name)) for name in EVENT_FIELDS]
+
+    def values(self):
+        return [getattr(self, name) for name in EVENT_FIELDS]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in EVENT_FIELDS}
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Event):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Event({self.to_dict()!r})"
 
 
 def build_event(
@@ -28,23 +171,21 @@ def build_event(
     context: Optional[Dict[str, Any]] = None,
     meta: Optional[Dict[str, Any]] = None,
     timestamp: Optional[str] = None,
-) -> Dict[str, Any]:
+) -> Event:
     normalized_level = normalize_level(level)
     content = "" if raw_content is None else str(raw_content)
     content_type = (type or "text").lower()
-    key = event_key or default_event_key(normalized_level, content)
-    created_at = timestamp or datetime.now(timezone.utc).isoformat()
     if not isinstance(context, dict):
-        context = {}
+        context = None
     if not isinstance(meta, dict):
-        meta = {}
-    return {
-        "event_key": key,
-        "level": normalized_level,
-        "raw_content": content,
-        "type": content_type,
-        "source": source,
-        "context": context,
-        "meta": meta,
-        "timestamp": created_at,
-    }
+        meta = None
+    return Event(
+        level=normalized_level,
+        raw_content=content,
+        type=content_type,
+        source=source,
+        event_key=event_key or None,
+        context=context,
+        meta=meta,
+        timestamp=timestamp,
+    )
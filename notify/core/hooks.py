@@ -0,0 +1,112 @@
+import time
+from threading import Lock
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+STAGES = (
+    "event_built",
+    "policy_decision",
+    "before_channel_send",
+    "after_channel_send",
+    "aggregate_flush",
+)
+
+Hook = Callable[["HookContext"], None]
+
+
+class HookContext:
+    """What a hook is told about one stage of the send pipeline.
+
+    started is a time.perf_counter() reading taken when the stage began and
+    elapsed the seconds it took, for stages that have a duration. One
+    context is shared by before_channel_send and after_channel_send, so a
+    hook can keep its own state (e.g. a tracing span) in data between them.
+    When the send raised, after_channel_send still fires, with result None
+    and the exception in error.
+    """
+
+    __slots__ = (
+        "stage", "event", "policy", "action", "reason", "channel", "result", "started", "elapsed",
+        "error", "data",
+    )
+
+    def __init__(self, stage: str, event: Any, started: Optional[float] = None) -> None:
+        self.stage = stage
+        self.event = event
+        self.policy: Optional[str] = None
+        self.action: Optional[str] = None
+        self.reason: Optional[str] = None
+        self.channel: Optional[str] = None
+        self.result: Any = None
+        self.started = time.perf_counter() if started is None else started
+        self.elapsed: Optional[float] = None
+        self.error: Optional[BaseException] = None
+        self.data: Dict[str, Any] = {}
+
+
+class Hooks:
+    """Callbacks registered per pipeline stage.
+
+    Each stage attribute is a tuple of hooks, or None when nothing is
+    registered, so call sites skip a stage with one attribute check and
+    never build a context for it. Tuples are replaced, never mutated, so a
+    send that already read one is unaffected by concurrent add/remove.
+    A hook that raises is counted in errors and does not stop the send.
+    """
+
+    def __init__(self) -> None:
+        self.event_built: Optional[Tuple[Hook, ...]] = None
+        self.policy_decision: Optional[Tuple[Hook, ...]] = None
+        self.before_channel_send: Optional[Tuple[Hook, ...]] = None
+        self.after_channel_send: Optional[Tuple[Hook, ...]] = None
+        self.aggregate_flush: Optional[Tuple[Hook, ...]] = None
+        # Whether either channel send stage has hooks.
+        self.sends = False
+        self.errors = 0
+        self._lock = Lock()
+
+    def add(self, stage: str, hook: Hook) -> Callable[[], None]:
+        """Register hook for stage; returns a function that unregisters it."""
+        if stage not in STAGES:
+            raise ValueError(f"unknown hook stage: {stage}")
+        with self._lock:
+            setattr(self, stage, (getattr(self, stage) or ()) + (hook,))
+            self._update()
+        return lambda: self.remove(stage, hook)
+
+    def remove(self, stage: str, hook: Hook) -> None:
+        if stage not in STAGES:
+            raise ValueError(f"unknown hook stage: {stage}")
+        with self._lock:
+            remaining = tuple(item for item in getattr(self, stage) or () if item is not hook)
+            setattr(self, stage, remaining or None)
+            self._update()
+
+    def fire(self, hooks: Tuple[Hook, ...], context: HookContext) -> None:
+        for hook in hooks:
+            try:
+                hook(context)
+            except Exception:
+                self.errors += 1
+
+    def before_send(self, channel: str, event: Any) -> HookContext:
+        context = HookContext("before_channel_send", event)
+        context.channel = channel
+        hooks = self.before_channel_send
+        if hooks is not None:
+            self.fire(hooks, context)
+        return context
+
+    def after_send(
+        self, context: HookContext, result: Any, error: Optional[BaseException] = None
+    ) -> None:
+        context.elapsed = time.perf_counter() - context.started
+        context.result = result
+        context.error = error
+        hooks = self.after_channel_send
+        if hooks is not None:
+            context.stage = "after_channel_send"
+            self.fire(hooks, context)
+
+    def _update(self) -> None:
+        self.sends = self.before_channel_send is not None or self.after_channel_send is not None
@@ -0,0 +1,233 @@
+from bisect import bisect_left
+from threading import Lock, Thread
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+# One sample: (suffix, label names, label values, value)
+_Sample = Tuple[str, Sequence[str], Sequence[str], float]
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self) -> List[_Sample]:
+        with self._lock:
+            return [("", self.labels, key, value) for key, value in self._values.items()]
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (last one is +Inf), sum, count]
+        self._values: Dict[Tuple[str, ...], List[Any]] = {}
+        self._lock = Lock()
+
+    def observe(self, value: float, *labels: str, count: int = 1) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += count
+            state[1] += value * count
+            state[2] += count
+
+    def samples(self) -> List[_Sample]:
+        with self._lock:
+            values = [(key, list(state[0]), state[1], state[2]) for key, state in self._values.items()]
+        samples: List[_Sample] = []
+        names = self.labels + ("le",)
+        for key, counts, total, count in values:
+            cumulative = 0
+            for bound, bucket in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket
+                samples.append(("_bucket", names, key + (_format(bound),), cumulative))
+            samples.append(("_sum", self.labels, key, total))
+            samples.append(("_count", self.labels, key, count))
+        return samples
+
+
+class Gauge:
+    """A metric read at scrape time, so keeping it current costs nothing.
+
+    collect() returns (label values, value) pairs; kind may be "counter"
+    for totals something else already keeps (e.g. a channel's stats()).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str],
+        collect: Callable[[], Iterable[Tuple[Sequence[str], float]]],
+        kind: str = "gauge",
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.collect = collect
+        self.kind = kind
+
+    def samples(self) -> List[_Sample]:
+        return [("", self.labels, tuple(key), value) for key, value in self.collect()]
+
+
+class MetricsRegistry:
+    """Named metrics rendered in the Prometheus text format.
+
+    Asking for a metric that already exists returns it, so components
+    rebuilt on reload keep adding to the same series.
+    """
+
+    def __init__(self, namespace: str = "notify") -> None:
+        self.namespace = namespace
+        self._metrics: Dict[str, Any] = {}
+        self._lock = Lock()
+        self._server = None
+        self._thread: Optional[Thread] = None
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(name, lambda full: Counter(full, help, labels))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(name, lambda full: Histogram(full, help, labels, buckets))
+
+    def gauge(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str],
+        collect: Callable[[], Iterable[Tuple[Sequence[str], float]]],
+        kind: str = "gauge",
+    ) -> Gauge:
+        """Register (or replace) a metric read from collect() at scrape time."""
+        full = self._full_name(name)
+        metric = Gauge(full, help, labels, collect, kind)
+        with self._lock:
+            self._metrics[full] = metric
+        return metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            try:
+                samples = metric.samples()
+            except Exception:
+                # A failing collector must not take the whole scrape down.
+                continue
+            lines.append(f"# HELP {metric.name} {_escape_help(metric.help)}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for suffix, names, values, value in samples:
+                labels = ",".join(
+                    f'{name}="{_escape_label(str(label))}"' for name, label in zip(names, values)
+                )
+                series = f"{metric.name}{suffix}{{{labels}}}" if labels else metric.name + suffix
+                lines.append(f"{series} {_format(value)}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int = 9464, host: str = "127.0.0.1") -> Tuple[str, int]:
+        """Expose render() at http://host:port/metrics; returns the bound address."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self.close()
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = Thread(target=self._server.serve_forever, name="notify-metrics", daemon=True)
+        self._thread.start()
+        return self._server.server_address[:2]
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+            self._thread = None
+
+    def _register(self, name: str, factory: Callable[[str], Any]) -> Any:
+        full = self._full_name(name)
+        with self._lock:
+            metric = self._metrics.get(full)
+            if metric is None:
+                metric = self._metrics[full] = factory(full)
+            return metric
+
+    def _full_name(self, name: str) -> str:
+        return f"{self.namespace}_{name}" if self.namespace else name
+
+
+def _format(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _escape_help(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def build_metrics(cfg: Any) -> Optional[MetricsRegistry]:
+    if not cfg:
+        return None
+    cfg = cfg if isinstance(cfg, dict) else {}
+    registry = MetricsRegistry(namespace=cfg.get("namespace", "notify"))
+    if cfg.get("port"):
+        registry.serve(int(cfg["port"]), cfg.get("host", "127.0.0.1"))
+    return registry
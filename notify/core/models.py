@@ -2,13 +2,17 @@ from dataclasses import dataclass
 from typing import Dict, List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class ChannelResult:
     success: bool
     message: Optional[str] = None
+    # Failures only: whether trying again may succeed, and the delay the
+    # provider asked for (seconds), if any.
+    retryable: bool = False
+    retry_after: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class DispatchResult:
     event_key: str
     status: str
@@ -16,7 +20,7 @@ class DispatchResult:
     reason: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class SendResult:
     status: str
     results: List[DispatchResult]
@@ -1,35 +1,252 @@
-from typing import Any, Dict, Iterable, List, Optional
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Event, Lock, Thread, Timer
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
-from notify.channels import BarkNotifier, EmailNotifier, FeishuNotifier, TelegramNotifier, WeComNotifier
 from notify.core.config import load_config
+from notify.core.dispatch_queue import DispatchQueue
 from notify.core.event import build_event
-from notify.core.models import DispatchResult, SendResult
+from notify.core.hooks import HookContext, Hooks
+from notify.core.metrics import Counter, MetricsRegistry, build_metrics
+from notify.core.models import ChannelResult, DispatchResult, SendResult
+from notify.core.outbox import Outbox, build_outbox
+from notify.core.pacer import PacedOut
 from notify.core.policies.aggregate import AggregatePolicy
+from notify.core.policies.base import BasePolicy
 from notify.core.policies.cooldown import CooldownPolicy
 from notify.core.policies.dedupe import DedupePolicy
+from notify.core.policies.pipeline import PolicyPipeline
 from notify.core.policies.rate_limit import RateLimitPolicy
 from notify.core.registry import NotifierRegistry
-from notify.core.store import MemoryStore
+from notify.core.retry import RetryScheduler
+from notify.core.scheduler import AggregateFlusher
+from notify.core.store import BaseStore, MemoryStore, ShardedMemoryStore
+
+
+# Configured policies always run in this order.
+POLICY_ORDER = ("dedupe", "cooldown", "rate_limit", "aggregate")
 
 
 class Notify:
+    # Seconds replaced channels stay open after a reload so in-flight sends finish.
+    retire_after = 15.0
+
     def __init__(
         self,
         channels: Iterable,
         policies: Iterable = (),
-        store: Optional[MemoryStore] = None,
+        store: Optional[BaseStore] = None,
+        max_workers: int = 0,
+        dispatch_queue: Optional[DispatchQueue] = None,
+        outbox: Optional[Outbox] = None,
+        metrics: Optional[MetricsRegistry] = None,
     ) -> None:
         self.channels = list(channels)
         self.policies = list(policies)
         self.store = store or MemoryStore()
+        self.max_workers = max_workers
+        self.dispatch_queue = dispatch_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = Lock()
+        self.metrics = metrics
+        self._events: Optional[Counter] = None
+        if metrics is not None:
+            self._instrument(metrics)
+        self.hooks = Hooks()
+        for channel in self.channels:
+            channel.hooks = self.hooks
+        self._pipeline = PolicyPipeline(self.policies, self.store, metrics=metrics, hooks=self.hooks)
+        self.retry_scheduler = RetryScheduler()
+        self.outbox = outbox
+        background = [policy for policy in self.policies if getattr(policy, "background", False)]
+        self._flusher: Optional[AggregateFlusher] = None
+        if background:
+            self._flusher = AggregateFlusher(background, self.store, self._dispatch_flushed)
+            self._flusher.start()
+        # What reload() diffs against: the config each channel/policy was built from.
+        self._config_path: Optional[str] = None
+        self._config: Dict[str, Any] = {}
+        self._channel_configs: List[Optional[Dict[str, Any]]] = [None] * len(self.channels)
+        self._policy_configs: Dict[str, Tuple[Dict[str, Any], BasePolicy]] = {}
+        self._reload_lock = Lock()
+        self._retiring: Dict[Callable[[], None], Timer] = {}
+        self._retire_lock = Lock()
+        self._watcher: Optional[Thread] = None
+        self._watch_stop = Event()
+        self.reloads = 0
+        self.reload_errors = 0
+        self.last_reload_error: Optional[str] = None
+        if self.outbox is not None:
+            self._replay_outbox()
 
     @classmethod
     def from_config(cls, path: Optional[str] = None) -> "Notify":
-        _register_builtin_channels()
-        config = load_config(path or "notify.yaml")
-        channels = _build_channels(config.get("channels", []))
-        policies = _build_policies(config.get("policies", {}))
-        return cls(channels=channels, policies=policies)
+        path = path or "notify.yaml"
+        config = load_config(path)
+        channel_configs = config.get("channels") or []
+        policy_configs = config.get("policies") or {}
+        channels = _build_channels(channel_configs)
+        policies = _build_policies(policy_configs)
+        store = _build_store(config.get("store") or {})
+        max_workers = _build_max_workers(config.get("dispatch") or {}, len(channels))
+        dispatch_queue = _build_dispatch_queue(config.get("queue"))
+        outbox = build_outbox(config.get("outbox"))
+        metrics = build_metrics(config.get("metrics"))
+        notify = cls(
+            channels=channels,
+            policies=list(policies.values()),
+            store=store,
+            max_workers=max_workers,
+            dispatch_queue=dispatch_queue,
+            outbox=outbox,
+            metrics=metrics,
+        )
+        notify._config_path = path
+        notify._config = config
+        notify._channel_configs = list(channel_configs)
+        notify._policy_configs = {
+            name: (policy_configs[name], policy) for name, policy in policies.items()
+        }
+        reload_cfg = config.get("reload") or {}
+        if reload_cfg.get("watch"):
+            notify.watch(interval=float(reload_cfg.get("interval", 2.0)))
+        if reload_cfg.get("signal"):
+            notify.reload_on_signal()
+        return notify
+
+    def reload(self, path: Optional[str] = None) -> Dict[str, List[str]]:
+        """Re-read the config and swap in only the channels and policies that changed.
+
+        The store, unchanged channels (with their connection pools and cached
+        tokens) and unchanged policies carry over, and pending aggregate
+        buckets move to a rebuilt aggregate policy. Sends already in flight
+        finish on the objects they started with.
+        """
+        with self._reload_lock:
+            path = path or self._config_path or "notify.yaml"
+            config = load_config(path)
+            changes: Dict[str, List[str]] = {
+                "added": [],
+                "removed": [],
+                "rebuilt": [],
+                "kept": [],
+                "restart_required": [],
+            }
+            channel_configs = config.get("channels") or []
+            channels, built_channels, retired_channels = self._diff_channels(channel_configs, changes)
+            try:
+                policy_configs, adoptions, retired_policies = self._diff_policies(
+                    config.get("policies") or {}, changes
+                )
+                max_workers = _build_max_workers(config.get("dispatch") or {}, len(channels))
+            except Exception:
+                for channel in built_channels:
+                    channel.close()
+                raise
+            for section in ("store", "queue", "outbox", "metrics"):
+                if (config.get(section) or None) != (self._config.get(section) or None):
+                    changes["restart_required"].append(section)
+
+            for policy, previous in adoptions:
+                policy.adopt(previous)
+            policies = [policy for _, policy in policy_configs.values()]
+            if policies != self.policies:
+                self._pipeline = PolicyPipeline(
+                    policies, self.store, metrics=self.metrics, hooks=self.hooks
+                )
+                self.policies = policies
+            for channel in built_channels:
+                channel.hooks = self.hooks
+                if self.metrics is not None:
+                    channel.instrument(self.metrics)
+            self.channels = channels
+            self._channel_configs = list(channel_configs)
+            self._policy_configs = policy_configs
+            retired_executor = None
+            if max_workers != self.max_workers:
+                with self._executor_lock:
+                    retired_executor, self._executor = self._executor, None
+                    self.max_workers = max_workers
+            self._restart_flusher()
+            self._config_path = path
+            self._config = config
+            self.reloads += 1
+            if retired_channels or retired_policies or retired_executor is not None:
+                self._retire_later(
+                    lambda: self._retire(retired_channels, retired_policies, retired_executor)
+                )
+        return changes
+
+    def watch(self, interval: float = 2.0, path: Optional[str] = None) -> None:
+        """Poll the config file and reload whenever it changes."""
+        if self._watcher is not None:
+            return
+        path = path or self._config_path or "notify.yaml"
+        self._watch_stop.clear()
+        self._watcher = Thread(
+            target=self._watch,
+            args=(path, interval),
+            name="notify-config-watcher",
+            daemon=True,
+        )
+        self._watcher.start()
+
+    def reload_on_signal(self, signum: Optional[int] = None) -> None:
+        """Reload on a signal (SIGHUP by default); must be called from the main thread."""
+        import signal
+
+        if signum is None:
+            signum = signal.SIGHUP
+
+        def handler(signum, frame):
+            # The interrupted thread may hold locks reload() needs.
+            Thread(target=self._try_reload, name="notify-reload", daemon=True).start()
+
+        signal.signal(signum, handler)
+
+    def close(self) -> None:
+        if self.dispatch_queue is not None:
+            self.dispatch_queue.close()
+        if self._watcher is not None:
+            self._watch_stop.set()
+            self._watcher.join()
+            self._watcher = None
+        if self._flusher is not None:
+            self._flusher.close()
+            self._flusher = None
+        with self._retire_lock:
+            retiring, self._retiring = self._retiring, {}
+        for task, timer in retiring.items():
+            timer.cancel()
+            task()
+        for policy in self.policies:
+            for event in policy.drain(self.store):
+                self._dispatch_flushed(event)
+        self.retry_scheduler.close()
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        # Deliveries still owed (e.g. dropped retries) are replayed on next start.
+        if self.outbox is not None:
+            self.outbox.close()
+        for channel in self.channels:
+            channel.close()
+        self.store.close()
+        if self.metrics is not None:
+            self.metrics.close()
+
+    async def aclose(self) -> None:
+        import asyncio
+
+        await asyncio.gather(*(channel.aclose() for channel in self.channels))
+        self.close()
+
+    def __enter__(self) -> "Notify":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     def send(
         self,
@@ -46,123 +263,669 @@ class Notify:
             event_key=event_key,
             source=source,
         )
+        if self.hooks.event_built is not None:
+            self._event_built(event)
 
-        results: List[DispatchResult] = []
+        flush_events, outcome_event, suppressed = self._evaluate(event)
+        return self._complete(flush_events, outcome_event, suppressed)
 
-        for policy in self.policies:
-            flush_events = policy.flush(self.store)
-            for flush_event in flush_events:
-                results.append(self._dispatch(flush_event))
+    def send_many(self, events: Iterable[Any]) -> List[SendResult]:
+        built = [_build_event_from_spec(spec) for spec in events]
+        if not built:
+            return []
+        if self.hooks.event_built is not None:
+            for event in built:
+                self._event_built(event)
 
-        outcome_event = event
-        for policy in self.policies:
-            outcome = policy.apply(outcome_event, self.store)
-            if outcome.action == "suppress":
-                results.append(
-                    DispatchResult(
-                        event_key=outcome_event.get("event_key", ""),
-                        status="suppressed",
-                        channel_results={},
-                        reason=outcome.reason,
-                    )
-                )
-                return SendResult(status="suppressed", results=results)
-            outcome_event = outcome.event or outcome_event
+        pipeline = self._pipeline
+        flush_events = pipeline.flush()
+        if flush_events and self.hooks.aggregate_flush is not None:
+            self._flushed(flush_events)
+        decisions = pipeline.apply_many(built)
+        if self._events is not None:
+            for event, reason in decisions:
+                self._count_event(event, reason)
+        outcomes = [
+            _suppressed_result(event, reason) if reason is not None else event
+            for event, reason in decisions
+        ]
+
+        pending = list(flush_events)
+        pending.extend(outcome for outcome in outcomes if not isinstance(outcome, DispatchResult))
+        dispatched = iter(self._dispatch_many(pending))
+        flush_results = [next(dispatched) for _ in flush_events]
+
+        send_results: List[SendResult] = []
+        for outcome in outcomes:
+            results = flush_results
+            flush_results = []
+            if isinstance(outcome, DispatchResult):
+                send_results.append(SendResult(status="suppressed", results=results + [outcome]))
+            else:
+                send_results.append(_summarize(results + [next(dispatched)]))
+        return send_results
+
+    def send_nowait(
+        self,
+        raw_content: Any,
+        type: str = "text",
+        notify_level: str = "info",
+        event_key: Optional[str] = None,
+        source: Optional[str] = None,
+    ) -> "Future[SendResult]":
+        event = build_event(
+            raw_content=raw_content,
+            type=type,
+            level=notify_level,
+            event_key=event_key,
+            source=source,
+        )
+        if self.hooks.event_built is not None:
+            self._event_built(event)
+
+        flush_events, outcome_event, suppressed = self._evaluate(event)
+        if suppressed is not None and not flush_events:
+            future: Future = Future()
+            future.set_result(SendResult(status="suppressed", results=[suppressed]))
+            return future
 
+        if self.dispatch_queue is None:
+            with self._executor_lock:
+                if self.dispatch_queue is None:
+                    self.dispatch_queue = DispatchQueue()
+        return self.dispatch_queue.submit(
+            outcome_event.get("level", ""),
+            outcome_event.get("event_key", ""),
+            lambda: self._complete(flush_events, outcome_event, suppressed),
+        )
+
+    def add_hook(self, stage: str, hook: Callable[[HookContext], None]) -> Callable[[], None]:
+        """Call hook(context) at stage of every send; returns a function that removes it.
+
+        Stages: event_built, policy_decision (once per policy that decided),
+        before_channel_send / after_channel_send (around each channel send,
+        retries included) and aggregate_flush (a digest about to go out).
+        """
+        return self.hooks.add(stage, hook)
+
+    def remove_hook(self, stage: str, hook: Callable[[HookContext], None]) -> None:
+        self.hooks.remove(stage, hook)
+
+    def stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {}
+        if self.dispatch_queue is not None:
+            stats["queue"] = self.dispatch_queue.stats()
+        channels = {channel.name: channel.stats() for channel in self.channels}
+        if any(channels.values()):
+            stats["channels"] = channels
+        retry = self.retry_scheduler.stats()
+        if retry["scheduled"] or retry["dropped"]:
+            stats["retry"] = retry
+        if self.outbox is not None:
+            stats["outbox"] = self.outbox.stats()
+        if self.hooks.errors:
+            stats["hooks"] = {"errors": self.hooks.errors}
+        if self.reloads or self.reload_errors:
+            stats["reload"] = {
+                "reloads": self.reloads,
+                "errors": self.reload_errors,
+                "last_error": self.last_reload_error,
+            }
+        aggregates = [policy for policy in self.policies if hasattr(policy, "pending")]
+        if aggregates:
+            stats["aggregate"] = {
+                "pending_buckets": sum(policy.pending() for policy in aggregates),
+                "flushed": self._flusher.flushed if self._flusher is not None else 0,
+            }
+        return stats
+
+    def _complete(
+        self,
+        flush_events: List[Dict[str, Any]],
+        outcome_event: Dict[str, Any],
+        suppressed: Optional[DispatchResult],
+    ) -> SendResult:
+        results = [self._dispatch(flush_event) for flush_event in flush_events]
+        if suppressed is not None:
+            results.append(suppressed)
+            return SendResult(status="suppressed", results=results)
         results.append(self._dispatch(outcome_event))
-        status = "sent"
-        if any(r.status == "failed" for r in results):
-            status = "failed"
-        elif any(r.status == "partial" for r in results):
-            status = "partial"
-        return SendResult(status=status, results=results)
+        return _summarize(results)
 
-    def _dispatch(self, event: Dict[str, Any]) -> DispatchResult:
-        channel_results = {}
-        success_count = 0
-        for channel in self.channels:
-            result = channel.send(event)
-            channel_results[channel.name] = result
-            if result.success:
-                success_count += 1
-
-        if success_count == len(self.channels):
-            status = "sent"
-        elif success_count == 0:
-            status = "failed"
+    async def asend(
+        self,
+        raw_content: Any,
+        type: str = "text",
+        notify_level: str = "info",
+        event_key: Optional[str] = None,
+        source: Optional[str] = None,
+    ) -> SendResult:
+        import asyncio
+
+        event = build_event(
+            raw_content=raw_content,
+            type=type,
+            level=notify_level,
+            event_key=event_key,
+            source=source,
+        )
+        if self.hooks.event_built is not None:
+            self._event_built(event)
+
+        # Policies only touch in-memory state and run inline: the store lock is
+        # taken and released synchronously, never held across an await.
+        flush_events, outcome_event, suppressed = self._evaluate(event)
+        pending = list(flush_events)
+        if suppressed is None:
+            pending.append(outcome_event)
+        results = list(await asyncio.gather(*(self._adispatch(item) for item in pending)))
+        if suppressed is not None:
+            results.append(suppressed)
+            return SendResult(status="suppressed", results=results)
+        return _summarize(results)
+
+    def _evaluate(
+        self, event: Dict[str, Any]
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any], Optional[DispatchResult]]:
+        pipeline = self._pipeline
+        flush_events = pipeline.flush()
+        if flush_events and self.hooks.aggregate_flush is not None:
+            self._flushed(flush_events)
+        outcome_event, reason = pipeline.apply(event)
+        if self._events is not None:
+            self._count_event(outcome_event, reason)
+        if reason is not None:
+            return flush_events, outcome_event, _suppressed_result(outcome_event, reason)
+        return flush_events, outcome_event, None
+
+    def _event_built(self, event: Dict[str, Any]) -> None:
+        hooks = self.hooks.event_built
+        if hooks is not None:
+            self.hooks.fire(hooks, HookContext("event_built", event))
+
+    def _flushed(self, events: List[Dict[str, Any]]) -> None:
+        hooks = self.hooks.aggregate_flush
+        if hooks is not None:
+            for event in events:
+                self.hooks.fire(hooks, HookContext("aggregate_flush", event))
+
+    def _dispatch_flushed(self, event: Dict[str, Any]) -> DispatchResult:
+        if self.hooks.aggregate_flush is not None:
+            self._flushed([event])
+        return self._dispatch(event)
+
+    def _count_event(self, event: Dict[str, Any], reason: Optional[str]) -> None:
+        if reason is None:
+            self._events.inc(event.get("level", ""), "allowed", "")
         else:
-            status = "partial"
+            self._events.inc(event.get("level", ""), "suppressed", reason)
 
-        return DispatchResult(
-            event_key=event.get("event_key", ""),
-            status=status,
-            channel_results=channel_results,
+    def _instrument(self, metrics: MetricsRegistry) -> None:
+        # Hot paths push into counters and histograms; everything else is
+        # read at scrape time. The collectors look at whatever self.channels,
+        # self.policies and self.store are then, so reloads are picked up.
+        self._events = metrics.counter(
+            "events_total",
+            "Events through the policies, by level and outcome (allowed, or suppressed by reason).",
+            ("level", "outcome", "reason"),
+        )
+        for channel in self.channels:
+            channel.instrument(metrics)
+        metrics.gauge(
+            "store_entries",
+            "Keys held by the in-memory store, by kind.",
+            ("kind",),
+            lambda: [((kind,), count) for kind, count in _store_entries(self.store).items()],
+        )
+        metrics.gauge(
+            "aggregate_buckets",
+            "Open aggregate buckets.",
+            (),
+            lambda: [((), sum(len(sizes) for sizes in self._bucket_sizes()))],
+        )
+        metrics.gauge(
+            "aggregate_bucket_events",
+            "Events held in open aggregate buckets, by level.",
+            ("level",),
+            lambda: [((level,), size) for level, size in self._bucket_events().items()],
         )
+        for key, help in (
+            ("fetches", "Access tokens fetched from the provider."),
+            ("refreshes", "Access tokens refreshed ahead of expiry."),
+            ("refresh_errors", "Refreshes ahead of expiry that failed."),
+            ("invalidated", "Access tokens dropped after the provider rejected them."),
+        ):
+            metrics.gauge(
+                f"token_{key}_total",
+                help,
+                ("channel",),
+                lambda key=key: [((name,), stats[key]) for name, stats in self._token_stats()],
+                kind="counter",
+            )
+
+    def _bucket_sizes(self) -> List[Dict[str, int]]:
+        return [policy.bucket_sizes() for policy in self.policies if hasattr(policy, "bucket_sizes")]
+
+    def _bucket_events(self) -> Dict[str, int]:
+        # Bucket keys are "level:source" and sources are free-form, so only
+        # the level is safe to use as a label.
+        events: Dict[str, int] = {}
+        for sizes in self._bucket_sizes():
+            for bucket, size in sizes.items():
+                level = bucket.split(":", 1)[0]
+                events[level] = events.get(level, 0) + size
+        return events
+
+    def _token_stats(self) -> List[Tuple[str, Dict[str, Any]]]:
+        # Channels on one account share a cache; report it once.
+        seen, stats = set(), []
+        for channel in self.channels:
+            tokens = getattr(channel, "_tokens", None)
+            if tokens is not None and id(tokens) not in seen:
+                seen.add(id(tokens))
+                stats.append((channel.name, tokens.stats()))
+        return stats
+
+    def _dispatch(self, event: Dict[str, Any]) -> DispatchResult:
+        channels = self.channels
+        entry = self._record_pending([event], channels)[0]
+        executor = self._get_executor() if len(channels) > 1 else None
+        if executor is None:
+            results = [channel.deliver(event) for channel in channels]
+        else:
+            futures = [executor.submit(channel.deliver, event) for channel in channels]
+            results = [future.result() for future in futures]
+        self._retry_failed(event, channels, results, entry)
+        return _build_dispatch_result(event, channels, results)
+
+    def _dispatch_many(self, events: List[Dict[str, Any]]) -> List[DispatchResult]:
+        if not events:
+            return []
+        channels = self.channels
+        entries = self._record_pending(events, channels)
+        executor = self._get_executor() if len(channels) > 1 else None
+        if executor is None:
+            per_channel = [channel.deliver_batch(events) for channel in channels]
+        else:
+            futures = [executor.submit(channel.deliver_batch, events) for channel in channels]
+            per_channel = [future.result() for future in futures]
+        for index, event in enumerate(events):
+            self._retry_failed(
+                event, channels, [results[index] for results in per_channel], entries[index]
+            )
+        return [
+            _build_dispatch_result(event, channels, [results[index] for results in per_channel])
+            for index, event in enumerate(events)
+        ]
+
+    async def _adispatch(self, event: Dict[str, Any]) -> DispatchResult:
+        import asyncio
+
+        channels = self.channels
+        entry = None
+        if self.outbox is not None:
+            # Waiting for the fsync must not block the event loop.
+            entry = (await asyncio.to_thread(self._record_pending, [event], channels))[0]
+        results = await asyncio.gather(*(channel.adeliver(event) for channel in channels))
+        self._retry_failed(event, channels, results, entry)
+        return _build_dispatch_result(event, channels, results)
+
+    def _record_pending(self, events: List[Dict[str, Any]], channels: List) -> List[Optional[int]]:
+        if self.outbox is None:
+            return [None] * len(events)
+        return self.outbox.put_many(events, [channel.name for channel in channels])
+
+    def _retry_failed(
+        self,
+        event: Dict[str, Any],
+        channels: List,
+        results: List[ChannelResult],
+        entry: Optional[int] = None,
+    ) -> None:
+        # Only the channels that failed transiently are retried, not the whole dispatch.
+        outbox = self.outbox if entry is not None else None
+        for channel, result in zip(channels, results):
+            if not result.success and result.retryable and (
+                channel.retry_policy is not None or isinstance(result, PacedOut)
+            ):
+                on_done = None
+                if outbox is not None:
+                    on_done = lambda result, name=channel.name: outbox.ack(entry, name)
+                delay = self.retry_scheduler.schedule(channel, event, result, on_done=on_done)
+                if delay is not None:
+                    result.message = f"{result.message} (retrying in {delay:.1f}s)"
+                    continue
+            if outbox is not None:
+                outbox.ack(entry, channel.name)
+
+    def _replay_outbox(self) -> None:
+        # Deliveries a previous process recorded but never finished go out
+        # again, in the background, to the channels that still had them.
+        by_name = {channel.name: channel for channel in self.channels}
+        for entry, data, names in self.outbox.pending():
+            event = build_event(
+                raw_content=data.get("raw_content"),
+                type=data.get("type") or "text",
+                level=data.get("level") or "info",
+                event_key=data.get("event_key"),
+                source=data.get("source"),
+                context=data.get("context"),
+                meta=data.get("meta"),
+                timestamp=data.get("timestamp"),
+            )
+            for name in names:
+                channel = by_name.get(name)
+                if channel is None:
+                    self.outbox.ack(entry, name)
+                    continue
+                self.retry_scheduler.submit(
+                    channel,
+                    event,
+                    on_done=lambda result, name=name, entry=entry: self.outbox.ack(entry, name),
+                )
+
+    def _diff_channels(self, channel_configs: List[Dict[str, Any]], changes: Dict[str, List[str]]):
+        # Reuse a running channel whenever its config entry is unchanged.
+        old = list(zip(self._channel_configs, self.channels))
+        old_names = {_channel_name(cfg) for cfg, _ in old if cfg is not None}
+        channels, built = [], []
+        try:
+            for item in channel_configs:
+                for index, (cfg, channel) in enumerate(old):
+                    if cfg == item:
+                        del old[index]
+                        changes["kept"].append(f"channel:{_channel_name(item)}")
+                        break
+                else:
+                    channel = _build_channel(item)
+                    built.append(channel)
+                    name = _channel_name(item)
+                    changes["rebuilt" if name in old_names else "added"].append(f"channel:{name}")
+                channels.append(channel)
+            if not channels:
+                raise ValueError("no channels configured")
+        except Exception:
+            for channel in built:
+                channel.close()
+            raise
+        new_names = {_channel_name(item) for item in channel_configs}
+        for cfg, channel in old:
+            if cfg is None or _channel_name(cfg) not in new_names:
+                changes["removed"].append(f"channel:{channel.name}")
+        return channels, built, [channel for _, channel in old]
+
+    def _diff_policies(self, policy_configs: Dict[str, Any], changes: Dict[str, List[str]]):
+        entries: Dict[str, Tuple[Dict[str, Any], BasePolicy]] = {}
+        adoptions = []
+        for name in POLICY_ORDER:
+            cfg = policy_configs.get(name)
+            if not cfg:
+                continue
+            current = self._policy_configs.get(name)
+            if current is not None and current[0] == cfg:
+                entries[name] = current
+                changes["kept"].append(f"policy:{name}")
+                continue
+            policy = _build_policy(name, cfg)
+            entries[name] = (cfg, policy)
+            if current is not None:
+                adoptions.append((policy, current[1]))
+                changes["rebuilt"].append(f"policy:{name}")
+            else:
+                changes["added"].append(f"policy:{name}")
+        kept = {id(policy) for _, policy in entries.values()}
+        retired = [policy for policy in self.policies if id(policy) not in kept]
+        for name in self._policy_configs:
+            if name not in entries:
+                changes["removed"].append(f"policy:{name}")
+        return entries, adoptions, retired
+
+    def _restart_flusher(self) -> None:
+        background = [policy for policy in self.policies if getattr(policy, "background", False)]
+        current = self._flusher.policies if self._flusher is not None else []
+        if background == current:
+            return
+        flushed = 0
+        if self._flusher is not None:
+            self._flusher.close()
+            flushed = self._flusher.flushed
+        self._flusher = None
+        if background:
+            self._flusher = AggregateFlusher(background, self.store, self._dispatch_flushed)
+            self._flusher.flushed = flushed
+            self._flusher.start()
+
+    def _retire(
+        self,
+        channels: List,
+        policies: List[BasePolicy],
+        executor: Optional[ThreadPoolExecutor],
+    ) -> None:
+        # Events that reached a replaced policy after it handed over its state.
+        for policy in policies:
+            for event in policy.drain(self.store):
+                self._dispatch(event)
+        if executor is not None:
+            executor.shutdown(wait=True)
+        for channel in channels:
+            channel.close()
+
+    def _retire_later(self, task: Callable[[], None]) -> None:
+        timer = Timer(self.retire_after, self._run_retired, args=(task,))
+        timer.daemon = True
+        with self._retire_lock:
+            self._retiring[task] = timer
+        timer.start()
 
+    def _run_retired(self, task: Callable[[], None]) -> None:
+        with self._retire_lock:
+            if self._retiring.pop(task, None) is None:
+                return
+        task()
 
-def _register_builtin_channels() -> None:
-    NotifierRegistry.register("telegram", TelegramNotifier)
-    NotifierRegistry.register("wecom", WeComNotifier)
-    NotifierRegistry.register("feishu", FeishuNotifier)
-    NotifierRegistry.register("bark", BarkNotifier)
-    NotifierRegistry.register("email", EmailNotifier)
+    def _watch(self, path: str, interval: float) -> None:
+        stamp = _config_stamp(path)
+        while not self._watch_stop.wait(interval):
+            current = _config_stamp(path)
+            if current is None or current == stamp:
+                continue
+            stamp = current
+            self._try_reload(path)
+
+    def _try_reload(self, path: Optional[str] = None) -> None:
+        # Background reloads keep the running config when the new one is invalid.
+        try:
+            self.reload(path)
+        except Exception as exc:
+            self.reload_errors += 1
+            self.last_reload_error = f"{type(exc).__name__}: {exc}"
+
+    def _get_executor(self) -> Optional[ThreadPoolExecutor]:
+        if self.max_workers <= 1:
+            return None
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="notify-dispatch",
+                    )
+        return self._executor
+
+
+def _suppressed_result(event: Dict[str, Any], reason: Optional[str]) -> DispatchResult:
+    return DispatchResult(
+        event_key=event.get("event_key", ""),
+        status="suppressed",
+        channel_results={},
+        reason=reason,
+    )
+
+
+def _build_dispatch_result(
+    event: Dict[str, Any], channels: List, results: Iterable[ChannelResult]
+) -> DispatchResult:
+    channel_results = {}
+    success_count = 0
+    for channel, result in zip(channels, results):
+        channel_results[channel.name] = result
+        if result.success:
+            success_count += 1
+
+    if success_count == len(channels):
+        status = "sent"
+    elif success_count == 0:
+        status = "failed"
+    else:
+        status = "partial"
+
+    return DispatchResult(
+        event_key=event.get("event_key", ""),
+        status=status,
+        channel_results=channel_results,
+    )
+
+
+def _build_event_from_spec(spec: Any) -> Dict[str, Any]:
+    if not isinstance(spec, dict):
+        return build_event(raw_content=spec)
+    return build_event(
+        raw_content=spec.get("raw_content"),
+        type=spec.get("type", "text"),
+        level=spec.get("notify_level", "info"),
+        event_key=spec.get("event_key"),
+        source=spec.get("source"),
+    )
+
+
+def _store_entries(store: BaseStore) -> Dict[str, int]:
+    entries = getattr(store, "entries", None)
+    return entries() if entries is not None else {}
+
+
+def _summarize(results: List[DispatchResult]) -> SendResult:
+    status = "sent"
+    if any(r.status == "failed" for r in results):
+        status = "failed"
+    elif any(r.status == "partial" for r in results):
+        status = "partial"
+    return SendResult(status=status, results=results)
+
+
+def _build_channel(item: Dict[str, Any]):
+    channel_type = item.get("type")
+    if not channel_type:
+        raise ValueError("channel missing type")
+    params = {k: v for k, v in item.items() if k != "type"}
+    config_overrides = params.pop("config", None)
+    if isinstance(config_overrides, dict):
+        params.update(config_overrides)
+    return NotifierRegistry.create(channel_type, **params)
 
 
 def _build_channels(channel_configs: List[Dict[str, Any]]):
-    channels = []
-    for item in channel_configs:
-        channel_type = item.get("type")
-        if not channel_type:
-            raise ValueError("channel missing type")
-        params = {k: v for k, v in item.items() if k != "type"}
-        config_overrides = params.pop("config", None)
-        if isinstance(config_overrides, dict):
-            params.update(config_overrides)
-        channels.append(NotifierRegistry.create(channel_type, **params))
+    channels = [_build_channel(item) for item in channel_configs]
     if not channels:
         raise ValueError("no channels configured")
     return channels
 
 
-def _build_policies(policy_configs: Dict[str, Any]):
-    policies = []
-    dedupe_cfg = policy_configs.get("dedupe")
-    if dedupe_cfg:
-        policies.append(
-            DedupePolicy(
-                ttl=int(dedupe_cfg.get("ttl", 3600)),
-                levels=dedupe_cfg.get("levels") or [],
-                upgrade_after=dedupe_cfg.get("upgrade_after"),
-            )
-        )
+def _channel_name(item: Dict[str, Any]) -> str:
+    return item.get("name") or item.get("type") or ""
 
-    cooldown_cfg = policy_configs.get("cooldown")
-    if cooldown_cfg:
-        policies.append(
-            CooldownPolicy(
-                ttl=int(cooldown_cfg.get("ttl", 3600)),
-                levels=cooldown_cfg.get("levels") or [],
-            )
+
+def _build_store(store_cfg: Dict[str, Any]) -> BaseStore:
+    store_type = (store_cfg.get("type") or "memory").lower()
+    if store_type == "memory":
+        return MemoryStore()
+    if store_type == "sharded":
+        return ShardedMemoryStore(shards=int(store_cfg.get("shards", 16)))
+    if store_type == "sqlite":
+        from notify.core.store.sqlite import SqliteStore
+
+        return SqliteStore(
+            path=store_cfg.get("path", "notify-state.db"),
+            timeout=float(store_cfg.get("timeout", 5.0)),
+            cleanup_interval=float(store_cfg.get("cleanup_interval", 30.0)),
+            cleanup_batch=int(store_cfg.get("cleanup_batch", 500)),
         )
+    if store_type == "redis":
+        from notify.core.store.redis import RedisStore
 
-    rate_cfg = policy_configs.get("rate_limit")
-    if rate_cfg:
-        policies.append(
-            RateLimitPolicy(
-                per_minute=int(rate_cfg.get("per_minute", 30)),
-                levels=rate_cfg.get("levels") or [],
-                scope=rate_cfg.get("scope", "global"),
-            )
+        return RedisStore(
+            url=store_cfg.get("url", "redis://localhost:6379/0"),
+            prefix=store_cfg.get("prefix", "notify:"),
         )
+    raise ValueError(f"unknown store type: {store_type}")
 
-    agg_cfg = policy_configs.get("aggregate")
-    if agg_cfg:
-        policies.append(
-            AggregatePolicy(
-                window=int(agg_cfg.get("window", 3600)),
-                levels=agg_cfg.get("levels") or ["warn"],
-                max_samples=int(agg_cfg.get("max_samples", 5)),
-            )
+
+def _build_max_workers(dispatch_cfg: Dict[str, Any], channel_count: int) -> int:
+    mode = (dispatch_cfg.get("mode") or "sequential").lower()
+    if mode == "sequential":
+        return 0
+    if mode != "concurrent":
+        raise ValueError(f"invalid dispatch mode: {mode}")
+    max_workers = dispatch_cfg.get("max_workers")
+    if max_workers is None:
+        return channel_count
+    return int(max_workers)
+
+
+def _build_dispatch_queue(queue_cfg: Optional[Dict[str, Any]]) -> Optional[DispatchQueue]:
+    if not queue_cfg:
+        return None
+    block_timeout = queue_cfg.get("block_timeout")
+    return DispatchQueue(
+        maxsize=int(queue_cfg.get("maxsize", 1000)),
+        workers=int(queue_cfg.get("workers", 2)),
+        full_mode=queue_cfg.get("full_mode", "block"),
+        block_timeout=float(block_timeout) if block_timeout is not None else None,
+    )
+
+
+def _build_policy(name: str, cfg: Dict[str, Any]) -> BasePolicy:
+    if name == "dedupe":
+        return DedupePolicy(
+            ttl=int(cfg.get("ttl", 3600)),
+            levels=cfg.get("levels") or [],
+            upgrade_after=cfg.get("upgrade_after"),
+        )
+    if name == "cooldown":
+        return CooldownPolicy(
+            ttl=int(cfg.get("ttl", 3600)),
+            levels=cfg.get("levels") or [],
+        )
+    if name == "rate_limit":
+        return RateLimitPolicy(
+            per_minute=int(cfg.get("per_minute", 30)),
+            levels=cfg.get("levels") or [],
+            scope=cfg.get("scope", "global"),
+            algorithm=cfg.get("algorithm", "fixed_window"),
+            per_second=cfg.get("per_second"),
+            burst=cfg.get("burst"),
         )
+    if name == "aggregate":
+        return AggregatePolicy(
+            window=int(cfg.get("window", 3600)),
+            levels=cfg.get("levels") or ["warn"],
+            max_samples=int(cfg.get("max_samples", 5)),
+            background=bool(cfg.get("background", False)),
+            top_k=int(cfg["top_k"]) if cfg.get("top_k") else None,
+        )
+    raise ValueError(f"unknown policy: {name}")
+
+
+def _build_policies(policy_configs: Dict[str, Any]) -> Dict[str, BasePolicy]:
+    return {
+        name: _build_policy(name, policy_configs[name])
+        for name in POLICY_ORDER
+        if policy_configs.get(name)
+    }
+
 
-    return policies
+def _config_stamp(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
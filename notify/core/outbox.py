@@ -0,0 +1,377 @@
+import json
+import os
+import struct
+import time
+import zlib
+from threading import Condition, Lock, Thread
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+
+PUT = 1
+ACK = 2
+DONE = 3
+
+# payload length, crc32 of (kind, entry id, payload), kind, entry id
+_HEADER = struct.Struct("<IIBQ")
+_CHECKED = struct.Struct("<BQ")
+SYNC_MODES = ("batch", "interval", "none")
+
+
+class _Entry:
+    __slots__ = ("payload", "remaining", "segment")
+
+    def __init__(self, payload: bytes, remaining: Set[str], segment: int) -> None:
+        self.payload = payload
+        self.remaining = remaining
+        # Where the entry's latest PUT lives; its ACKs and DONE are only ever later.
+        self.segment = segment
+
+
+class Outbox:
+    """Append-only, crash-safe log of deliveries that have not finished yet.
+
+    Every dispatched event is written as a PUT record naming its channels
+    before any channel is tried; each channel that is done with it (sent, or
+    failed for good) appends an ACK, and the last one a DONE. Records are a
+    fixed binary header with a CRC32 followed by the payload, so a torn write
+    at the tail is detected and ignored on replay.
+
+    The log is split into numbered segments, deleted oldest first once every
+    entry PUT in them is DONE, so an ACK or DONE never outlives its PUT. When
+    more than max_segments are kept alive by a few slow entries, those
+    entries are rewritten into the current segment and the old ones dropped.
+
+    sync="batch" makes put() wait until its record is fsynced, with
+    concurrent writers sharing one fsync; "interval" fsyncs in the background
+    every sync_interval seconds; "none" leaves it to the OS. Records reach the
+    OS on every write, so a crash of the process alone never loses them.
+    """
+
+    def __init__(
+        self,
+        path: str = "notify-outbox",
+        sync: str = "batch",
+        sync_interval: float = 0.05,
+        segment_size: int = 16 * 1024 * 1024,
+        max_segments: int = 8,
+    ) -> None:
+        if sync not in SYNC_MODES:
+            raise ValueError(f"invalid outbox sync mode: {sync}")
+        self.path = path
+        self.sync = sync
+        self.sync_interval = sync_interval
+        self.segment_size = max(int(segment_size), 4096)
+        self.max_segments = max(int(max_segments), 1)
+        self.appended = 0
+        self.syncs = 0
+        self.errors = 0
+        self.corrupt = 0
+        self._lock = Lock()
+        self._cond = Condition(self._lock)
+        self._sync_lock = Lock()
+        self._entries: Dict[int, _Entry] = {}
+        # segment number -> entries PUT there that are not DONE yet
+        self._live: Dict[int, int] = {}
+        self._next_id = 1
+        self._written = 0
+        self._synced = 0
+        self._closed = False
+        self._generation = 0
+        self._compacting = False
+        os.makedirs(path, exist_ok=True)
+        self._recover()
+        self._segment = max(self._live, default=0) + 1
+        self._fd = self._open_segment(self._segment)
+        self._size = 0
+        self._live.setdefault(self._segment, 0)
+        self._thread: Optional[Thread] = None
+        if sync != "none":
+            self._thread = Thread(target=self._run, name="notify-outbox-sync", daemon=True)
+            self._thread.start()
+
+    def put(self, event: Dict[str, Any], channels: Iterable[str]) -> int:
+        """Record event as pending for channels; returns its entry id."""
+        return self.put_many([event], channels)[0]
+
+    def put_many(self, events: List[Dict[str, Any]], channels: Iterable[str]) -> List[int]:
+        channels = list(channels)
+        payloads = [
+            json.dumps(
+                {"event": _event_dict(event), "channels": channels},
+                separators=(",", ":"),
+                ensure_ascii=False,
+                default=str,
+            ).encode("utf-8")
+            for event in events
+        ]
+        with self._lock:
+            entries = list(range(self._next_id, self._next_id + len(payloads)))
+            self._next_id += len(payloads)
+            records = [(PUT, entry, payload) for entry, payload in zip(entries, payloads)]
+            self._append(records)
+            for entry, payload in zip(entries, payloads):
+                self._entries[entry] = _Entry(payload, set(channels), self._segment)
+                self._live[self._segment] += 1
+            seq = self._written
+        if self.sync == "batch":
+            self._wait(seq)
+        return entries
+
+    def ack(self, entry: int, channel: str) -> None:
+        """Mark channel as done with entry; the last channel completes the entry."""
+        with self._lock:
+            state = self._entries.get(entry)
+            if state is None or channel not in state.remaining or self._closed:
+                return
+            state.remaining.discard(channel)
+            records = [(ACK, entry, channel.encode("utf-8"))]
+            if not state.remaining:
+                records.append((DONE, entry, b""))
+            self._append(records)
+            if not state.remaining:
+                del self._entries[entry]
+                self._live[state.segment] -= 1
+                self._drop_finished()
+
+    def pending(self) -> List[Tuple[int, Dict[str, Any], List[str]]]:
+        """(entry, event dict, channels still to deliver) for every unfinished entry."""
+        with self._lock:
+            items = [
+                (entry, state.payload, sorted(state.remaining))
+                for entry, state in self._entries.items()
+            ]
+        return [
+            (entry, json.loads(payload)["event"], remaining) for entry, payload, remaining in items
+        ]
+
+    def compact(self) -> int:
+        """Rewrite entries that keep older segments alive; returns the segments dropped."""
+        with self._lock:
+            return self._compact()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "pending": len(self._entries),
+                "segments": len(self._live),
+                "appended": self.appended,
+                "syncs": self.syncs,
+                "errors": self.errors,
+                "corrupt": self.corrupt,
+            }
+
+    def close(self) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+        with self._cond:
+            with self._sync_lock:
+                try:
+                    os.fsync(self._fd)
+                except OSError:
+                    self.errors += 1
+                os.close(self._fd)
+                self._generation += 1
+            self._synced = self._written
+            self._cond.notify_all()
+
+    def _append(self, records: List[Tuple[int, int, bytes]]) -> None:
+        data = b"".join(
+            _HEADER.pack(len(payload), _crc(kind, entry, payload), kind, entry) + payload
+            for kind, entry, payload in records
+        )
+        if self._closed:
+            raise RuntimeError("outbox is closed")
+        if self._size and self._size + len(data) > self.segment_size:
+            self._rotate()
+        os.write(self._fd, data)
+        self._size += len(data)
+        self._written += 1
+        self.appended += len(records)
+        if self._thread is not None:
+            self._cond.notify_all()
+
+    def _drop_finished(self) -> None:
+        for segment in sorted(self._live):
+            if segment == self._segment or self._live[segment]:
+                return
+            self._drop_segment(segment)
+
+    def _rotate(self) -> None:
+        self._sync_now()
+        with self._sync_lock:
+            os.close(self._fd)
+            self._generation += 1
+        self._segment += 1
+        self._fd = self._open_segment(self._segment)
+        self._size = 0
+        self._live[self._segment] = 0
+        self._drop_finished()
+        if len(self._live) > self.max_segments and not self._compacting:
+            self._compact()
+
+    def _compact(self) -> int:
+        current = self._segment
+        movers = [(entry, state) for entry, state in self._entries.items() if state.segment != current]
+        if not movers:
+            return 0
+        # A rewritten PUT lists only the channels still owed, so it replaces
+        # the entry's earlier PUT and ACK records on replay.
+        records = []
+        for entry, state in movers:
+            data = json.loads(state.payload)
+            data["channels"] = sorted(state.remaining)
+            state.payload = json.dumps(
+                data, separators=(",", ":"), ensure_ascii=False
+            ).encode("utf-8")
+            records.append((PUT, entry, state.payload))
+        self._compacting = True
+        try:
+            self._append(records)
+        finally:
+            self._compacting = False
+        self._sync_now()
+        segments = len(self._live)
+        for entry, state in movers:
+            self._live[state.segment] -= 1
+            state.segment = self._segment
+            self._live[self._segment] += 1
+        self._drop_finished()
+        return segments - len(self._live)
+
+    def _sync_now(self) -> None:
+        with self._sync_lock:
+            try:
+                os.fsync(self._fd)
+            except OSError:
+                self.errors += 1
+        self._synced = self._written
+        self._cond.notify_all()
+
+    def _wait(self, seq: int) -> None:
+        with self._cond:
+            while self._synced < seq and not self._closed:
+                self._cond.wait()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._synced >= self._written and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                target, fd, generation = self._written, self._fd, self._generation
+            with self._sync_lock:
+                if generation == self._generation:
+                    try:
+                        os.fsync(fd)
+                    except OSError:
+                        self.errors += 1
+            with self._cond:
+                self._synced = max(self._synced, target)
+                self.syncs += 1
+                self._cond.notify_all()
+            if self.sync == "interval":
+                time.sleep(self.sync_interval)
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.path, f"{segment:08d}.log")
+
+    def _open_segment(self, segment: int) -> int:
+        fd = os.open(self._segment_path(segment), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self._sync_dir()
+        return fd
+
+    def _drop_segment(self, segment: int) -> None:
+        self._live.pop(segment, None)
+        try:
+            os.remove(self._segment_path(segment))
+        except FileNotFoundError:
+            pass
+
+    def _sync_dir(self) -> None:
+        try:
+            fd = os.open(self.path, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    def _recover(self) -> None:
+        segments = sorted(
+            int(name[:-4])
+            for name in os.listdir(self.path)
+            if name.endswith(".log") and name[:-4].isdigit()
+        )
+        for segment in segments:
+            self._live[segment] = 0
+            with open(self._segment_path(segment), "rb") as handle:
+                data = handle.read()
+            self._replay(segment, data)
+        for state in self._entries.values():
+            self._live[state.segment] += 1
+        for segment in segments:
+            if self._live[segment]:
+                break
+            self._drop_segment(segment)
+
+    def _replay(self, segment: int, data: bytes) -> None:
+        offset = 0
+        end = len(data)
+        while offset + _HEADER.size <= end:
+            length, crc, kind, entry = _HEADER.unpack_from(data, offset)
+            start = offset + _HEADER.size
+            payload = data[start:start + length]
+            if len(payload) < length or _crc(kind, entry, payload) != crc:
+                # Torn or damaged tail: nothing after it can be trusted.
+                self.corrupt += 1
+                return
+            offset = start + length
+            self._next_id = max(self._next_id, entry + 1)
+            if kind == PUT:
+                state = self._entries.get(entry)
+                channels = set(json.loads(payload).get("channels") or ())
+                if state is None:
+                    self._entries[entry] = _Entry(payload, channels, segment)
+                else:
+                    state.payload = payload
+                    state.remaining = channels
+                    state.segment = segment
+                if not channels:
+                    self._entries.pop(entry, None)
+            elif kind == ACK:
+                state = self._entries.get(entry)
+                if state is not None:
+                    state.remaining.discard(payload.decode("utf-8"))
+            elif kind == DONE:
+                self._entries.pop(entry, None)
+
+
+def _crc(kind: int, entry: int, payload: bytes) -> int:
+    return zlib.crc32(payload, zlib.crc32(_CHECKED.pack(kind, entry)))
+
+
+def _event_dict(event: Dict[str, Any]) -> Dict[str, Any]:
+    to_dict = getattr(event, "to_dict", None)
+    return to_dict() if to_dict is not None else dict(event)
+
+
+def build_outbox(cfg: Any) -> Optional[Outbox]:
+    if not cfg:
+        return None
+    cfg = cfg if isinstance(cfg, dict) else {}
+    return Outbox(
+        path=cfg.get("path", "notify-outbox"),
+        sync=cfg.get("sync", "batch"),
+        sync_interval=float(cfg.get("sync_interval", 0.05)),
+        segment_size=int(cfg.get("segment_size", 16 * 1024 * 1024)),
+        max_segments=int(cfg.get("max_segments", 8)),
+    )
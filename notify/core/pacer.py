@@ -0,0 +1,195 @@
+import heapq
+import time
+from collections import deque
+from itertools import count
+from threading import Lock
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from weakref import WeakValueDictionary
+
+from notify.core.models import ChannelResult
+
+
+WINDOWS = (("per_second", 1.0), ("per_minute", 60.0), ("per_hour", 3600.0))
+
+# Orders slots across a shared pacer's channels.
+_sequence = count()
+
+
+class PacedOut(ChannelResult):
+    """A send the pacer refused: queued for its slot rather than failed."""
+
+    __slots__ = ()
+
+
+class Slot:
+    __slots__ = ("time", "seq", "settled")
+
+    def __init__(self, time: float, seq: int) -> None:
+        # When the send may start; once settled, when it completed.
+        self.time = time
+        self.seq = seq
+        self.settled = False
+
+
+class Pacer:
+    """Spaces a channel's sends to stay under its provider's limits.
+
+    Each limit allows count sends in any window of seconds, so bursts go
+    out at the provider's ceiling and only the overflow waits. reserve()
+    books the earliest slot that satisfies every limit, including those of
+    a parent pacer shared by channels on the same account; slots are handed
+    out in arrival order, so concurrent senders queue up instead of all
+    hitting the API and getting 429s back.
+
+    A send counts from when it completed (settle()), the latest the
+    provider can have seen it. Sends still in flight count from their slot,
+    so a waiter asks delay() again after sleeping in case they finished late.
+
+    Waiting happens in the sending thread, so max_wait is kept short: a
+    send whose slot is further away is refused and left to the retry
+    scheduler, with next_in() as its retry_after.
+    """
+
+    def __init__(
+        self,
+        limits: List[Tuple[int, float]],
+        parent: Optional["Pacer"] = None,
+        max_wait: float = 1.0,
+    ) -> None:
+        for limit, window in limits:
+            if limit < 1 or window <= 0:
+                raise ValueError("pace limits need count >= 1 and window > 0")
+        self._limits = list(limits)
+        self._max_window = max((window for _, window in limits), default=0.0)
+        self._log: Deque[Slot] = deque()
+        # Last slot handed out; later reservations never get an earlier one.
+        self._last = 0.0
+        self._hold_until = 0.0
+        self.parent = parent
+        self.max_wait = max_wait
+        self.paced = 0
+        self.waited = 0.0
+        self.rejected = 0
+        self._lock = Lock()
+
+    def reserve(self) -> Optional[Slot]:
+        """Book the next send, or return None if its slot is more than max_wait away."""
+        now = time.monotonic()
+        with self._lock:
+            if self.parent is None:
+                return self._reserve(now, now)
+            with self.parent._lock:
+                slot = self._reserve(now, max(self.parent._last, self.parent._earliest(now)))
+                if slot is not None:
+                    self.parent._last = slot.time
+                    self.parent._log.append(slot)
+                return slot
+
+    def delay(self, slot: Slot) -> float:
+        """Seconds until slot may go out, given when earlier sends actually completed."""
+        now = time.monotonic()
+        with self._lock:
+            start = max(slot.time, self._earliest(now, slot.seq))
+            if self.parent is not None:
+                with self.parent._lock:
+                    start = max(start, self.parent._earliest(now, slot.seq))
+            slot.time = start
+        return start - now
+
+    def next_in(self) -> float:
+        """Seconds until a send booked now could go out."""
+        now = time.monotonic()
+        with self._lock:
+            start = max(self._last, self._earliest(now))
+            if self.parent is not None:
+                with self.parent._lock:
+                    start = max(start, self.parent._last, self.parent._earliest(now))
+        return max(start - now, 0.0)
+
+    def settle(self, slot: Slot) -> None:
+        """Record that the send booked at slot has completed."""
+        with self._lock:
+            slot.time = max(slot.time, time.monotonic())
+            slot.settled = True
+
+    def defer(self, seconds: float) -> None:
+        """Hold every send back for seconds, e.g. after the provider returned 429."""
+        until = time.monotonic() + seconds
+        with self._lock:
+            self._hold_until = max(self._hold_until, until)
+            self._last = max(self._last, until)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"paced": self.paced, "waited": round(self.waited, 3), "rejected": self.rejected}
+
+    def _reserve(self, now: float, start: float) -> Optional[Slot]:
+        start = max(start, self._last, self._earliest(now))
+        delay = start - now
+        if delay > self.max_wait:
+            self.rejected += 1
+            return None
+        slot = Slot(start, next(_sequence))
+        self._log.append(slot)
+        self._last = start
+        if delay > 0:
+            self.paced += 1
+            self.waited += delay
+        return slot
+
+    def _earliest(self, now: float, before: Optional[int] = None) -> float:
+        self._prune(now)
+        times = [slot.time for slot in self._log if before is None or slot.seq < before]
+        earliest = self._hold_until
+        for limit, window in self._limits:
+            if len(times) >= limit:
+                # Settled sends complete out of order, so not simply times[-limit].
+                earliest = max(earliest, heapq.nlargest(limit, times)[-1] + window)
+        return earliest
+
+    def _prune(self, now: float) -> None:
+        # Pacing itself keeps this to about max_count entries per max_window.
+        log = self._log
+        horizon = now - self._max_window
+        while log and log[0].settled and log[0].time <= horizon:
+            log.popleft()
+
+
+# Account-wide pacers (e.g. one per Telegram bot token), kept while any channel uses them.
+_shared: "WeakValueDictionary[str, Pacer]" = WeakValueDictionary()
+_shared_lock = Lock()
+
+
+def build_pacer(
+    cfg: Any, profile: Optional[Dict[str, Any]], account: Optional[str] = None
+) -> Optional[Pacer]:
+    """Pacer for a channel: its type's profile with the channel's pace config on top."""
+    if cfg is False or cfg is None:
+        return None
+    settings = dict(profile or {})
+    if isinstance(cfg, dict):
+        settings.update(cfg)
+    parent = None
+    shared = settings.get("shared")
+    if shared and account is not None:
+        with _shared_lock:
+            parent = _shared.get(account)
+            if parent is None:
+                parent = Pacer(_limits(shared), max_wait=float("inf"))
+                _shared[account] = parent
+    limits = _limits(settings)
+    if not limits and parent is None:
+        return None
+    return Pacer(limits, parent=parent, max_wait=float(settings.get("max_wait", 1.0)))
+
+
+def _limits(settings: Dict[str, Any]) -> List[Tuple[int, float]]:
+    limits = []
+    for key, seconds in WINDOWS:
+        value = float(settings.get(key) or 0)
+        if value >= 1:
+            limits.append((int(value), seconds))
+        elif value > 0:
+            # Fractional rates, e.g. per_second: 0.5, become one send per 1 / value seconds.
+            limits.append((1, seconds / value))
+    return limits
@@ -1,11 +1,13 @@
 from notify.core.policies.aggregate import AggregatePolicy
 from notify.core.policies.cooldown import CooldownPolicy
 from notify.core.policies.dedupe import DedupePolicy
+from notify.core.policies.pipeline import PolicyPipeline
 from notify.core.policies.rate_limit import RateLimitPolicy
 
 __all__ = [
     "AggregatePolicy",
     "CooldownPolicy",
     "DedupePolicy",
+    "PolicyPipeline",
     "RateLimitPolicy",
 ]
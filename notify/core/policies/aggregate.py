@@ -1,40 +1,108 @@
+import heapq
+import math
 import time
 from dataclasses import dataclass, field
-from typing import Any, Dict, Iterable, List, Optional
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 from notify.core.event import build_event
 from notify.core.policies.base import BasePolicy, PolicyOutcome
-from notify.core.store import MemoryStore
+from notify.core.store import BaseStore
+
+
+# Fixed-size linear-counting bitmap used to estimate distinct keys in bounded mode.
+_SKETCH_BITS = 4096
 
 
 @dataclass
 class _AggregateBucket:
     start_time: float
+    # The window the bucket was opened with; it keeps it across a reload.
+    window: float = 0.0
     counts: Dict[str, int] = field(default_factory=dict)
     samples: List[str] = field(default_factory=list)
+    total: int = 0
+    top_k: Optional[int] = None
+    # Bounded mode only: Space-Saving overestimation per tracked key.
+    errors: Dict[str, int] = field(default_factory=dict)
+    # Bounded mode only: (count, key) per tracked key, a count possibly
+    # stale (lower) since the key was last pushed.
+    heap: List[Tuple[int, str]] = field(default_factory=list)
+    sketch: Optional[bytearray] = None
 
     def add(self, event: Dict[str, Any], max_samples: int) -> None:
         event_key = event.get("event_key", "")
-        self.counts[event_key] = self.counts.get(event_key, 0) + 1
+        self.total += 1
+        if self.top_k is None:
+            self.counts[event_key] = self.counts.get(event_key, 0) + 1
+        else:
+            self._add_bounded(event_key)
         if len(self.samples) < max_samples:
             raw_content = event.get("raw_content")
             sample_content = str(raw_content) if raw_content else event_key
             self.samples.append(f"{event_key}: {sample_content}")
 
+    def _add_bounded(self, event_key: str) -> None:
+        if self.sketch is None:
+            self.sketch = bytearray(_SKETCH_BITS // 8)
+        bit = hash(event_key) % _SKETCH_BITS
+        self.sketch[bit >> 3] |= 1 << (bit & 7)
+
+        counts = self.counts
+        if event_key in counts:
+            counts[event_key] += 1
+        elif len(counts) < self.top_k:
+            counts[event_key] = 1
+            self.errors[event_key] = 0
+            heapq.heappush(self.heap, (1, event_key))
+        else:
+            # Space-Saving: the new key takes over the smallest counter. Heap
+            # entries only lag behind their counts, so a stale top is
+            # refreshed until the top is current, and that is the minimum.
+            heap = self.heap
+            floor, victim = heap[0]
+            while counts[victim] != floor:
+                heapq.heapreplace(heap, (counts[victim], victim))
+                floor, victim = heap[0]
+            del counts[victim]
+            self.errors.pop(victim, None)
+            counts[event_key] = floor + 1
+            self.errors[event_key] = floor
+            heapq.heapreplace(heap, (floor + 1, event_key))
+
+    def distinct_keys(self) -> int:
+        if self.sketch is None:
+            return len(self.counts)
+        zero_bits = _SKETCH_BITS - sum(bin(byte).count("1") for byte in self.sketch)
+        if zero_bits == 0:
+            return max(self.total, len(self.counts))
+        estimate = round(-_SKETCH_BITS * math.log(zero_bits / _SKETCH_BITS))
+        return min(max(estimate, len(self.counts)), self.total)
+
 
 class AggregatePolicy(BasePolicy):
+    name = "aggregate"
+
     def __init__(
         self,
         window: int,
         levels: Optional[Iterable[str]] = None,
         max_samples: int = 5,
+        background: bool = False,
+        top_k: Optional[int] = None,
     ) -> None:
         self.window = window
         self.levels = {level.lower() for level in (levels or [])}
         self.max_samples = max_samples
+        self.background = background
+        self.top_k = top_k if top_k and top_k > 0 else None
         self._buckets: Dict[str, _AggregateBucket] = {}
+        # (window deadline, bucket key); one entry per open bucket.
+        self._deadlines: List[Tuple[float, str]] = []
+        self._lock = Lock()
+        self.on_schedule: Optional[Callable[[float], None]] = None
 
-    def apply(self, event: Dict[str, Any], store: MemoryStore) -> PolicyOutcome:
+    def apply(self, event: Dict[str, Any], store: BaseStore) -> PolicyOutcome:
         meta = event.get("meta") or {}
         if meta.get("aggregate_skip"):
             return PolicyOutcome(action="allow", event=event)
@@ -44,23 +112,64 @@ class AggregatePolicy(BasePolicy):
             return PolicyOutcome(action="allow", event=event)
 
         bucket_key = self._bucket_key(event)
-        bucket = self._buckets.get(bucket_key)
-        if bucket is None:
-            bucket = _AggregateBucket(start_time=time.time())
-            self._buckets[bucket_key] = bucket
-        bucket.add(event, self.max_samples)
+        deadline = None
+        with self._lock:
+            bucket = self._buckets.get(bucket_key)
+            if bucket is None:
+                bucket = _AggregateBucket(
+                    start_time=time.time(), window=self.window, top_k=self.top_k
+                )
+                self._buckets[bucket_key] = bucket
+                deadline = bucket.start_time + bucket.window
+                heapq.heappush(self._deadlines, (deadline, bucket_key))
+            bucket.add(event, self.max_samples)
+        if deadline is not None and self.on_schedule is not None:
+            self.on_schedule(deadline)
         return PolicyOutcome(action="suppress", reason="aggregated")
 
-    def flush(self, store: MemoryStore) -> List[Dict[str, Any]]:
+    def flush(self, store: BaseStore) -> List[Dict[str, Any]]:
         now = time.time()
-        results: List[Dict[str, Any]] = []
-        for key, bucket in list(self._buckets.items()):
-            if now - bucket.start_time < self.window:
-                continue
-            summary = self._build_summary_event(key, bucket)
-            results.append(summary)
-            self._buckets.pop(key, None)
-        return results
+        due = []
+        with self._lock:
+            while self._deadlines and self._deadlines[0][0] <= now:
+                _, key = heapq.heappop(self._deadlines)
+                bucket = self._buckets.pop(key, None)
+                if bucket is not None:
+                    due.append((key, bucket))
+        return [self._build_summary_event(key, bucket) for key, bucket in due]
+
+    def drain(self, store: BaseStore) -> List[Dict[str, Any]]:
+        with self._lock:
+            pending = list(self._buckets.items())
+            self._buckets.clear()
+            self._deadlines.clear()
+        return [self._build_summary_event(key, bucket) for key, bucket in pending]
+
+    def adopt(self, previous: BasePolicy) -> bool:
+        # Buckets remember their own window and top_k, so they carry over
+        # (and are reported as opened) even when either setting changed.
+        if not isinstance(previous, AggregatePolicy):
+            return False
+        with previous._lock:
+            buckets, previous._buckets = previous._buckets, {}
+            previous._deadlines = []
+        with self._lock:
+            for key, bucket in buckets.items():
+                self._buckets[key] = bucket
+                heapq.heappush(self._deadlines, (bucket.start_time + bucket.window, key))
+        return True
+
+    def next_deadline(self) -> Optional[float]:
+        with self._lock:
+            return self._deadlines[0][0] if self._deadlines else None
+
+    def pending(self) -> int:
+        return len(self._buckets)
+
+    def bucket_sizes(self) -> Dict[str, int]:
+        """Events held so far in each open bucket."""
+        with self._lock:
+            return {key: bucket.total for key, bucket in self._buckets.items()}
 
     def _bucket_key(self, event: Dict[str, Any]) -> str:
         source = event.get("source") or "default"
@@ -68,9 +177,28 @@ class AggregatePolicy(BasePolicy):
 
     def _build_summary_event(self, bucket_key: str, bucket: _AggregateBucket) -> Dict[str, Any]:
         level, source = bucket_key.split(":", 1)
-        lines = [f"window={self.window}s", f"source={source}"]
-        for key, count in sorted(bucket.counts.items(), key=lambda x: x[1], reverse=True):
-            lines.append(f"- {key}: {count}")
+        lines = [f"window={bucket.window:g}s", f"source={source}"]
+        ranked = sorted(bucket.counts.items(), key=lambda x: x[1], reverse=True)
+        if bucket.top_k is None:
+            for key, count in ranked:
+                lines.append(f"- {key}: {count}")
+        else:
+            lines.append(f"total={bucket.total}")
+            # Only report counters whose guaranteed part outweighs the
+            # Space-Saving overestimate; the rest fall into the tail.
+            reported = 0
+            shown = 0
+            for key, count in ranked:
+                error = bucket.errors.get(key, 0)
+                if count - error <= error:
+                    continue
+                prefix = "~" if error else ""
+                lines.append(f"- {key}: {prefix}{count}")
+                reported += count
+                shown += 1
+            other_keys = bucket.distinct_keys() - shown
+            if other_keys > 0:
+                lines.append(f"- {other_keys} other keys: ~{max(bucket.total - reported, 0)}")
         if bucket.samples:
             lines.append("samples:")
             lines.extend([f"  {sample}" for sample in bucket.samples])
@@ -81,5 +209,5 @@ class AggregatePolicy(BasePolicy):
             level=level,
             event_key=f"aggregate:{level}:{source}",
             source=source,
-            meta={"aggregate_skip": True, "aggregate_window": self.window},
+            meta={"aggregate_skip": True, "aggregate_window": bucket.window},
         )
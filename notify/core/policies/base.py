@@ -1,10 +1,10 @@
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from notify.core.store import MemoryStore
+from notify.core.store import BaseStore
 
 
-@dataclass
+@dataclass(slots=True)
 class PolicyOutcome:
     action: str
     reason: Optional[str] = None
@@ -12,8 +12,36 @@ class PolicyOutcome:
 
 
 class BasePolicy:
-    def apply(self, event: Dict[str, Any], store: MemoryStore) -> PolicyOutcome:
+    # Label for metrics; the policy's key in the config.
+    name = "base"
+
+    def apply(self, event: Dict[str, Any], store: BaseStore) -> PolicyOutcome:
         return PolicyOutcome(action="allow", event=event)
 
-    def flush(self, store: MemoryStore) -> List[Dict[str, Any]]:
+    def apply_many(self, events: List[Dict[str, Any]], store: BaseStore) -> List[PolicyOutcome]:
+        return [self.apply(event, store) for event in events]
+
+    def flush(self, store: BaseStore) -> List[Dict[str, Any]]:
         return []
+
+    def drain(self, store: BaseStore) -> List[Dict[str, Any]]:
+        return []
+
+    def adopt(self, previous: "BasePolicy") -> bool:
+        """Take over in-process state from the policy this one replaces on reload.
+
+        Called before this policy sees any event. State kept in the store
+        carries over by itself; returns False when there is nothing to take.
+        """
+        return False
+
+    def store_keys(self, event: Dict[str, Any]) -> Tuple[str, ...]:
+        return ()
+
+    def suppress_window(self) -> Optional[Tuple[float, str]]:
+        """(seconds, reason) an event key is suppressed for once this policy allowed it.
+
+        None when repeats are not guaranteed to be suppressed (or have side
+        effects) for a fixed time.
+        """
+        return None
@@ -1,21 +1,42 @@
-from typing import Any, Dict, Iterable, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from notify.core.policies.base import BasePolicy, PolicyOutcome
-from notify.core.store import MemoryStore
+from notify.core.store import BaseStore
 
 
 class CooldownPolicy(BasePolicy):
+    name = "cooldown"
+
     def __init__(self, ttl: int, levels: Optional[Iterable[str]] = None) -> None:
         self.ttl = ttl
         self.levels = {level.lower() for level in (levels or [])}
 
-    def apply(self, event: Dict[str, Any], store: MemoryStore) -> PolicyOutcome:
+    def apply(self, event: Dict[str, Any], store: BaseStore) -> PolicyOutcome:
         level = event.get("level", "")
         if self.levels and level not in self.levels:
             return PolicyOutcome(action="allow", event=event)
 
-        key = f"cooldown:{event.get('event_key', '')}"
-        if store.is_active(key):
+        if store.check_and_set(self._key(event), self.ttl):
             return PolicyOutcome(action="suppress", reason="cooldown")
-
-        store.set_expiry(key, self.ttl)
         return PolicyOutcome(action="allow", event=event)
+
+    def apply_many(self, events: List[Dict[str, Any]], store: BaseStore) -> List[PolicyOutcome]:
+        outcomes = [PolicyOutcome(action="allow", event=event) for event in events]
+        indexes = [
+            index
+            for index, event in enumerate(events)
+            if not self.levels or event.get("level", "") in self.levels
+        ]
+        keys = [self._key(events[index]) for index in indexes]
+        for index, active in zip(indexes, store.check_and_set_many(keys, self.ttl)):
+            if active:
+                outcomes[index] = PolicyOutcome(action="suppress", reason="cooldown")
+        return outcomes
+
+    def store_keys(self, event: Dict[str, Any]) -> Tuple[str, ...]:
+        return (self._key(event),)
+
+    def suppress_window(self) -> Optional[Tuple[float, str]]:
+        return self.ttl, "cooldown"
+
+    def _key(self, event: Dict[str, Any]) -> str:
+        return f"cooldown:{event.get('event_key', '')}"
@@ -1,9 +1,11 @@
-from typing import Any, Dict, Iterable, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from notify.core.policies.base import BasePolicy, PolicyOutcome
-from notify.core.store import MemoryStore
+from notify.core.store import BaseStore
 
 
 class DedupePolicy(BasePolicy):
+    name = "dedupe"
+
     def __init__(
         self,
         ttl: int,
@@ -14,24 +16,42 @@ class DedupePolicy(BasePolicy):
         self.levels = {level.lower() for level in (levels or [])}
         self.upgrade_after = upgrade_after
 
-    def apply(self, event: Dict[str, Any], store: MemoryStore) -> PolicyOutcome:
+    def apply(self, event: Dict[str, Any], store: BaseStore) -> PolicyOutcome:
         level = event.get("level", "")
         if self.levels and level not in self.levels:
             return PolicyOutcome(action="allow", event=event)
 
-        event_key = event.get("event_key", "")
-        key = f"dedupe:{event_key}"
-        suppress_key = f"suppress:{event_key}"
+        key, counter_key = self.store_keys(event)
+        count = store.check_and_count(key, counter_key, self.ttl, self.upgrade_after)
+        return self._outcome(event, count)
+
+    def apply_many(self, events: List[Dict[str, Any]], store: BaseStore) -> List[PolicyOutcome]:
+        outcomes = [PolicyOutcome(action="allow", event=event) for event in events]
+        indexes = [
+            index
+            for index, event in enumerate(events)
+            if not self.levels or event.get("level", "") in self.levels
+        ]
+        keys = [self.store_keys(events[index]) for index in indexes]
+        counts = store.check_and_count_many(keys, self.ttl, self.upgrade_after)
+        for index, count in zip(indexes, counts):
+            outcomes[index] = self._outcome(events[index], count)
+        return outcomes
 
-        if store.is_active(key):
-            suppressed_count = store.increment(suppress_key, ttl=self.ttl)
-            if self.upgrade_after and suppressed_count >= self.upgrade_after:
-                store.reset(suppress_key)
-                store.set_expiry(key, self.ttl)
-                return PolicyOutcome(action="allow", event=event)
+    def store_keys(self, event: Dict[str, Any]) -> Tuple[str, ...]:
+        event_key = event.get("event_key", "")
+        return f"dedupe:{event_key}", f"suppress:{event_key}"
 
-            return PolicyOutcome(action="suppress", reason="deduped")
+    def suppress_window(self) -> Optional[Tuple[float, str]]:
+        # With upgrade_after every repeat is counted, so none may be skipped.
+        if self.upgrade_after:
+            return None
+        return self.ttl, "deduped"
 
-        store.set_expiry(key, self.ttl)
-        store.reset(suppress_key)
-        return PolicyOutcome(action="allow", event=event)
+    def _outcome(self, event: Dict[str, Any], count: int) -> PolicyOutcome:
+        # count == 0: first sighting; otherwise how many repeats were suppressed.
+        if count == 0:
+            return PolicyOutcome(action="allow", event=event)
+        if self.upgrade_after and count >= self.upgrade_after:
+            return PolicyOutcome(action="allow", event=event)
+        return PolicyOutcome(action="suppress", reason="deduped")
@@ -0,0 +1,200 @@
+import time
+from contextlib import nullcontext
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from notify.core.event import VALID_LEVELS
+from notify.core.hooks import HookContext, Hooks
+from notify.core.metrics import Histogram, MetricsRegistry
+from notify.core.policies.base import BasePolicy, PolicyOutcome
+from notify.core.store import BaseStore
+
+
+class PolicyPipeline:
+    """Policies compiled once for the per-event hot path.
+
+    Keeps, per level, only the policies that apply to it, calls flush only on
+    policies that implement it, runs each event's decisions inside a single
+    store transaction, and remembers event keys that a leading cooldown/dedupe
+    policy is known to suppress so repeat storms skip the store entirely.
+    """
+
+    def __init__(
+        self,
+        policies: Iterable[BasePolicy],
+        store: BaseStore,
+        hold_size: int = 4096,
+        metrics: Optional[MetricsRegistry] = None,
+        hooks: Optional[Hooks] = None,
+    ) -> None:
+        self.policies = list(policies)
+        self.store = store
+        self.hooks = hooks
+        self._apply_seconds: Optional[Histogram] = None
+        if metrics is not None:
+            self._apply_seconds = metrics.histogram(
+                "policy_apply_seconds", "Time spent in a policy's apply(), per event.", ("policy",)
+            )
+        self.flushers = [
+            policy
+            for policy in self.policies
+            if type(policy).flush is not BasePolicy.flush and not getattr(policy, "background", False)
+        ]
+        self._chains: Dict[str, Tuple[BasePolicy, ...]] = {
+            level: tuple(policy for policy in self.policies if _applies(policy, level))
+            for level in VALID_LEVELS
+        }
+        self._windows: Dict[str, Optional[Tuple[float, str]]] = {
+            level: chain[0].suppress_window() if chain else None
+            for level, chain in self._chains.items()
+        }
+        # Stores that lock per key need the keys up front, and only when more
+        # than one policy touches the store; a single compound call is atomic.
+        self._keyed = type(store).transaction_for is not BaseStore.transaction_for
+        self._shared: Dict[str, bool] = {
+            level: sum(type(policy).store_keys is not BasePolicy.store_keys for policy in chain) > 1
+            for level, chain in self._chains.items()
+        }
+        # (level, event_key) -> (deadline, reason)
+        self._held: Dict[Tuple[str, str], Tuple[float, str]] = {}
+        self.hold_size = hold_size
+
+    def flush(self) -> List[Dict[str, Any]]:
+        flush_events: List[Dict[str, Any]] = []
+        for policy in self.flushers:
+            flush_events.extend(policy.flush(self.store))
+        return flush_events
+
+    def apply(self, event: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[str]]:
+        """Return (outcome_event, None) when allowed, or (event, reason) when suppressed."""
+        level = event.get("level", "")
+        chain = self._chains.get(level)
+        if not chain:
+            return event, None
+
+        now = time.time()
+        window = self._windows[level]
+        hold_key = None
+        if window is not None:
+            hold_key = (level, event.get("event_key", ""))
+            held = self._held.get(hold_key)
+            if held is not None:
+                if held[0] > now:
+                    decided = self.hooks.policy_decision if self.hooks is not None else None
+                    if decided is not None:
+                        # Held by the leading policy without asking it again.
+                        outcome = PolicyOutcome("suppress", held[1])
+                        self._decided(decided, chain[0], event, outcome, 0.0)
+                    return event, held[1]
+                self._held.pop(hold_key, None)
+
+        decided = self.hooks.policy_decision if self.hooks is not None else None
+        # Hooks run once the transaction is over, never while it holds the store.
+        decisions: Optional[List[Tuple[Any, ...]]] = [] if decided is not None else None
+        with self._transaction(level, chain, event):
+            result = self._apply_chain(chain, event, now, window, hold_key, decisions)
+        if decisions:
+            for decision in decisions:
+                self._decided(decided, *decision)
+        return result
+
+    def apply_many(self, events: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], Optional[str]]]:
+        # Policy by policy over the whole batch, so stores can pipeline each stage.
+        outcomes: List[Tuple[Dict[str, Any], Optional[str]]] = [(event, None) for event in events]
+        alive = list(range(len(events)))
+        decided = self.hooks.policy_decision if self.hooks is not None else None
+        decisions: List[Tuple[Any, ...]] = []
+        with self.store.transaction():
+            for policy in self.policies:
+                if not alive:
+                    break
+                start = time.perf_counter()
+                batch = policy.apply_many([outcomes[index][0] for index in alive], self.store)
+                elapsed = (time.perf_counter() - start) / len(alive)
+                if self._apply_seconds is not None:
+                    self._apply_seconds.observe(elapsed, policy.name, count=len(alive))
+                remaining = []
+                for index, outcome in zip(alive, batch):
+                    if decided is not None:
+                        decisions.append((policy, outcomes[index][0], outcome, elapsed, start))
+                    if outcome.action == "suppress":
+                        outcomes[index] = (outcomes[index][0], outcome.reason)
+                    else:
+                        outcomes[index] = (outcome.event or outcomes[index][0], None)
+                        remaining.append(index)
+                alive = remaining
+        for decision in decisions:
+            self._decided(decided, *decision)
+        return outcomes
+
+    def _apply_chain(
+        self,
+        chain: Tuple[BasePolicy, ...],
+        event: Dict[str, Any],
+        now: float,
+        window: Optional[Tuple[float, str]],
+        hold_key: Optional[Tuple[str, str]],
+        decisions: Optional[List[Tuple[Any, ...]]],
+    ) -> Tuple[Dict[str, Any], Optional[str]]:
+        timer = self._apply_seconds
+        outcome_event = event
+        for policy in chain:
+            if timer is None and decisions is None:
+                outcome = policy.apply(outcome_event, self.store)
+            else:
+                start = time.perf_counter()
+                outcome = policy.apply(outcome_event, self.store)
+                elapsed = time.perf_counter() - start
+                if timer is not None:
+                    timer.observe(elapsed, policy.name)
+                if decisions is not None:
+                    decisions.append((policy, outcome_event, outcome, elapsed, start))
+            if policy is chain[0] and window is not None and outcome.action == "allow":
+                # The leading policy just set its marker: repeats are
+                # suppressed until it expires, whatever happens next.
+                self._hold(hold_key, now + window[0], window[1])
+            if outcome.action == "suppress":
+                return outcome_event, outcome.reason
+            outcome_event = outcome.event or outcome_event
+        return outcome_event, None
+
+    def _decided(
+        self,
+        hooks: Tuple[Any, ...],
+        policy: BasePolicy,
+        event: Dict[str, Any],
+        outcome: PolicyOutcome,
+        elapsed: float,
+        started: Optional[float] = None,
+    ) -> None:
+        context = HookContext("policy_decision", event, started)
+        context.policy = policy.name
+        context.action = outcome.action
+        context.reason = outcome.reason
+        context.elapsed = elapsed
+        self.hooks.fire(hooks, context)
+
+    def _transaction(self, level: str, chain: Tuple[BasePolicy, ...], event: Dict[str, Any]):
+        if not self._keyed:
+            return self.store.transaction()
+        if not self._shared[level]:
+            return nullcontext()
+        keys: List[str] = []
+        for policy in chain:
+            keys.extend(policy.store_keys(event))
+        return self.store.transaction_for(*keys)
+
+    def _hold(self, hold_key: Tuple[str, str], deadline: float, reason: str) -> None:
+        held = self._held
+        if len(held) >= self.hold_size:
+            now = time.time()
+            for key, (until, _) in list(held.items()):
+                if until <= now:
+                    held.pop(key, None)
+            if len(held) >= self.hold_size:
+                held.clear()
+        held[hold_key] = (deadline, reason)
+
+
+def _applies(policy: BasePolicy, level: str) -> bool:
+    levels = getattr(policy, "levels", None)
+    return not levels or level in levels
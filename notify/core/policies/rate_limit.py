@@ -1,35 +1,154 @@
+import math
 import time
-from typing import Any, Dict, Iterable, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from notify.core.policies.base import BasePolicy, PolicyOutcome
-from notify.core.store import MemoryStore
+from notify.core.store import BaseStore
+
+
+ALGORITHMS = {"fixed_window", "gcra", "token_bucket", "sliding_window"}
 
 
 class RateLimitPolicy(BasePolicy):
+    name = "rate_limit"
+
     def __init__(
         self,
         per_minute: int,
         levels: Optional[Iterable[str]] = None,
         scope: str = "global",
+        algorithm: str = "fixed_window",
+        per_second: Optional[float] = None,
+        burst: Optional[int] = None,
     ) -> None:
+        algorithm = (algorithm or "fixed_window").lower()
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"invalid rate_limit algorithm: {algorithm}")
         self.per_minute = per_minute
         self.levels = {level.lower() for level in (levels or [])}
         self.scope = scope
+        self.algorithm = algorithm
+        # Allowed events per second and how many may arrive back to back.
+        self.rate = float(per_second) if per_second else per_minute / 60.0
+        if self.rate <= 0:
+            raise ValueError("rate_limit rate must be > 0")
+        self.burst = max(int(burst or 1), 1)
+        self._step = _STEPS.get(algorithm)
+        self._state_ttl = self._compute_state_ttl()
 
-    def apply(self, event: Dict[str, Any], store: MemoryStore) -> PolicyOutcome:
+    def apply(self, event: Dict[str, Any], store: BaseStore) -> PolicyOutcome:
         level = event.get("level", "")
         if self.levels and level not in self.levels:
             return PolicyOutcome(action="allow", event=event)
 
-        minute_bucket = int(time.time() // 60)
-        if self.scope == "event_key":
-            key = f"rate:{event.get('event_key', '')}:{minute_bucket}"
-        elif self.scope == "level":
-            key = f"rate:{level}:{minute_bucket}"
+        if self._step is not None:
+            allowed = store.rate_limit(
+                self._scope_key(event),
+                self.algorithm,
+                self.rate,
+                self.burst,
+                self._state_ttl,
+                self._decide,
+            )
         else:
-            key = f"rate:global:{minute_bucket}"
-
-        count = store.increment(key, ttl=120)
-        if count > self.per_minute:
+            count = store.increment(self._key(event, int(time.time() // 60)), ttl=120)
+            allowed = count <= self.per_minute
+        if not allowed:
             return PolicyOutcome(action="suppress", reason="rate_limited")
 
         return PolicyOutcome(action="allow", event=event)
+
+    def apply_many(self, events: List[Dict[str, Any]], store: BaseStore) -> List[PolicyOutcome]:
+        outcomes = [PolicyOutcome(action="allow", event=event) for event in events]
+        indexes = [
+            index
+            for index, event in enumerate(events)
+            if not self.levels or event.get("level", "") in self.levels
+        ]
+        if self._step is not None:
+            keys = [self._scope_key(events[index]) for index in indexes]
+            allowed = store.rate_limit_many(
+                keys, self.algorithm, self.rate, self.burst, self._state_ttl, self._decide
+            )
+            for index, ok in zip(indexes, allowed):
+                if not ok:
+                    outcomes[index] = PolicyOutcome(action="suppress", reason="rate_limited")
+            return outcomes
+        minute_bucket = int(time.time() // 60)
+        keys = [self._key(events[index], minute_bucket) for index in indexes]
+        for index, count in zip(indexes, store.increment_many(keys, ttl=120)):
+            if count > self.per_minute:
+                outcomes[index] = PolicyOutcome(action="suppress", reason="rate_limited")
+        return outcomes
+
+    def store_keys(self, event: Dict[str, Any]) -> Tuple[str, ...]:
+        if self._step is not None:
+            return (self._scope_key(event),)
+        return (self._key(event, int(time.time() // 60)),)
+
+    def _decide(self, state: Any, now: float) -> Tuple[Any, bool]:
+        return self._step(self, state, now)
+
+    def _compute_state_ttl(self) -> float:
+        # Once this long has passed without events the state equals "no state".
+        if self.algorithm == "sliding_window":
+            return 120.0
+        return math.ceil(self.burst / self.rate) + 1.0
+
+    def _scope_key(self, event: Dict[str, Any]) -> str:
+        if self.scope == "event_key":
+            return f"rate:{self.algorithm}:{event.get('event_key', '')}"
+        if self.scope == "level":
+            return f"rate:{self.algorithm}:{event.get('level', '')}"
+        return f"rate:{self.algorithm}:global"
+
+    def _key(self, event: Dict[str, Any], minute_bucket: int) -> str:
+        if self.scope == "event_key":
+            return f"rate:{event.get('event_key', '')}:{minute_bucket}"
+        if self.scope == "level":
+            return f"rate:{event.get('level', '')}:{minute_bucket}"
+        return f"rate:global:{minute_bucket}"
+
+
+def _gcra(policy: RateLimitPolicy, tat: Optional[float], now: float) -> Tuple[Any, bool]:
+    # State: theoretical arrival time of the next conforming event.
+    interval = 1.0 / policy.rate
+    tat = now if tat is None else max(tat, now)
+    if tat - now > interval * (policy.burst - 1):
+        return tat, False
+    return tat + interval, True
+
+
+def _token_bucket(policy: RateLimitPolicy, state: Optional[List[float]], now: float) -> Tuple[Any, bool]:
+    # State: [tokens, last_refill].
+    if state is None:
+        tokens = float(policy.burst)
+    else:
+        tokens = min(float(policy.burst), state[0] + (now - state[1]) * policy.rate)
+    if tokens < 1.0:
+        return [tokens, now], False
+    return [tokens - 1.0, now], True
+
+
+def _sliding_window(policy: RateLimitPolicy, state: Optional[List[float]], now: float) -> Tuple[Any, bool]:
+    # State: [window_start, previous_count, current_count] over 60s windows;
+    # the previous window is weighted by how much of it still overlaps.
+    window_start = now - now % 60.0
+    if state is None or state[0] <= window_start - 120.0:
+        previous, current = 0.0, 0.0
+    elif state[0] < window_start:
+        previous = state[2] if state[0] == window_start - 60.0 else 0.0
+        current = 0.0
+    else:
+        previous, current = state[1], state[2]
+    limit = max(policy.rate * 60.0, float(policy.burst))
+    estimate = previous * (1.0 - (now - window_start) / 60.0) + current
+    if estimate + 1.0 > limit:
+        return [window_start, previous, current], False
+    return [window_start, previous, current + 1.0], True
+
+
+_STEPS = {
+    "gcra": _gcra,
+    "token_bucket": _token_bucket,
+    "sliding_window": _sliding_window,
+}
@@ -1,17 +1,67 @@
-from typing import Dict, Type
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Dict, Optional, Type
 
-from notify.channels.base import BaseNotifier
+if TYPE_CHECKING:
+    from notify.channels.base import BaseNotifier
+
+
+# Third-party channels register under this group, e.g. in pyproject.toml:
+#   [project.entry-points."notify_hub.channels"]
+#   slack = "notify_slack:SlackNotifier"
+ENTRY_POINT_GROUP = "notify_hub.channels"
+
+_BUILTIN_CHANNELS = {
+    "telegram": "notify.channels.telegram:TelegramNotifier",
+    "wecom": "notify.channels.wecom:WeComNotifier",
+    "feishu": "notify.channels.feishu:FeishuNotifier",
+    "bark": "notify.channels.bark:BarkNotifier",
+    "email": "notify.channels.email:EmailNotifier",
+}
 
 
 class NotifierRegistry:
-    _registry: Dict[str, Type[BaseNotifier]] = {}
+    _registry: Dict[str, Type["BaseNotifier"]] = {}
+    # name -> "module:Class", imported the first time the type is created.
+    _lazy: Dict[str, str] = dict(_BUILTIN_CHANNELS)
+    _entry_points: Optional[Dict[str, Any]] = None
 
     @classmethod
-    def register(cls, name: str, notifier_cls: Type[BaseNotifier]) -> None:
+    def register(cls, name: str, notifier_cls: Type["BaseNotifier"]) -> None:
         cls._registry[name] = notifier_cls
 
     @classmethod
-    def create(cls, name: str, **kwargs) -> BaseNotifier:
-        if name not in cls._registry:
-            raise ValueError(f"unknown notifier type: {name}")
-        return cls._registry[name](**kwargs)
+    def register_lazy(cls, name: str, target: str) -> None:
+        cls._registry.pop(name, None)
+        cls._lazy[name] = target
+
+    @classmethod
+    def get(cls, name: str) -> Type["BaseNotifier"]:
+        notifier_cls = cls._registry.get(name)
+        if notifier_cls is not None:
+            return notifier_cls
+        target = cls._lazy.get(name)
+        if target is not None:
+            module_name, _, attr = target.partition(":")
+            notifier_cls = getattr(import_module(module_name), attr)
+        else:
+            entry_point = cls._load_entry_points().get(name)
+            if entry_point is None:
+                raise ValueError(f"unknown notifier type: {name}")
+            notifier_cls = entry_point.load()
+        cls._registry[name] = notifier_cls
+        return notifier_cls
+
+    @classmethod
+    def create(cls, name: str, /, **kwargs) -> "BaseNotifier":
+        return cls.get(name)(**kwargs)
+
+    @classmethod
+    def _load_entry_points(cls) -> Dict[str, Any]:
+        # Only consulted for names that are neither registered nor built in.
+        if cls._entry_points is None:
+            from importlib.metadata import entry_points
+
+            cls._entry_points = {
+                entry_point.name: entry_point for entry_point in entry_points(group=ENTRY_POINT_GROUP)
+            }
+        return cls._entry_points
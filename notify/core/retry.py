@@ -0,0 +1,208 @@
+import heapq
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+from threading import Condition, Thread
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from notify.core.models import ChannelResult
+from notify.core.pacer import PacedOut
+
+_Done = Callable[[ChannelResult], None]
+
+
+class RetryPolicy:
+    """Capped exponential backoff with jitter for one channel.
+
+    After failed attempt n (the first send is attempt 1) the next one waits
+    between half and all of min(max_delay, base_delay * 2 ** (n - 1)) seconds,
+    or longer when the provider asked for it with retry_after. Providers that
+    ask for more than max_retry_after are given up on.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        max_retry_after: float = 300.0,
+    ) -> None:
+        if max_attempts < 1:
+            raise ValueError("retry max_attempts must be >= 1")
+        if base_delay < 0 or max_delay < base_delay:
+            raise ValueError("retry delays must satisfy 0 <= base_delay <= max_delay")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+
+    def next_delay(self, attempt: int, result: ChannelResult) -> Optional[float]:
+        """Seconds to wait after failed attempt, or None to give up."""
+        if result.success or not result.retryable or attempt >= self.max_attempts:
+            return None
+        backoff = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        delay = backoff / 2 + random.uniform(0, backoff / 2)
+        if result.retry_after is not None:
+            if result.retry_after > self.max_retry_after:
+                return None
+            delay = max(delay, result.retry_after)
+        return delay
+
+
+class RetryScheduler:
+    """Re-delivers failed sends to the channel that failed, off the caller's thread.
+
+    Due retries are handed to a small worker pool so one slow channel does not
+    hold up the others. At most max_pending retries wait at once; further
+    ones are dropped. Retries still pending on close() are dropped too, and
+    their on_done callbacks never run.
+    """
+
+    def __init__(self, workers: int = 2, max_pending: int = 10000) -> None:
+        self.workers = max(int(workers), 1)
+        self.max_pending = max(int(max_pending), 1)
+        self.scheduled = 0
+        self.retried = 0
+        self.recovered = 0
+        self.exhausted = 0
+        self.dropped = 0
+        # (due, seq, channel, event, attempt, on_done)
+        self._heap: List[Tuple[float, int, Any, Dict[str, Any], int, Optional[_Done]]] = []
+        self._seq = count()
+        self._cond = Condition()
+        self._closed = False
+        self._thread: Optional[Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def schedule(
+        self,
+        channel: Any,
+        event: Dict[str, Any],
+        result: ChannelResult,
+        attempt: int = 1,
+        on_done: Optional[_Done] = None,
+    ) -> Optional[float]:
+        """Queue the next attempt after a failed one; returns its delay, or None if not retried.
+
+        on_done(result) runs once a retry succeeds or the channel gives up.
+        A send the pacer refused is queued for its slot whatever the retry
+        policy, and does not use up an attempt.
+        """
+        if isinstance(result, PacedOut):
+            delay = result.retry_after or 0.0
+            return delay if self.submit(channel, event, delay, attempt, on_done) else None
+        policy = getattr(channel, "retry_policy", None)
+        delay = policy.next_delay(attempt, result) if policy is not None else None
+        if delay is None:
+            return None
+        return delay if self.submit(channel, event, delay, attempt + 1, on_done) else None
+
+    def submit(
+        self,
+        channel: Any,
+        event: Dict[str, Any],
+        delay: float = 0.0,
+        attempt: int = 1,
+        on_done: Optional[_Done] = None,
+    ) -> bool:
+        """Deliver event to channel after delay, retrying it per the channel's policy."""
+        with self._cond:
+            if self._closed or len(self._heap) >= self.max_pending:
+                self.dropped += 1
+                return False
+            if self._thread is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="notify-retry"
+                )
+                self._thread = Thread(target=self._run, name="notify-retry-scheduler", daemon=True)
+                self._thread.start()
+            heapq.heappush(
+                self._heap,
+                (time.monotonic() + delay, next(self._seq), channel, event, attempt, on_done),
+            )
+            self.scheduled += 1
+            self._cond.notify()
+        return True
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._heap)
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {
+                "pending": len(self._heap),
+                "scheduled": self.scheduled,
+                "retried": self.retried,
+                "recovered": self.recovered,
+                "exhausted": self.exhausted,
+                "dropped": self.dropped,
+            }
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self.dropped += len(self._heap)
+            self._heap.clear()
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed:
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    timeout = self._heap[0][0] - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    self._cond.wait(timeout)
+                if self._closed:
+                    return
+                _, _, channel, event, attempt, on_done = heapq.heappop(self._heap)
+            self._executor.submit(self._attempt, channel, event, attempt, on_done)
+
+    def _attempt(
+        self, channel: Any, event: Dict[str, Any], attempt: int, on_done: Optional[_Done]
+    ) -> None:
+        try:
+            result = channel.deliver(event)
+        except Exception as exc:
+            result = ChannelResult(False, f"retry failed: {type(exc).__name__}")
+        with self._cond:
+            self.retried += 1
+        if result.success:
+            with self._cond:
+                self.recovered += 1
+        elif self.schedule(channel, event, result, attempt, on_done) is not None:
+            return
+        elif self._closed and result.retryable:
+            return
+        else:
+            with self._cond:
+                self.exhausted += 1
+        if on_done is not None:
+            on_done(result)
+
+
+def build_retry_policy(cfg: Any, profile: Optional[Dict[str, Any]] = None) -> Optional[RetryPolicy]:
+    """Retry policy for a channel: its type's profile with the channel's retry config on top.
+
+    Channel types without a profile only retry when retry is set explicitly.
+    """
+    if cfg is False or cfg is None:
+        return None
+    if profile is None and not cfg:
+        return None
+    cfg = dict(profile or {}, **(cfg if isinstance(cfg, dict) else {}))
+    return RetryPolicy(
+        max_attempts=int(cfg.get("max_attempts", 3)),
+        base_delay=float(cfg.get("base_delay", 1.0)),
+        max_delay=float(cfg.get("max_delay", 60.0)),
+        max_retry_after=float(cfg.get("max_retry_after", 300.0)),
+    )
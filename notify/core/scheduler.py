@@ -0,0 +1,70 @@
+import time
+from threading import Condition, Thread
+from typing import Any, Callable, Dict, List, Optional
+
+from notify.core.store import BaseStore
+
+
+class AggregateFlusher:
+    """Emits aggregate digests when their window closes, not on the next send."""
+
+    def __init__(
+        self,
+        policies: List,
+        store: BaseStore,
+        dispatch: Callable[[Dict[str, Any]], Any],
+    ) -> None:
+        self.policies = list(policies)
+        self.store = store
+        self.dispatch = dispatch
+        self.flushed = 0
+        self.errors = 0
+        self._cond = Condition()
+        self._closed = False
+        self._thread: Optional[Thread] = None
+        for policy in self.policies:
+            policy.on_schedule = self._wake
+
+    def start(self) -> None:
+        self._thread = Thread(target=self._run, name="notify-aggregate-flusher", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+        for policy in self.policies:
+            policy.on_schedule = None
+
+    def _wake(self, deadline: float) -> None:
+        with self._cond:
+            self._cond.notify()
+
+    def _next_deadline(self) -> Optional[float]:
+        deadlines = [policy.next_deadline() for policy in self.policies]
+        deadlines = [deadline for deadline in deadlines if deadline is not None]
+        return min(deadlines) if deadlines else None
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed:
+                    deadline = self._next_deadline()
+                    if deadline is None:
+                        self._cond.wait()
+                        continue
+                    timeout = deadline - time.time()
+                    if timeout <= 0:
+                        break
+                    self._cond.wait(timeout)
+                if self._closed:
+                    return
+            for policy in self.policies:
+                for event in policy.flush(self.store):
+                    try:
+                        self.dispatch(event)
+                        self.flushed += 1
+                    except Exception:
+                        self.errors += 1
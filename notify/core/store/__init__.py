@@ -0,0 +1,29 @@
+from importlib import import_module
+from typing import Any
+
+from notify.core.store.base import BaseStore
+from notify.core.store.memory import MemoryStore
+from notify.core.store.sharded import ShardedMemoryStore
+
+# Stores backed by optional or heavy modules load on first access.
+_LAZY = {
+    "RedisStore": "notify.core.store.redis",
+    "SqliteStore": "notify.core.store.sqlite",
+}
+
+__all__ = [
+    "BaseStore",
+    "MemoryStore",
+    "RedisStore",
+    "ShardedMemoryStore",
+    "SqliteStore",
+]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
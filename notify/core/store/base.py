@@ -0,0 +1,109 @@
+from contextlib import nullcontext
+from typing import Any, Callable, ContextManager, List, Optional, Sequence, Tuple
+
+
+class BaseStore:
+    def is_active(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def set_expiry(self, key: str, ttl: int) -> None:
+        raise NotImplementedError
+
+    def increment(self, key: str, ttl: int) -> int:
+        raise NotImplementedError
+
+    def get_count(self, key: str) -> int:
+        raise NotImplementedError
+
+    def reset(self, key: str) -> None:
+        raise NotImplementedError
+
+    def update(self, key: str, func: Callable[[Any, float], Tuple[Any, Any]], ttl: float) -> Any:
+        """Atomically replace the state stored under key.
+
+        func(state, now) returns (new_state, result); state is None when the
+        key is missing or expired, and a new_state of None deletes it.
+        """
+        raise NotImplementedError
+
+    def transaction(self) -> ContextManager:
+        return nullcontext()
+
+    def transaction_for(self, *keys: str) -> ContextManager:
+        """Like transaction(), but only needs to cover the given keys."""
+        return self.transaction()
+
+    def close(self) -> None:
+        pass
+
+    # Compound decisions. Stores that can run them server-side (RedisStore)
+    # override these so each policy decision is a single round trip.
+
+    def check_and_set(self, key: str, ttl: int) -> bool:
+        with self.transaction_for(key):
+            if self.is_active(key):
+                return True
+            self.set_expiry(key, ttl)
+            return False
+
+    def check_and_count(
+        self, key: str, counter_key: str, ttl: int, reset_after: Optional[int] = None
+    ) -> int:
+        with self.transaction_for(key, counter_key):
+            if not self.is_active(key):
+                self.set_expiry(key, ttl)
+                self.reset(counter_key)
+                return 0
+            count = self.increment(counter_key, ttl)
+            if reset_after and count >= reset_after:
+                self.reset(counter_key)
+                self.set_expiry(key, ttl)
+            return count
+
+    def check_and_set_many(self, keys: Sequence[str], ttl: int) -> List[bool]:
+        with self.transaction():
+            return [self.check_and_set(key, ttl) for key in keys]
+
+    def check_and_count_many(
+        self,
+        keys: Sequence[Tuple[str, str]],
+        ttl: int,
+        reset_after: Optional[int] = None,
+    ) -> List[int]:
+        with self.transaction():
+            return [
+                self.check_and_count(key, counter_key, ttl, reset_after)
+                for key, counter_key in keys
+            ]
+
+    def increment_many(self, keys: Sequence[str], ttl: int) -> List[int]:
+        with self.transaction():
+            return [self.increment(key, ttl) for key in keys]
+
+    def rate_limit(
+        self,
+        key: str,
+        algorithm: str,
+        rate: float,
+        burst: int,
+        ttl: float,
+        decide: Callable[[Any, float], Tuple[Any, bool]],
+    ) -> bool:
+        """Whether one more event under key fits algorithm's limit.
+
+        decide is the algorithm's update() step; stores that implement the
+        algorithm natively may ignore it.
+        """
+        return self.update(key, decide, ttl)
+
+    def rate_limit_many(
+        self,
+        keys: Sequence[str],
+        algorithm: str,
+        rate: float,
+        burst: int,
+        ttl: float,
+        decide: Callable[[Any, float], Tuple[Any, bool]],
+    ) -> List[bool]:
+        with self.transaction():
+            return [self.rate_limit(key, algorithm, rate, burst, ttl, decide) for key in keys]
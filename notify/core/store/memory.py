@@ -0,0 +1,128 @@
+import heapq
+import time
+from threading import RLock
+from typing import Any, Callable, ContextManager, Dict, List, Optional, Set, Tuple
+
+from notify.core.store.base import BaseStore
+
+
+_EXPIRY = 0
+_COUNTER = 1
+_VALUE = 2
+
+
+class MemoryStore(BaseStore):
+    def __init__(self) -> None:
+        self._expiry: Dict[str, float] = {}
+        self._counters: Dict[str, Tuple[int, float]] = {}
+        self._values: Dict[str, Tuple[Any, float]] = {}
+        self._lock = RLock()
+        # Min-heap of (deadline, kind, key) with at most one entry per key and
+        # kind; _expire_due reclaims a bounded number of entries per call.
+        self._deadlines: List[Tuple[float, int, str]] = []
+        self._scheduled: Tuple[Set[str], ...] = (set(), set(), set())
+        self._tables = (self._expiry, self._counters, self._values)
+        self._expire_batch = 8
+
+    def transaction(self) -> ContextManager:
+        # Holding the (re-entrant) lock makes a batch of calls atomic.
+        return self._lock
+
+    def _is_expired(self, expiry: float, now: Optional[float] = None) -> bool:
+        return expiry <= (now if now is not None else time.time())
+
+    def _schedule(self, kind: int, key: str, deadline: float) -> None:
+        scheduled = self._scheduled[kind]
+        if key in scheduled:
+            return
+        scheduled.add(key)
+        heapq.heappush(self._deadlines, (deadline, kind, key))
+
+    def _expire_due(self, now: float) -> None:
+        deadlines = self._deadlines
+        for _ in range(self._expire_batch):
+            if not deadlines or deadlines[0][0] > now:
+                return
+            _, kind, key = heapq.heappop(deadlines)
+            self._scheduled[kind].discard(key)
+            table = self._tables[kind]
+            entry = table.get(key)
+            if entry is None:
+                continue
+            expiry = entry if kind == _EXPIRY else entry[1]
+            if self._is_expired(expiry, now):
+                del table[key]
+            else:
+                # Extended since it was scheduled: requeue at the real deadline.
+                self._schedule(kind, key, expiry)
+
+    def is_active(self, key: str) -> bool:
+        with self._lock:
+            now = time.time()
+            self._expire_due(now)
+            expiry = self._expiry.get(key)
+            if expiry is None:
+                return False
+            if self._is_expired(expiry, now):
+                self._expiry.pop(key, None)
+                return False
+            return True
+
+    def set_expiry(self, key: str, ttl: int) -> None:
+        with self._lock:
+            now = time.time()
+            self._expire_due(now)
+            self._expiry[key] = now + ttl
+            self._schedule(_EXPIRY, key, now + ttl)
+
+    def increment(self, key: str, ttl: int) -> int:
+        with self._lock:
+            now = time.time()
+            self._expire_due(now)
+            count, expiry = self._counters.get(key, (0, 0))
+            if expiry and self._is_expired(expiry, now):
+                count = 0
+            count += 1
+            self._counters[key] = (count, now + ttl)
+            self._schedule(_COUNTER, key, now + ttl)
+            return count
+
+    def get_count(self, key: str) -> int:
+        with self._lock:
+            now = time.time()
+            self._expire_due(now)
+            count, expiry = self._counters.get(key, (0, 0))
+            if expiry and self._is_expired(expiry, now):
+                self._counters.pop(key, None)
+                return 0
+            return count
+
+    def update(self, key: str, func: Callable[[Any, float], Tuple[Any, Any]], ttl: float) -> Any:
+        with self._lock:
+            now = time.time()
+            self._expire_due(now)
+            state, expiry = self._values.get(key, (None, 0.0))
+            if state is not None and self._is_expired(expiry, now):
+                state = None
+            state, result = func(state, now)
+            if state is None:
+                self._values.pop(key, None)
+            else:
+                self._values[key] = (state, now + ttl)
+                self._schedule(_VALUE, key, now + ttl)
+            return result
+
+    def entries(self) -> Dict[str, int]:
+        """Keys held per kind, expired ones not yet reclaimed included."""
+        with self._lock:
+            return {
+                "expiry": len(self._expiry),
+                "counter": len(self._counters),
+                "value": len(self._values),
+            }
+
+    def reset(self, key: str) -> None:
+        with self._lock:
+            self._counters.pop(key, None)
+            self._expiry.pop(key, None)
+            self._values.pop(key, None)
@@ -0,0 +1,270 @@
+import json
+import time
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from notify.core.store.base import BaseStore
+
+try:
+    import redis
+except ImportError:  # optional: only needed for store type "redis"
+    redis = None
+
+
+# KEYS: marker, counter, counter's marker; ARGV: ttl_ms, reset_after (0 = never)
+_CHECK_AND_COUNT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    redis.call('SET', KEYS[1], 1, 'PX', ARGV[1])
+    redis.call('DEL', KEYS[2], KEYS[3])
+    return 0
+end
+local count = redis.call('INCR', KEYS[2])
+redis.call('PEXPIRE', KEYS[2], ARGV[1])
+local reset_after = tonumber(ARGV[2])
+if reset_after > 0 and count >= reset_after then
+    redis.call('DEL', KEYS[2], KEYS[3])
+    redis.call('SET', KEYS[1], 1, 'PX', ARGV[1])
+end
+return count
+"""
+
+# KEYS: counter; ARGV: ttl_ms
+_INCREMENT = """
+local count = redis.call('INCR', KEYS[1])
+redis.call('PEXPIRE', KEYS[1], ARGV[1])
+return count
+"""
+
+# Rate limit scripts mirror the Python steps in notify.core.policies.rate_limit.
+# The caller's clock is passed in, as update() uses it, and floats are kept
+# as %.17g strings so they round-trip exactly.
+# KEYS: state; ARGV: now, rate, burst, ttl_ms
+
+# State: theoretical arrival time of the next conforming event.
+_GCRA = """
+local now = tonumber(ARGV[1])
+local interval = 1 / tonumber(ARGV[2])
+local tat = now
+local raw = redis.call('GET', KEYS[1])
+if raw then
+    tat = math.max(tonumber(raw), now)
+end
+if tat - now > interval * (tonumber(ARGV[3]) - 1) then
+    return 0
+end
+redis.call('SET', KEYS[1], string.format('%.17g', tat + interval), 'PX', ARGV[4])
+return 1
+"""
+
+# State: hash of tokens and the time they were last refilled.
+_TOKEN_BUCKET = """
+local now = tonumber(ARGV[1])
+local burst = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'refilled')
+local tokens = burst
+if state[1] then
+    tokens = math.min(burst, tonumber(state[1]) + (now - tonumber(state[2])) * tonumber(ARGV[2]))
+end
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', string.format('%.17g', tokens),
+    'refilled', string.format('%.17g', now))
+redis.call('PEXPIRE', KEYS[1], ARGV[4])
+return allowed
+"""
+
+# State: hash of the current 60s window's start and the counts of it and
+# the window before; the previous one is weighted by how much still overlaps.
+_SLIDING_WINDOW = """
+local now = tonumber(ARGV[1])
+local window_start = now - now % 60
+local state = redis.call('HMGET', KEYS[1], 'start', 'previous', 'current')
+local previous, current = 0, 0
+if state[1] then
+    local start = tonumber(state[1])
+    if start <= window_start - 120 then
+        previous = 0
+    elseif start < window_start then
+        if start == window_start - 60 then
+            previous = tonumber(state[3])
+        end
+    else
+        previous, current = tonumber(state[2]), tonumber(state[3])
+    end
+end
+local limit = math.max(tonumber(ARGV[2]) * 60, tonumber(ARGV[3]))
+local estimate = previous * (1 - (now - window_start) / 60) + current
+local allowed = 0
+if estimate + 1 <= limit then
+    current = current + 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'start', string.format('%.17g', window_start),
+    'previous', string.format('%.17g', previous), 'current', string.format('%.17g', current))
+redis.call('PEXPIRE', KEYS[1], ARGV[4])
+return allowed
+"""
+
+_RATE_LIMITS = {
+    "gcra": _GCRA,
+    "token_bucket": _TOKEN_BUCKET,
+    "sliding_window": _SLIDING_WINDOW,
+}
+
+# update() gives up re-reading a key other nodes keep writing after this many tries.
+_UPDATE_ATTEMPTS = 8
+
+
+class RedisStore(BaseStore):
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        prefix: str = "notify:",
+        client: Optional[Any] = None,
+    ) -> None:
+        if client is None:
+            if redis is None:
+                raise ImportError("RedisStore requires the 'redis' package")
+            client = redis.Redis.from_url(url)
+        self._client = client
+        self.prefix = prefix
+        self._check_and_count = client.register_script(_CHECK_AND_COUNT)
+        self._increment = client.register_script(_INCREMENT)
+        self._rate_limits = {
+            algorithm: client.register_script(script) for algorithm, script in _RATE_LIMITS.items()
+        }
+
+    # Markers and counters live in separate namespaces, like MemoryStore's
+    # _expiry and _counters dicts.
+    def _marker(self, key: str) -> str:
+        return f"{self.prefix}e:{key}"
+
+    def _counter(self, key: str) -> str:
+        return f"{self.prefix}c:{key}"
+
+    def _value(self, key: str) -> str:
+        return f"{self.prefix}v:{key}"
+
+    def is_active(self, key: str) -> bool:
+        return bool(self._client.exists(self._marker(key)))
+
+    def set_expiry(self, key: str, ttl: int) -> None:
+        self._client.set(self._marker(key), 1, px=_ttl_ms(ttl))
+
+    def increment(self, key: str, ttl: int) -> int:
+        return int(self._increment(keys=[self._counter(key)], args=[_ttl_ms(ttl)]))
+
+    def get_count(self, key: str) -> int:
+        value = self._client.get(self._counter(key))
+        return int(value) if value is not None else 0
+
+    def reset(self, key: str) -> None:
+        self._client.delete(self._marker(key), self._counter(key), self._value(key))
+
+    def update(self, key: str, func: Callable[[Any, float], Tuple[Any, Any]], ttl: float) -> Any:
+        # Optimistic WATCH/MULTI: retried only when another node wrote the key
+        # between our read and write. Past _UPDATE_ATTEMPTS the last result is
+        # returned without writing, so heavy contention cannot spin forever.
+        name = self._value(key)
+        with self._client.pipeline() as pipe:
+            for _ in range(_UPDATE_ATTEMPTS):
+                pipe.watch(name)
+                raw = pipe.get(name)
+                state, result = func(json.loads(raw) if raw else None, time.time())
+                pipe.multi()
+                if state is None:
+                    pipe.delete(name)
+                else:
+                    pipe.set(name, json.dumps(state), px=_ttl_ms(ttl))
+                try:
+                    pipe.execute()
+                except Exception as exc:
+                    # Looked up by name: an injected client may not come from
+                    # the redis module imported here.
+                    if type(exc).__name__ != "WatchError":
+                        raise
+                    continue
+                return result
+            return result
+
+    def rate_limit(
+        self,
+        key: str,
+        algorithm: str,
+        rate: float,
+        burst: int,
+        ttl: float,
+        decide: Callable[[Any, float], Tuple[Any, bool]],
+    ) -> bool:
+        script = self._rate_limits.get(algorithm)
+        if script is None:
+            return super().rate_limit(key, algorithm, rate, burst, ttl, decide)
+        args = [repr(time.time()), repr(float(rate)), int(burst), _ttl_ms(ttl)]
+        return bool(script(keys=[self._value(key)], args=args))
+
+    def rate_limit_many(
+        self,
+        keys: Sequence[str],
+        algorithm: str,
+        rate: float,
+        burst: int,
+        ttl: float,
+        decide: Callable[[Any, float], Tuple[Any, bool]],
+    ) -> List[bool]:
+        script = self._rate_limits.get(algorithm)
+        if script is None:
+            return super().rate_limit_many(keys, algorithm, rate, burst, ttl, decide)
+        args = [repr(time.time()), repr(float(rate)), int(burst), _ttl_ms(ttl)]
+        pipe = self._client.pipeline(transaction=False)
+        for key in keys:
+            script(keys=[self._value(key)], args=args, client=pipe)
+        return [bool(result) for result in pipe.execute()]
+
+    def close(self) -> None:
+        self._client.close()
+
+    def check_and_set(self, key: str, ttl: int) -> bool:
+        # SET NX returns None when the marker already exists.
+        return self._client.set(self._marker(key), 1, px=_ttl_ms(ttl), nx=True) is None
+
+    def check_and_count(
+        self, key: str, counter_key: str, ttl: int, reset_after: Optional[int] = None
+    ) -> int:
+        keys, args = self._check_and_count_args(key, counter_key, ttl, reset_after)
+        return int(self._check_and_count(keys=keys, args=args))
+
+    def check_and_set_many(self, keys: Sequence[str], ttl: int) -> List[bool]:
+        pipe = self._client.pipeline(transaction=False)
+        for key in keys:
+            pipe.set(self._marker(key), 1, px=_ttl_ms(ttl), nx=True)
+        return [result is None for result in pipe.execute()]
+
+    def check_and_count_many(
+        self,
+        keys: Sequence[Tuple[str, str]],
+        ttl: int,
+        reset_after: Optional[int] = None,
+    ) -> List[int]:
+        pipe = self._client.pipeline(transaction=False)
+        for key, counter_key in keys:
+            script_keys, args = self._check_and_count_args(key, counter_key, ttl, reset_after)
+            self._check_and_count(keys=script_keys, args=args, client=pipe)
+        return [int(result) for result in pipe.execute()]
+
+    def increment_many(self, keys: Sequence[str], ttl: int) -> List[int]:
+        pipe = self._client.pipeline(transaction=False)
+        for key in keys:
+            self._increment(keys=[self._counter(key)], args=[_ttl_ms(ttl)], client=pipe)
+        return [int(result) for result in pipe.execute()]
+
+    def _check_and_count_args(
+        self, key: str, counter_key: str, ttl: int, reset_after: Optional[int]
+    ) -> Tuple[List[str], List[int]]:
+        keys = [self._marker(key), self._counter(counter_key), self._marker(counter_key)]
+        return keys, [_ttl_ms(ttl), int(reset_after or 0)]
+
+
+def _ttl_ms(ttl: float) -> int:
+    return max(int(ttl * 1000), 1)
@@ -0,0 +1,53 @@
+from contextlib import ExitStack
+from typing import Any, Callable, ContextManager, Dict, List, Tuple
+
+from notify.core.store.base import BaseStore
+from notify.core.store.memory import MemoryStore
+
+
+class ShardedMemoryStore(BaseStore):
+    def __init__(self, shards: int = 16) -> None:
+        if shards < 1:
+            raise ValueError("shards must be >= 1")
+        self._shards: List[MemoryStore] = [MemoryStore() for _ in range(shards)]
+
+    def _shard(self, key: str) -> MemoryStore:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def is_active(self, key: str) -> bool:
+        return self._shard(key).is_active(key)
+
+    def set_expiry(self, key: str, ttl: int) -> None:
+        self._shard(key).set_expiry(key, ttl)
+
+    def increment(self, key: str, ttl: int) -> int:
+        return self._shard(key).increment(key, ttl)
+
+    def get_count(self, key: str) -> int:
+        return self._shard(key).get_count(key)
+
+    def reset(self, key: str) -> None:
+        self._shard(key).reset(key)
+
+    def update(self, key: str, func: Callable[[Any, float], Tuple[Any, Any]], ttl: float) -> Any:
+        return self._shard(key).update(key, func, ttl)
+
+    def entries(self) -> Dict[str, int]:
+        totals: Dict[str, int] = {}
+        for shard in self._shards:
+            for kind, count in shard.entries().items():
+                totals[kind] = totals.get(kind, 0) + count
+        return totals
+
+    def transaction(self) -> ContextManager:
+        return self._lock_shards(range(len(self._shards)))
+
+    def transaction_for(self, *keys: str) -> ContextManager:
+        return self._lock_shards({hash(key) % len(self._shards) for key in keys})
+
+    def _lock_shards(self, indexes) -> ContextManager:
+        # Shard locks are always taken in index order, so batches cannot deadlock.
+        stack = ExitStack()
+        for index in sorted(indexes):
+            stack.enter_context(self._shards[index].transaction())
+        return stack
@@ -0,0 +1,159 @@
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from threading import RLock
+from typing import Any, Callable, Iterator, Tuple
+
+from notify.core.store.base import BaseStore
+
+
+_EXPIRY = 0
+_COUNTER = 1
+
+# Statements are constant strings so sqlite3's statement cache keeps them prepared.
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS notify_state (
+        kind INTEGER NOT NULL,
+        key TEXT NOT NULL,
+        count INTEGER NOT NULL DEFAULT 0,
+        expiry REAL NOT NULL,
+        UNIQUE (kind, key)
+    )""",
+    "CREATE INDEX IF NOT EXISTS notify_state_expiry ON notify_state (expiry)",
+    """CREATE TABLE IF NOT EXISTS notify_values (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL,
+        expiry REAL NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS notify_values_expiry ON notify_values (expiry)",
+)
+_IS_ACTIVE = "SELECT 1 FROM notify_state WHERE kind = 0 AND key = ? AND expiry > ?"
+_SET_EXPIRY = (
+    "INSERT INTO notify_state (kind, key, count, expiry) VALUES (0, ?, 0, ?) "
+    "ON CONFLICT (kind, key) DO UPDATE SET expiry = excluded.expiry"
+)
+_INCREMENT = (
+    "INSERT INTO notify_state (kind, key, count, expiry) VALUES (1, ?, 1, ?) "
+    "ON CONFLICT (kind, key) DO UPDATE SET "
+    "count = CASE WHEN notify_state.expiry <= ? THEN 1 ELSE notify_state.count + 1 END, "
+    "expiry = excluded.expiry "
+    "RETURNING count"
+)
+_GET_COUNT = "SELECT count FROM notify_state WHERE kind = 1 AND key = ? AND expiry > ?"
+_GET_VALUE = "SELECT value FROM notify_values WHERE key = ? AND expiry > ?"
+_SET_VALUE = (
+    "INSERT INTO notify_values (key, value, expiry) VALUES (?, ?, ?) "
+    "ON CONFLICT (key) DO UPDATE SET value = excluded.value, expiry = excluded.expiry"
+)
+_DELETE_VALUE = "DELETE FROM notify_values WHERE key = ?"
+_RESET = "DELETE FROM notify_state WHERE key = ?"
+_CLEANUP = (
+    "DELETE FROM notify_state WHERE rowid IN "
+    "(SELECT rowid FROM notify_state WHERE expiry <= ? LIMIT ?)",
+    "DELETE FROM notify_values WHERE rowid IN "
+    "(SELECT rowid FROM notify_values WHERE expiry <= ? LIMIT ?)",
+)
+
+
+class SqliteStore(BaseStore):
+    def __init__(
+        self,
+        path: str = "notify-state.db",
+        timeout: float = 5.0,
+        cleanup_interval: float = 30.0,
+        cleanup_batch: int = 500,
+    ) -> None:
+        self.path = path
+        self.cleanup_interval = cleanup_interval
+        self.cleanup_batch = cleanup_batch
+        self._lock = RLock()
+        self._depth = 0
+        self._last_cleanup = 0.0
+        # Autocommit mode; transaction() issues BEGIN IMMEDIATE explicitly.
+        self._conn = sqlite3.connect(
+            path,
+            timeout=timeout,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+
+    def is_active(self, key: str) -> bool:
+        with self._lock:
+            now = time.time()
+            self._maybe_cleanup(now)
+            return self._conn.execute(_IS_ACTIVE, (key, now)).fetchone() is not None
+
+    def set_expiry(self, key: str, ttl: int) -> None:
+        with self._lock:
+            now = time.time()
+            self._maybe_cleanup(now)
+            self._conn.execute(_SET_EXPIRY, (key, now + ttl))
+
+    def increment(self, key: str, ttl: int) -> int:
+        with self._lock:
+            now = time.time()
+            self._maybe_cleanup(now)
+            rows = self._conn.execute(_INCREMENT, (key, now + ttl, now)).fetchall()
+            return int(rows[0][0])
+
+    def get_count(self, key: str) -> int:
+        with self._lock:
+            now = time.time()
+            self._maybe_cleanup(now)
+            row = self._conn.execute(_GET_COUNT, (key, now)).fetchone()
+            return int(row[0]) if row else 0
+
+    def reset(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute(_RESET, (key,))
+            self._conn.execute(_DELETE_VALUE, (key,))
+
+    def update(self, key: str, func: Callable[[Any, float], Tuple[Any, Any]], ttl: float) -> Any:
+        with self.transaction():
+            now = time.time()
+            self._maybe_cleanup(now)
+            row = self._conn.execute(_GET_VALUE, (key, now)).fetchone()
+            state, result = func(json.loads(row[0]) if row else None, now)
+            if state is None:
+                self._conn.execute(_DELETE_VALUE, (key,))
+            else:
+                self._conn.execute(_SET_VALUE, (key, json.dumps(state), now + ttl))
+            return result
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        with self._lock:
+            if self._depth:
+                self._depth += 1
+                try:
+                    yield
+                finally:
+                    self._depth -= 1
+                return
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._depth = 1
+            try:
+                yield
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            else:
+                self._conn.execute("COMMIT")
+            finally:
+                self._depth = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _maybe_cleanup(self, now: float) -> None:
+        if now - self._last_cleanup < self.cleanup_interval:
+            return
+        self._last_cleanup = now
+        for statement in _CLEANUP:
+            self._conn.execute(statement, (now, self.cleanup_batch))
@@ -0,0 +1,193 @@
+import hashlib
+import json
+import os
+import time
+from contextlib import contextmanager
+from threading import Lock, Thread
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+from weakref import WeakValueDictionary
+
+
+# fetch() returns (token, expires_in seconds) or a failed ChannelResult.
+_Fetch = Callable[[], Any]
+
+
+class TokenCache:
+    """Access token shared by every channel on one account.
+
+    A missing or expired token is fetched by one caller while the others
+    wait for it (single flight). Within refresh_ahead seconds of expiry the
+    current token is still handed out while one background thread fetches
+    the next, so sends do not stall on a refresh. Providers that return the
+    token already held until it expires (WeCom does) cannot be refreshed
+    early: the cache then waits for expiry and fetches in the foreground.
+
+    With path set, tokens are also kept in that file under an exclusive
+    lock, so processes on the same account share one token instead of each
+    fetching (and, on some providers, invalidating) their own.
+    """
+
+    def __init__(
+        self, key: str, path: Optional[str] = None, refresh_ahead: float = 300.0
+    ) -> None:
+        self.key = key
+        self.path = path
+        self.refresh_ahead = refresh_ahead
+        self.fetches = 0
+        self.shared = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.invalidated = 0
+        self._token: Optional[str] = None
+        self._expiry = 0.0
+        # No second proactive refresh before this, e.g. after one that failed.
+        self._refresh_after = 0.0
+        self._lock = Lock()
+
+    def cached(self, fetch: _Fetch) -> Optional[str]:
+        """The current token if still valid, refreshing it in the background when due."""
+        token, expiry = self._token, self._expiry
+        now = time.time()
+        if token is None or now >= expiry:
+            return None
+        if now >= expiry - self.refresh_ahead and now >= self._refresh_after:
+            if self._lock.acquire(blocking=False):
+                Thread(
+                    target=self._refresh_ahead, args=(fetch,), name="notify-token-refresh", daemon=True
+                ).start()
+        return token
+
+    def get(self, fetch: _Fetch) -> Any:
+        """The current token, fetching it first if needed; a failed ChannelResult otherwise."""
+        token = self.cached(fetch)
+        if token is not None:
+            return token
+        with self._lock:
+            if self._token is not None and time.time() < self._expiry:
+                return self._token
+            return self._refresh(fetch, time.time())
+
+    def invalidate(self, token: str) -> None:
+        """Drop token after the provider rejected it, unless it was replaced already."""
+        with self._lock:
+            if self._token != token:
+                return
+            self._token = None
+            self._expiry = 0.0
+            self.invalidated += 1
+            if self.path is not None:
+                with self._file_lock():
+                    tokens = self._read()
+                    if tokens.get(self._file_key(), {}).get("token") == token:
+                        del tokens[self._file_key()]
+                        self._write(tokens)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "valid_for": round(max(self._expiry - time.time(), 0.0), 1) if self._token else 0.0,
+            "fetches": self.fetches,
+            "shared": self.shared,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "invalidated": self.invalidated,
+        }
+
+    def _refresh_ahead(self, fetch: _Fetch) -> None:
+        held = self._token
+        try:
+            self.refreshes += 1
+            self._refresh_after = time.time() + min(self.refresh_ahead / 4, 60.0)
+            token = self._refresh(fetch, time.time() + self.refresh_ahead)
+            if not isinstance(token, str):
+                self.refresh_errors += 1
+            elif token == held:
+                # Handed the same token back: asking again before it expires
+                # would only get it again.
+                self._refresh_after = self._expiry
+        except Exception:
+            self.refresh_errors += 1
+        finally:
+            self._lock.release()
+
+    def _refresh(self, fetch: _Fetch, stale_before: float) -> Any:
+        # Called with _lock held; a token expiring before stale_before is not good enough.
+        with self._file_lock():
+            if self.path is not None:
+                entry = self._read().get(self._file_key())
+                if entry and entry.get("token") and float(entry.get("expiry", 0)) > stale_before:
+                    self.shared += 1
+                    return self._store(entry["token"], float(entry["expiry"]))
+            result = fetch()
+            if not isinstance(result, tuple):
+                return result
+            self.fetches += 1
+            token, expires_in = result
+            # Expire a minute early so a token is never used right at its deadline.
+            token = self._store(token, time.time() + max(expires_in - 60, 0))
+            if self.path is not None:
+                tokens = self._read()
+                tokens[self._file_key()] = {"token": token, "expiry": self._expiry}
+                self._write(tokens)
+            return token
+
+    def _store(self, token: str, expiry: float) -> str:
+        self._token = token
+        self._expiry = expiry
+        return token
+
+    def _file_key(self) -> str:
+        return hashlib.sha256(self.key.encode("utf-8")).hexdigest()
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        if self.path is None:
+            yield
+            return
+        try:
+            import fcntl
+        except ImportError:
+            # No flock (Windows): the file is still shared, just not locked.
+            yield
+            return
+        fd = os.open(self.path + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _write(self, tokens: Dict[str, Any]) -> None:
+        temp = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            fd = os.open(temp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(tokens, handle)
+            os.replace(temp, self.path)
+        except OSError:
+            pass
+
+
+# Caches by account, kept while any channel uses them (e.g. across a config reload).
+_caches: "WeakValueDictionary[Tuple[str, Optional[str]], TokenCache]" = WeakValueDictionary()
+_caches_lock = Lock()
+
+
+def build_token_cache(cfg: Any, account: str) -> TokenCache:
+    cfg = cfg if isinstance(cfg, dict) else {}
+    path = cfg.get("path") or None
+    with _caches_lock:
+        cache = _caches.get((account, path))
+        if cache is None:
+            cache = TokenCache(
+                account, path=path, refresh_ahead=float(cfg.get("refresh_ahead", 300.0))
+            )
+            _caches[(account, path)] = cache
+        return cache
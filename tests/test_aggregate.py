@@ -0,0 +1,60 @@
+import random
+import time
+
+from notify.core.policies import AggregatePolicy
+from notify.core.policies.aggregate import _AggregateBucket
+from notify.core.store import MemoryStore
+
+
+def space_saving(keys, k):
+    # Reference implementation: evicts via a linear scan for the minimum.
+    counts = {}
+    for key in keys:
+        if key in counts:
+            counts[key] += 1
+        elif len(counts) < k:
+            counts[key] = 1
+        else:
+            floor = min(counts.values())
+            victim = min(key for key, count in counts.items() if count == floor)
+            del counts[victim]
+            counts[key] = floor + 1
+    return counts
+
+
+def test_bounded_bucket_matches_space_saving():
+    rng = random.Random(7)
+    keys = [f"k{int(rng.paretovariate(1.2))}" for _ in range(5000)]
+    bucket = _AggregateBucket(start_time=0.0, top_k=8)
+    for key in keys:
+        bucket.add({"event_key": key}, max_samples=0)
+    assert sorted(bucket.counts.values()) == sorted(space_saving(keys, 8).values())
+    assert len(bucket.heap) == len(bucket.counts) == 8
+    assert bucket.total == len(keys)
+
+
+def test_bounded_bucket_keeps_heavy_hitters():
+    bucket = _AggregateBucket(start_time=0.0, top_k=3)
+    for index in range(1000):
+        bucket.add({"event_key": "hot"}, max_samples=0)
+        bucket.add({"event_key": f"cold-{index}"}, max_samples=0)
+    assert bucket.counts["hot"] - bucket.errors["hot"] == 1000
+
+
+def test_adopted_buckets_keep_their_window(monkeypatch):
+    now = [1_700_000_000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    store = MemoryStore()
+    previous = AggregatePolicy(window=60, levels=["warn"])
+    previous.apply({"level": "warn", "event_key": "disk", "source": "db"}, store)
+
+    policy = AggregatePolicy(window=600, levels=["warn"])
+    assert policy.adopt(previous)
+    assert policy.next_deadline() == now[0] + 60
+    now[0] += 60
+    (summary,) = policy.flush(store)
+    assert "window=60s" in summary["raw_content"]
+    assert summary["meta"]["aggregate_window"] == 60
+
+    policy.apply({"level": "warn", "event_key": "disk", "source": "db"}, store)
+    assert policy.next_deadline() == now[0] + 600
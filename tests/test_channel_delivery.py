@@ -0,0 +1,134 @@
+import asyncio
+import time
+
+import pytest
+
+from notify import Notify
+from notify.channels.base import BaseNotifier
+from notify.core.breaker import CLOSED, OPEN
+from notify.core.hooks import Hooks
+from notify.core.models import ChannelResult
+
+
+class FlakyNotifier(BaseNotifier):
+    type_name = "flaky"
+
+    def __init__(self, **overrides) -> None:
+        super().__init__(**overrides)
+        self.error = None
+
+    def send(self, event):
+        if self.error is not None:
+            raise self.error
+        return ChannelResult(True, "ok")
+
+    async def asend(self, event):
+        return self.send(event)
+
+    def send_batch(self, events):
+        return [self.send(event) for event in events]
+
+
+EVENT = {"raw_content": "disk almost full"}
+
+
+@pytest.fixture
+def channel():
+    channel = FlakyNotifier(breaker={"failure_threshold": 1, "reset_timeout": 0.01}, pace=False)
+    yield channel
+    channel.close()
+
+
+def open_breaker(channel) -> None:
+    channel.error = RuntimeError("boom")
+    with pytest.raises(RuntimeError):
+        channel.deliver(EVENT)
+    assert channel.breaker.state == OPEN
+    time.sleep(0.02)
+
+
+def test_raising_send_counts_as_failure(channel):
+    open_breaker(channel)
+
+
+@pytest.mark.parametrize("mode", ["deliver", "adeliver", "deliver_batch"])
+def test_raising_probe_reopens_breaker(channel, mode):
+    open_breaker(channel)
+    with pytest.raises(RuntimeError):
+        if mode == "deliver":
+            channel.deliver(EVENT)
+        elif mode == "adeliver":
+            asyncio.run(channel.adeliver(EVENT))
+        else:
+            channel.deliver_batch([EVENT])
+    assert channel.breaker.state == OPEN
+
+    time.sleep(0.02)
+    channel.error = None
+    assert channel.deliver(EVENT).success
+    assert channel.breaker.state == CLOSED
+
+
+def test_open_breaker_rejection_is_not_retried(channel):
+    open_breaker(channel)
+    channel.breaker.reset_timeout = 60
+    result = channel.deliver(EVENT)
+    assert not result.success
+    assert not result.retryable
+    assert result.message.startswith("circuit open")
+
+
+def test_pacing_overflow_is_handed_to_retry():
+    channel = FlakyNotifier(pace={"per_minute": 2}, breaker=False)
+    try:
+        assert channel.deliver(EVENT).success
+        assert channel.deliver(EVENT).success
+        start = time.monotonic()
+        result = channel.deliver(EVENT)
+        # Refused without making the caller wait for the next slot.
+        assert time.monotonic() - start < 0.5
+        assert not result.success
+        assert result.retryable
+        assert 55 < result.retry_after <= 60
+    finally:
+        channel.close()
+
+
+@pytest.mark.parametrize("mode", ["deliver", "adeliver", "deliver_batch"])
+def test_after_send_hook_fires_when_send_raises(channel, mode):
+    hooks = Hooks()
+    seen = []
+    hooks.add("before_channel_send", lambda context: context.data.setdefault("open", True))
+    hooks.add("after_channel_send", lambda context: seen.append(context))
+    channel.hooks = hooks
+    channel.error = RuntimeError("boom")
+    with pytest.raises(RuntimeError):
+        if mode == "deliver":
+            channel.deliver(EVENT)
+        elif mode == "adeliver":
+            asyncio.run(channel.adeliver(EVENT))
+        else:
+            channel.deliver_batch([EVENT])
+    assert len(seen) == 1
+    assert seen[0].data["open"]
+    assert seen[0].result is None
+    assert seen[0].error is channel.error
+    assert seen[0].elapsed is not None
+
+
+def test_paced_out_send_is_queued_even_without_retry():
+    channel = FlakyNotifier(pace={"per_second": 1, "max_wait": 0}, breaker=False, retry=False)
+    sent = []
+    channel.send = lambda event: sent.append(event) or ChannelResult(True, "ok")
+    notify = Notify(channels=[channel])
+    try:
+        assert notify.send("first", notify_level="error", event_key="a").status == "sent"
+        result = notify.send("second", notify_level="error", event_key="b")
+        assert "paced" in result.results[-1].channel_results["flaky"].message
+        assert notify.retry_scheduler.pending() == 1
+        deadline = time.monotonic() + 5
+        while len(sent) < 2 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert len(sent) == 2
+    finally:
+        notify.close()
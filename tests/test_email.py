@@ -0,0 +1,98 @@
+import smtplib
+
+import pytest
+
+from notify.channels.email import EmailNotifier
+
+EVENT = {"raw_content": "disk almost full", "event_key": "disk"}
+
+
+class FakeSMTP:
+    def __init__(self, error=None) -> None:
+        self.error = error
+        self.sent = 0
+        self.closed = False
+
+    def send_message(self, msg) -> None:
+        self.sent += 1
+        if self.error is not None:
+            raise self.error
+
+    def noop(self):
+        return 250, b"ok"
+
+    def quit(self) -> None:
+        self.closed = True
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def email(monkeypatch):
+    channel = EmailNotifier(
+        host="smtp.example.com",
+        username="bot@example.com",
+        password="secret",
+        to_addrs=["ops@example.com"],
+        retry=False,
+        pace=False,
+    )
+    channel.connections = []
+
+    def connect():
+        server = FakeSMTP(channel.next_error)
+        channel.connections.append(server)
+        return server
+
+    channel.next_error = None
+    monkeypatch.setattr(channel, "_connect", connect)
+    yield channel
+    channel.close()
+
+
+def test_permanent_reply_is_not_resent_or_retried(email):
+    email.next_error = smtplib.SMTPDataError(550, b"mailbox unavailable")
+    result = email.send(EVENT)
+    assert not result.success
+    assert not result.retryable
+    assert result.message == "smtp error: SMTPDataError"
+    # Same authenticated session, one attempt, connection kept.
+    assert len(email.connections) == 1
+    assert email.connections[0].sent == 1
+    assert not email.connections[0].closed
+
+
+def test_refused_recipients_are_not_resent(email):
+    email.next_error = smtplib.SMTPRecipientsRefused({"ops@example.com": (550, b"no such user")})
+    result = email.send(EVENT)
+    assert result.message == "smtp error: SMTPRecipientsRefused"
+    assert not result.retryable
+    assert len(email.connections) == 1
+    assert email.connections[0].sent == 1
+
+
+def test_dropped_connection_is_reconnected_once(email):
+    email.next_error = smtplib.SMTPServerDisconnected("gone")
+    result = email.send(EVENT)
+    assert not result.success
+    assert result.retryable
+    assert len(email.connections) == 2
+
+
+def test_transient_reply_is_retryable(email):
+    email.next_error = smtplib.SMTPDataError(451, b"try again later")
+    result = email.send(EVENT)
+    assert result.retryable
+    assert len(email.connections) == 1
+    assert email.connections[0].sent == 1
+
+
+def test_refused_recipients_are_retryable_only_if_all_transient(email):
+    email.next_error = smtplib.SMTPRecipientsRefused(
+        {"a@example.com": (450, b"mailbox busy"), "b@example.com": (550, b"no such user")}
+    )
+    assert not email.send(EVENT).retryable
+    email.close()
+    email.next_error = smtplib.SMTPRecipientsRefused({"a@example.com": (450, b"mailbox busy")})
+    assert email.send(EVENT).retryable
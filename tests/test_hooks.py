@@ -0,0 +1,59 @@
+from notify import Notify
+from notify.channels.base import BaseNotifier
+from notify.core.models import ChannelResult
+from notify.core.policies import CooldownPolicy, RateLimitPolicy
+from notify.core.store import MemoryStore
+
+
+class NullNotifier(BaseNotifier):
+    type_name = "null"
+
+    def send(self, event):
+        return ChannelResult(True, "ok")
+
+
+class LockCheckingStore(MemoryStore):
+    """Records whether a hook ran while a transaction was open."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.depth = 0
+
+    def transaction(self):
+        store = self
+        inner = super().transaction()
+
+        class Transaction:
+            def __enter__(self):
+                inner.__enter__()
+                store.depth += 1
+
+            def __exit__(self, *exc):
+                store.depth -= 1
+                return inner.__exit__(*exc)
+
+        return Transaction()
+
+
+def build(store):
+    return Notify(
+        channels=[NullNotifier(retry=False, pace=False)],
+        policies=[CooldownPolicy(ttl=600), RateLimitPolicy(per_minute=100)],
+        store=store,
+    )
+
+
+def test_policy_decision_hooks_run_outside_the_store_transaction():
+    store = LockCheckingStore()
+    notify = build(store)
+    seen = []
+    notify.add_hook("policy_decision", lambda context: seen.append((context.policy, store.depth)))
+    try:
+        notify.send("disk almost full", notify_level="error", event_key="disk")
+        notify.send("disk almost full", notify_level="error", event_key="disk")
+        notify.send_many([{"raw_content": "a", "level": "error", "event_key": "a"}])
+    finally:
+        notify.close()
+    policies = [policy for policy, _ in seen]
+    assert policies == ["cooldown", "rate_limit", "cooldown", "cooldown", "rate_limit"]
+    assert all(depth == 0 for _, depth in seen)
@@ -0,0 +1,49 @@
+from notify import Notify
+from notify.channels.base import BaseNotifier
+from notify.core.metrics import MetricsRegistry
+from notify.core.models import ChannelResult
+from notify.core.policies import AggregatePolicy, CooldownPolicy
+
+
+class FailingNotifier(BaseNotifier):
+    type_name = "failing"
+
+    def send(self, event):
+        return ChannelResult(False, "bad request")
+
+
+def test_events_are_counted_as_allowed_not_sent():
+    metrics = MetricsRegistry()
+    notify = Notify(
+        channels=[FailingNotifier(retry=False, pace=False)],
+        policies=[CooldownPolicy(ttl=600)],
+        metrics=metrics,
+    )
+    try:
+        notify.send("disk almost full", notify_level="error", event_key="disk")
+        notify.send("disk almost full", notify_level="error", event_key="disk")
+    finally:
+        notify.close()
+    text = metrics.render()
+    assert 'notify_events_total{level="error",outcome="allowed",reason=""} 1' in text
+    assert 'notify_events_total{level="error",outcome="suppressed",reason="cooldown"} 1' in text
+    assert 'notify_channel_send_seconds_count{channel="failing",outcome="failed"} 1' in text
+    assert 'outcome="sent"' not in text
+
+
+def test_aggregate_bucket_events_are_labelled_by_level():
+    metrics = MetricsRegistry()
+    notify = Notify(
+        channels=[FailingNotifier(retry=False, pace=False)],
+        policies=[AggregatePolicy(window=3600, levels=["warn"])],
+        metrics=metrics,
+    )
+    try:
+        for source in ("db-1", "db-2", "db-3"):
+            notify.send("slow query", notify_level="warn", source=source)
+        text = metrics.render()
+    finally:
+        notify.close()
+    assert "notify_aggregate_buckets 3" in text
+    assert 'notify_aggregate_bucket_events{level="warn"} 3' in text
+    assert "db-1" not in text
@@ -0,0 +1,155 @@
+import time
+
+import pytest
+
+from notify.core.policies import RateLimitPolicy
+from notify.core.store import MemoryStore, SqliteStore
+
+# A minute boundary, so sliding windows start here.
+START = 1_700_000_040.0
+
+
+class Clock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock(START)
+    monkeypatch.setattr(time, "time", clock)
+    return clock
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def store(request, tmp_path, clock):
+    if request.param == "memory":
+        store = MemoryStore()
+    elif request.param == "sqlite":
+        store = SqliteStore(str(tmp_path / "state.db"))
+    else:
+        fakeredis = pytest.importorskip("fakeredis")
+        from notify.core.store.redis import RedisStore
+
+        store = RedisStore(client=fakeredis.FakeRedis())
+
+        def update(*args, **kwargs):
+            raise AssertionError("rate limits must run as one script per decision")
+
+        store.update = update
+    yield store
+    store.close()
+
+
+def allowed(policy, store, count: int = 1) -> int:
+    event = {"level": "error", "event_key": "k"}
+    return sum(policy.apply(event, store).action == "allow" for _ in range(count))
+
+
+@pytest.mark.parametrize("algorithm", ["gcra", "token_bucket"])
+def test_burst_then_denied(store, clock, algorithm):
+    policy = RateLimitPolicy(per_minute=60, algorithm=algorithm, burst=5)
+    assert allowed(policy, store, 10) == 5
+
+
+@pytest.mark.parametrize("algorithm", ["gcra", "token_bucket"])
+def test_steady_state_spacing(store, clock, algorithm):
+    policy = RateLimitPolicy(per_minute=60, algorithm=algorithm, per_second=2, burst=1)
+    assert allowed(policy, store, 3) == 1
+    for _ in range(10):
+        clock.advance(0.25)
+        assert allowed(policy, store) == 0
+        clock.advance(0.25)
+        assert allowed(policy, store, 3) == 1
+
+
+@pytest.mark.parametrize("algorithm", ["gcra", "token_bucket"])
+def test_refill_is_proportional_and_capped(store, clock, algorithm):
+    policy = RateLimitPolicy(per_minute=60, algorithm=algorithm, burst=4)
+    assert allowed(policy, store, 4) == 4
+    clock.advance(2.5)
+    assert allowed(policy, store, 4) == 2
+    clock.advance(0.5)
+    assert allowed(policy, store, 4) == 1
+    # A long idle period refills at most a full burst.
+    clock.advance(3600)
+    assert allowed(policy, store, 10) == 4
+
+
+def test_gcra_denied_events_do_not_push_back(store, clock):
+    policy = RateLimitPolicy(per_minute=60, algorithm="gcra", burst=2)
+    assert allowed(policy, store, 2) == 2
+    assert allowed(policy, store, 50) == 0
+    clock.advance(1)
+    assert allowed(policy, store, 2) == 1
+
+
+def test_sliding_window_limit_within_window(store, clock):
+    policy = RateLimitPolicy(per_minute=10, algorithm="sliding_window")
+    assert allowed(policy, store, 15) == 10
+    clock.advance(59)
+    assert allowed(policy, store) == 0
+
+
+def test_sliding_window_weights_previous_window(store, clock):
+    policy = RateLimitPolicy(per_minute=10, algorithm="sliding_window")
+    assert allowed(policy, store, 10) == 10
+    # Halfway into the next window the previous one still counts for half.
+    clock.advance(90)
+    assert allowed(policy, store, 10) == 5
+
+
+def test_sliding_window_boundary(store, clock):
+    policy = RateLimitPolicy(per_minute=10, algorithm="sliding_window")
+    assert allowed(policy, store, 10) == 10
+    # Right at the boundary the previous window still weighs fully.
+    clock.advance(60)
+    assert allowed(policy, store, 10) == 0
+    # Three quarters in, a quarter of it remains: 10 - 2.5 leaves room for 7.
+    clock.advance(45)
+    assert allowed(policy, store, 10) == 7
+
+
+def test_sliding_window_forgets_old_windows(store, clock):
+    policy = RateLimitPolicy(per_minute=10, algorithm="sliding_window")
+    assert allowed(policy, store, 10) == 10
+    # The window after next no longer overlaps the full one.
+    clock.advance(120)
+    assert allowed(policy, store, 15) == 10
+
+
+def test_sliding_window_burst_raises_limit(store, clock):
+    policy = RateLimitPolicy(per_minute=10, algorithm="sliding_window", burst=15)
+    assert allowed(policy, store, 20) == 15
+
+
+def test_scopes_are_independent(store, clock):
+    policy = RateLimitPolicy(per_minute=60, algorithm="gcra", burst=1, scope="event_key")
+    first = {"level": "error", "event_key": "a"}
+    second = {"level": "error", "event_key": "b"}
+    assert policy.apply(first, store).action == "allow"
+    assert policy.apply(first, store).action == "suppress"
+    assert policy.apply(second, store).action == "allow"
+
+
+@pytest.mark.parametrize("algorithm", ["gcra", "token_bucket", "sliding_window"])
+def test_apply_many_matches_one_by_one(store, clock, algorithm):
+    policy = RateLimitPolicy(per_minute=3, algorithm=algorithm, burst=3, scope="event_key")
+    events = [{"level": "error", "event_key": key} for key in "aabaaabb"]
+    outcomes = policy.apply_many(events, store)
+    assert [outcome.action for outcome in outcomes] == [
+        "allow", "allow", "allow", "allow", "suppress", "suppress", "allow", "allow",
+    ]
+    assert outcomes[0].event is events[0]
+
+
+def test_apply_many_skips_other_levels(store, clock):
+    policy = RateLimitPolicy(per_minute=60, algorithm="gcra", levels=["error"])
+    events = [{"level": "info", "event_key": "k"}] * 5
+    assert all(outcome.action == "allow" for outcome in policy.apply_many(events, store))
@@ -0,0 +1,145 @@
+import time
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from notify.core.store.redis import RedisStore
+
+
+@pytest.fixture
+def client():
+    return fakeredis.FakeRedis()
+
+
+@pytest.fixture
+def store(client):
+    return RedisStore(client=client, prefix="test:")
+
+
+def test_check_and_set_uses_set_nx(store, client):
+    assert store.check_and_set("k", ttl=60) is False
+    assert store.check_and_set("k", ttl=60) is True
+    assert client.exists("test:e:k")
+    assert 0 < client.pttl("test:e:k") <= 60_000
+
+
+def test_check_and_set_after_expiry(store, client):
+    assert store.check_and_set("k", ttl=60) is False
+    client.delete("test:e:k")
+    assert store.check_and_set("k", ttl=60) is False
+
+
+def test_increment_sets_ttl(store, client):
+    assert [store.increment("c", ttl=120) for _ in range(3)] == [1, 2, 3]
+    assert store.get_count("c") == 3
+    assert 0 < client.pttl("test:c:c") <= 120_000
+
+
+def test_check_and_count_counts_while_marker_is_active(store, client):
+    assert store.check_and_count("k", "n", ttl=60) == 0
+    assert client.exists("test:e:k")
+    assert [store.check_and_count("k", "n", ttl=60) for _ in range(3)] == [1, 2, 3]
+    assert store.get_count("n") == 3
+
+
+def test_check_and_count_resets_counter_on_new_marker(store, client):
+    store.check_and_count("k", "n", ttl=60)
+    store.check_and_count("k", "n", ttl=60)
+    client.delete("test:e:k")
+    assert store.check_and_count("k", "n", ttl=60) == 0
+    assert store.get_count("n") == 0
+
+
+def test_check_and_count_reset_after(store):
+    assert store.check_and_count("k", "n", ttl=60, reset_after=2) == 0
+    assert store.check_and_count("k", "n", ttl=60, reset_after=2) == 1
+    assert store.check_and_count("k", "n", ttl=60, reset_after=2) == 2
+    # The counter restarted when it reached reset_after.
+    assert store.get_count("n") == 0
+    assert store.check_and_count("k", "n", ttl=60, reset_after=2) == 1
+
+
+def test_check_and_set_many_is_pipelined(store):
+    assert store.check_and_set_many(["a", "b", "a"], ttl=60) == [False, False, True]
+    assert store.check_and_set_many(["a", "c"], ttl=60) == [True, False]
+
+
+def test_check_and_count_many_matches_single_calls(store):
+    keys = [("a", "n"), ("a", "n"), ("b", "m"), ("a", "n")]
+    assert store.check_and_count_many(keys, ttl=60, reset_after=3) == [0, 1, 0, 2]
+    assert store.check_and_count_many([("a", "n")], ttl=60, reset_after=3) == [3]
+    assert store.get_count("n") == 0
+
+
+def test_increment_many_is_pipelined(store):
+    assert store.increment_many(["a", "b", "a"], ttl=60) == [1, 1, 2]
+    assert store.get_count("a") == 2
+
+
+def test_reset_clears_every_namespace(store):
+    store.set_expiry("k", ttl=60)
+    store.increment("k", ttl=60)
+    store.update("k", lambda state, now: ({"n": 1}, None), ttl=60)
+    store.reset("k")
+    assert not store.is_active("k")
+    assert store.get_count("k") == 0
+    assert store.update("k", lambda state, now: (state, state), ttl=60) is None
+
+
+def test_update_round_trips_state(store, client):
+    def bump(state, now):
+        count = (state or {}).get("count", 0) + 1
+        return {"count": count}, count
+
+    assert [store.update("k", bump, ttl=60) for _ in range(3)] == [1, 2, 3]
+    assert 0 < client.pttl("test:v:k") <= 60_000
+    store.update("k", lambda state, now: (None, None), ttl=60)
+    assert not client.exists("test:v:k")
+
+
+def test_prefix_isolates_stores(client):
+    first = RedisStore(client=client, prefix="one:")
+    second = RedisStore(client=client, prefix="two:")
+    first.set_expiry("k", ttl=60)
+    assert first.is_active("k")
+    assert not second.is_active("k")
+
+
+def test_update_passes_wall_clock(store):
+    before = time.time()
+    seen = store.update("k", lambda state, now: (None, now), ttl=60)
+    assert before <= seen <= time.time()
+
+
+def test_update_gives_up_under_contention(store, client):
+    calls = []
+
+    def contended(state, now):
+        # Another writer changes the key between every read and write.
+        calls.append(state)
+        client.set("test:v:k", "{}")
+        return {"n": len(calls)}, len(calls)
+
+    assert store.update("k", contended, ttl=60) == 8
+    assert len(calls) == 8
+    assert client.get("test:v:k") == b"{}"
+
+
+def test_rate_limit_many_is_pipelined(store, client):
+    calls = []
+    execute = client.pipeline
+
+    def pipeline(*args, **kwargs):
+        pipe = execute(*args, **kwargs)
+        calls.append(pipe)
+        return pipe
+
+    client.pipeline = pipeline
+
+    def decide(state, now):
+        raise AssertionError("the scripts decide on the server")
+
+    allowed = store.rate_limit_many(["a", "a", "b"], "gcra", 1.0, 1, 2.0, decide)
+    assert allowed == [True, False, True]
+    assert len(calls) == 1
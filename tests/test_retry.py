@@ -0,0 +1,61 @@
+from notify.channels.base import BaseNotifier
+from notify.channels.telegram import TelegramNotifier
+from notify.core.models import ChannelResult
+from notify.core.retry import RetryPolicy, RetryScheduler
+
+
+class Channel:
+    name = "test"
+    retry_policy = RetryPolicy(max_attempts=5, base_delay=60, max_delay=60)
+
+    def deliver(self, event):
+        return ChannelResult(True, "ok")
+
+
+def test_max_pending_drops_overflow():
+    scheduler = RetryScheduler(max_pending=3)
+    try:
+        failed = ChannelResult(False, "timeout", retryable=True)
+        delays = [scheduler.schedule(Channel(), {}, failed) for _ in range(5)]
+        assert [delay is not None for delay in delays] == [True, True, True, False, False]
+        stats = scheduler.stats()
+        assert stats["pending"] == 3
+        assert stats["dropped"] == 2
+    finally:
+        scheduler.close()
+
+
+def test_non_retryable_failure_is_not_scheduled():
+    scheduler = RetryScheduler()
+    try:
+        assert scheduler.schedule(Channel(), {}, ChannelResult(False, "bad request")) is None
+        assert scheduler.pending() == 0
+    finally:
+        scheduler.close()
+
+
+class CustomNotifier(BaseNotifier):
+    type_name = "custom"
+
+    def send(self, event):
+        return ChannelResult(False, "timeout", retryable=True)
+
+
+def test_custom_channels_do_not_retry_unless_asked():
+    assert CustomNotifier().retry_policy is None
+    assert CustomNotifier(retry={}).retry_policy is None
+    assert CustomNotifier(retry=True).retry_policy is not None
+    assert CustomNotifier(retry={"max_attempts": 5}).retry_policy.max_attempts == 5
+
+
+def test_builtin_channels_retry_by_default():
+    channel = TelegramNotifier(token="t", chat_id="c")
+    try:
+        assert channel.retry_policy is not None
+    finally:
+        channel.close()
+    channel = TelegramNotifier(token="t", chat_id="c", retry=False)
+    try:
+        assert channel.retry_policy is None
+    finally:
+        channel.close()
@@ -0,0 +1,100 @@
+import time
+
+import pytest
+
+from notify.core.models import ChannelResult
+from notify.core.tokens import TokenCache
+
+START = 1_700_000_000.0
+
+
+class Clock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock(START)
+    monkeypatch.setattr(time, "time", clock)
+    return clock
+
+
+class Provider:
+    def __init__(self, rotate: bool = True) -> None:
+        self.rotate = rotate
+        self.calls = 0
+        self.issued_at = START
+        self.fail = False
+
+    def fetch(self):
+        self.calls += 1
+        if self.fail:
+            return ChannelResult(False, "gettoken failed", retryable=True)
+        if self.rotate or self.calls == 1:
+            self.issued_at = time.time()
+        token = f"token-{self.issued_at:.0f}"
+        return token, int(self.issued_at + 7200 - time.time())
+
+
+def refresh(cache: TokenCache, provider: Provider):
+    token = cache.cached(provider.fetch)
+    # Wait for the background refresh, if one started.
+    with cache._lock:
+        pass
+    return token
+
+
+def test_refresh_ahead_replaces_token(clock):
+    cache = TokenCache("test")
+    provider = Provider()
+    first = cache.get(provider.fetch)
+    clock.now += 7200 - 60 - 200
+    assert refresh(cache, provider) == first
+    assert cache.get(provider.fetch) != first
+    assert provider.calls == 2
+    assert cache.stats()["refreshes"] == 1
+
+
+def test_same_token_stops_refreshing_until_expiry(clock):
+    cache = TokenCache("test")
+    provider = Provider(rotate=False)
+    first = cache.get(provider.fetch)
+    clock.now += 7200 - 60 - 200
+    for _ in range(10):
+        assert refresh(cache, provider) == first
+        clock.now += 15
+    assert provider.calls == 2
+    clock.now = START + 7200
+    provider.rotate = True
+    assert cache.get(provider.fetch) != first
+    assert provider.calls == 3
+
+
+def test_failed_refresh_is_counted(clock):
+    cache = TokenCache("test")
+    provider = Provider()
+    first = cache.get(provider.fetch)
+    clock.now += 7200 - 60 - 200
+    provider.fail = True
+    assert refresh(cache, provider) == first
+    assert cache.stats()["refresh_errors"] == 1
+
+
+def test_raising_refresh_is_counted(clock):
+    cache = TokenCache("test")
+    provider = Provider()
+    cache.get(provider.fetch)
+    clock.now += 7200 - 60 - 200
+
+    def broken():
+        raise OSError("network down")
+
+    token = cache.cached(broken)
+    with cache._lock:
+        pass
+    assert token is not None
+    assert cache.stats()["refresh_errors"] == 1